@@ -44,6 +44,7 @@ from nonbscanner import (
     analyze_sequence, analyze_multiple_sequences,
     get_motif_info as get_motif_classification_info
 )
+from detectors import DETECTOR_MOTIF_CLASSES
 from utilities import export_results_to_dataframe
 from visualizations import (
     plot_motif_distribution, plot_coverage_map, plot_density_heatmap,
@@ -1100,8 +1101,15 @@ with tab_pages["Upload & Analyze"]:
         # Analysis controls simplified
         st.markdown("### ⚙️ Analysis Options")
         
-        # Enable all classes by default in consolidated system
-        st.info("🔬 **NBDScanner detects all 11 motif classes with 22+ subclasses automatically**")
+        # All classes by default; a targeted selection skips the other detectors
+        class_options = list(DETECTOR_MOTIF_CLASSES.values())
+        chosen_classes = st.multiselect("Motif Classes", class_options, default=class_options,
+                                        help="Only the selected detectors are run. Hybrid and cluster "
+                                             "motifs are reported when two or more classes are found.")
+        if not chosen_classes:
+            st.warning("No class selected - all classes will be scanned")
+        st.session_state.selected_classes = (chosen_classes
+                                             if 0 < len(chosen_classes) < len(class_options) else [])
         
         # Simple options
         col1, col2 = st.columns(2)
@@ -1227,7 +1235,7 @@ with tab_pages["Upload & Analyze"]:
                                 
                                 # Convert raw motifs to full motif format by running through scoring
                                 # For now, just use the standard analyzer
-                                results = analyze_sequence(seq, name)
+                                results = analyze_sequence(seq, name, classes=analysis_classes)
                                 
                                 # Clear chunk progress
                                 if show_chunk_progress:
@@ -1235,10 +1243,10 @@ with tab_pages["Upload & Analyze"]:
                                 
                             except Exception as e:
                                 st.warning(f"Parallel scanner failed, falling back to standard: {e}")
-                                results = analyze_sequence(seq, name)
+                                results = analyze_sequence(seq, name, classes=analysis_classes)
                         else:
                             # Use standard consolidated NBDScanner analysis
-                            results = analyze_sequence(seq, name)
+                            results = analyze_sequence(seq, name, classes=analysis_classes)
                         
                         seq_time = time.time() - seq_start
                         
@@ -1867,7 +1875,7 @@ with tab_pages["Download"]:
         st.info(f"""
         **Analysis Configuration Used:**
         • Overlap Handling: {overlap_option_used}
-        • Motif Classes: {len(st.session_state.get('selected_classes', []))} classes selected
+        • Motif Classes: {len(st.session_state.get('selected_classes') or DETECTOR_MOTIF_CLASSES)} classes selected
         • Total Motifs Found: {sum(len(motifs) for motifs in st.session_state.results)}
         """)
         
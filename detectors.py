@@ -36,6 +36,11 @@ USAGE:
     
     detector = CurvedDNADetector()
     motifs = detector.detect(sequence)
+
+    # Share one encoded view of the sequence across detectors
+    from sequence_context import SequenceContext
+    ctx = SequenceContext(sequence)
+    motifs = ZDNADetector().detect_motifs(sequence, "seq1", context=ctx)
 """
 
 import re
@@ -45,12 +50,15 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Tuple, Optional, Set
 from collections import defaultdict, Counter
 
+from sequence_context import SequenceContext, KmerScoreTable, g4hunter_peak, normalize_sequence
+
 # Import optimized scanner functions
 try:
     from scanner import (
         find_direct_repeats as _find_direct_repeats_optimized,
         find_inverted_repeats as _find_inverted_repeats_optimized,
         find_mirror_repeats as _find_mirror_repeats_optimized,
+        find_triplex_mirror_repeats as _find_triplex_mirror_repeats_optimized,
         find_strs as _find_strs_optimized
     )
 except ImportError:
@@ -58,6 +66,7 @@ except ImportError:
     _find_direct_repeats_optimized = None
     _find_inverted_repeats_optimized = None
     _find_mirror_repeats_optimized = None
+    _find_triplex_mirror_repeats_optimized = None
     _find_strs_optimized = None
 
 """
@@ -112,8 +121,19 @@ class BaseMotifDetector(ABC):
     # | Strand        | str   | Strand orientation ('+' or '-')      |
     # | Method        | str   | Detection method identifier          |
     # | Pattern_ID    | str   | Pattern identifier used for match    |
+
+    # Chunked Scanning Attributes (see genome_chunking.py):
+    # | Attribute                | Description                                  |
+    # |--------------------------|----------------------------------------------|
+    # | MAX_MOTIF_FOOTPRINT      | Longest span (bp) one motif plus the context |
+    # |                          | read to call it is expected to cover         |
+    # | ORDINAL_PATTERN_PREFIXES | Pattern_ID prefixes numbered 1..N in output  |
+    # |                          | order (e.g. 'ZDNA_' → ZDNA_1, ZDNA_2, ...)   |
     """
-    
+
+    MAX_MOTIF_FOOTPRINT = 200
+    ORDINAL_PATTERN_PREFIXES: Tuple[str, ...] = ()
+
     def __init__(self):
         self.patterns = self.get_patterns()
         self.compiled_patterns = self._compile_patterns()
@@ -178,7 +198,8 @@ class BaseMotifDetector(ABC):
         
         return compiled_patterns
     
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Main detection method - scans sequence for all compiled patterns.
         
@@ -195,11 +216,15 @@ class BaseMotifDetector(ABC):
         Args:
             sequence: DNA sequence string
             sequence_name: Identifier for the sequence
+            context: Shared SequenceContext built by the caller (optional);
+                all detectors accept it so the sequence is normalized and
+                encoded only once per analysis
             
         Returns:
             List of motif dictionaries with standardized fields
         """
-        sequence = sequence.upper().strip()
+        context = SequenceContext.ensure(sequence, context)
+        sequence = context.sequence
         motifs = []
         
         for pattern_group, compiled_patterns in self.compiled_patterns.items():
@@ -237,7 +262,35 @@ class BaseMotifDetector(ABC):
         
         # Default minimum score threshold
         return score >= 0.5
-    
+
+    def motif_footprint(self, motif: Dict[str, Any]) -> int:
+        """
+        Span of sequence (bp, from the motif start) read to call `motif`.
+        Detectors that look beyond the reported interval override this.
+        """
+        return motif.get('Length', 0)
+
+    def number_ordinal_pattern_ids(self, motifs: List[Dict[str, Any]],
+                                   counters: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Renumber ordinal Pattern_IDs 1..N per prefix in list order (in place),
+        so numbering is dense and independent of how the sequence was split.
+        Pass the same `counters` dict for consecutive chunks to continue the
+        numbering instead of restarting at 1.
+        """
+        if not self.ORDINAL_PATTERN_PREFIXES:
+            return motifs
+        if counters is None:
+            counters = {}
+        for motif in motifs:
+            pattern_id = motif.get('Pattern_ID', '')
+            for prefix in self.ORDINAL_PATTERN_PREFIXES:
+                if pattern_id.startswith(prefix) and pattern_id[len(prefix):].isdigit():
+                    counters[prefix] = counters.get(prefix, 0) + 1
+                    motif['Pattern_ID'] = f"{prefix}{counters[prefix]}"
+                    break
+        return motifs
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get detector statistics"""
         total_patterns = sum(len(patterns) for patterns in self.patterns.values())
@@ -359,6 +412,10 @@ class CurvedDNADetector(BaseMotifDetector):
     MIN_APR_TRACTS = 3
     LOCAL_LONG_TRACT = 7
 
+    # Chunked scanning
+    MAX_MOTIF_FOOTPRINT = 200
+    ORDINAL_PATTERN_PREFIXES = ('CRV_APR_', 'CRV_TRACT_')
+
     def get_patterns(self) -> Dict[str, List[Tuple]]:
         """
         Generate curved DNA patterns programmatically (reduces ~65 lines to ~20).
@@ -428,9 +485,11 @@ class CurvedDNADetector(BaseMotifDetector):
         non_overlapping.sort(key=lambda x: x['Start'])
         return non_overlapping
 
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """Override base method to use sophisticated curved DNA detection with component details"""
-        sequence = sequence.upper().strip()
+        context = SequenceContext.ensure(sequence, context)
+        sequence = context.sequence
         motifs = []
         
         # Use the sophisticated annotation method
@@ -451,8 +510,8 @@ class CurvedDNADetector(BaseMotifDetector):
                 t_tracts = re.findall(r'T{3,}', motif_seq)
                 
                 # Calculate GC content
-                gc_total = (motif_seq.count('G') + motif_seq.count('C')) / len(motif_seq) * 100 if len(motif_seq) > 0 else 0
-                at_content = (motif_seq.count('A') + motif_seq.count('T')) / len(motif_seq) * 100 if len(motif_seq) > 0 else 0
+                gc_total = context.gc_content(start_pos, end_pos)
+                at_content = context.at_content(start_pos, end_pos)
                 
                 motifs.append({
                     'ID': f"{sequence_name}_CRV_APR_{start_pos+1}",
@@ -490,8 +549,8 @@ class CurvedDNADetector(BaseMotifDetector):
                 tract_type = 'A-tract' if motif_seq.count('A') > motif_seq.count('T') else 'T-tract'
                 
                 # Calculate GC content
-                gc_total = (motif_seq.count('G') + motif_seq.count('C')) / len(motif_seq) * 100 if len(motif_seq) > 0 else 0
-                at_content = (motif_seq.count('A') + motif_seq.count('T')) / len(motif_seq) * 100 if len(motif_seq) > 0 else 0
+                gc_total = context.gc_content(start_pos, end_pos)
+                at_content = context.at_content(start_pos, end_pos)
                 
                 motifs.append({
                     'ID': f"{sequence_name}_CRV_TRACT_{start_pos+1}",
@@ -513,10 +572,10 @@ class CurvedDNADetector(BaseMotifDetector):
                     'AT_Content': round(at_content, 2)
                 })
         
-        # Remove overlaps within each subclass
+        # Remove overlaps within each subclass, then number survivors densely
         motifs = self._remove_overlaps(motifs)
         
-        return motifs
+        return self.number_ordinal_pattern_ids(motifs)
 
     # -------------------------
     # Top-level scoring API
@@ -559,7 +618,7 @@ class CurvedDNADetector(BaseMotifDetector):
           compute Alen/Tlen/ATlen per the C algorithm to determine maxATlen and maxTlen.
         - If either forward strand or reverse complement has (maxATlen - maxTlen) >= minAT, we call it an A-tract.
         """
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         n = len(seq)
         if minAT is None:
             minAT = self.MIN_AT_TRACT
@@ -757,7 +816,7 @@ class CurvedDNADetector(BaseMotifDetector):
         """
         if min_len is None:
             min_len = self.LOCAL_LONG_TRACT
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         results = []
         # A runs
         for m in re.finditer(r'A{' + str(min_len) + r',}', seq):
@@ -796,7 +855,7 @@ class CurvedDNADetector(BaseMotifDetector):
          - long_tracts: list of local A/T long tracts
          - summary counts and combined score
         """
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         a_windows = self.find_a_tracts(seq, minAT=self.MIN_AT_TRACT)
         # filtered called a-tract centers
         a_centers = [w for w in a_windows if w['call'] and w['a_center'] is not None]
@@ -846,8 +905,8 @@ All overlapping or adjacent 10-mer matches are automatically merged into
 contiguous regions, ensuring no duplicate or split reporting.
 
 Behavior:
- - Use Hyperscan (if available) for very fast matching of the 10-mer list.
- - Fallback to a pure-Python exact matcher if Hyperscan isn't installed.
+ - Match the 10-mer list with a dense 4**10 KmerScoreTable lookup
+   (Hyperscan optional via TENMER_ENGINE = 'hyperscan').
  - **CRITICAL**: Merge overlapping/adjacent 10-mer matches into contiguous regions.
  - Redistribute each 10-mer's score evenly across its 10 bases (score/10 per base).
  - Region sum_score = sum of per-base contributions inside merged region.
@@ -864,7 +923,9 @@ Output Structure (from detect_motifs and annotate_sequence):
 - mean_score_per10mer: Average of the individual 10-mer scores
 """
 
+import os
 import re
+import threading
 from typing import List, Dict, Any, Tuple
 # # from .base_detector import BaseMotifDetector
 
@@ -876,6 +937,81 @@ except Exception:
     _HYPERSCAN_AVAILABLE = False
 
 
+class TenmerHyperscanDB:
+    """
+    Process-wide Hyperscan database for a 10-mer -> value table.
+    
+    Compiled lazily on first use (or loaded from `path`, a file written by
+    save(), when it exists) and shared by every instance of the owning
+    detector; each thread scans with its own scratch space.
+    """
+
+    def __init__(self, table: Dict[str, float], path: Optional[str] = None):
+        self.tenmers = list(table)
+        self.values = [float(value) for value in table.values()]
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def database(self):
+        """Return the compiled database, building or loading it once"""
+        if self._db is None:
+            with self._lock:
+                if self._db is None:
+                    db = None
+                    if self.path and os.path.exists(self.path):
+                        try:
+                            db = self._read(self.path)
+                        except Exception:
+                            db = None  # stale or foreign file: recompile
+                    self._db = db or self._compile()
+        return self._db
+
+    def _compile(self):
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(expressions=[tenmer.encode() for tenmer in self.tenmers],
+                   ids=list(range(len(self.tenmers))), elements=len(self.tenmers))
+        return db
+
+    @staticmethod
+    def _read(path: str):
+        with open(path, 'rb') as handle:
+            return hyperscan.loadb(handle.read(), hyperscan.HS_MODE_BLOCK)
+
+    def load(self, path: str) -> None:
+        """Use the serialized database in `path` from now on"""
+        db = self._read(path)
+        with self._lock:
+            self._db = db
+            self._local = threading.local()
+
+    def save(self, path: str) -> None:
+        """Serialize the database so other processes can load() it"""
+        with open(path, 'wb') as handle:
+            handle.write(hyperscan.dumpb(self.database()))
+
+    def find_hits(self, seq: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(positions, entries) of every match, sorted by position; entries index the table order"""
+        db = self.database()
+        local = self._local
+        if getattr(local, 'scratch', None) is None:
+            local.scratch = hyperscan.Scratch(db)
+        positions: List[int] = []
+        entries: List[int] = []
+
+        def on_match(id, start, end, flags, context):
+            # Hyperscan 'end' parameter is the offset after the match
+            positions.append(end - 10)
+            entries.append(id)
+
+        db.scan(seq.encode(), match_event_handler=on_match, scratch=local.scratch)
+        positions = np.array(positions, dtype=np.int64)
+        entries = np.array(entries, dtype=np.int32)
+        order = np.argsort(positions, kind='stable')
+        return positions[order], entries[order]
+
+
 class ZDNADetector(BaseMotifDetector):
     """
     Detector for Z-DNA (left-handed helix) motifs using 10-mer scoring.
@@ -892,6 +1028,10 @@ class ZDNADetector(BaseMotifDetector):
     # | GC_Content | float | GC% (Z-DNA favors high GC)          |
     """
 
+    # Chunked scanning
+    MAX_MOTIF_FOOTPRINT = 200
+    ORDINAL_PATTERN_PREFIXES = ('ZDNA_',)
+
     # Full 10-mer scoring table from Ho et al. 1986
     TENMER_SCORE: Dict[str, float] = {
         "AACGCGCGCG": 50.25,
@@ -1022,6 +1162,14 @@ class ZDNADetector(BaseMotifDetector):
         "CCGCGCGCGC": 56.0,
     }
 
+    # Dense 4**10 lookup of TENMER_SCORE; the default match engine
+    TENMER_TABLE = KmerScoreTable(TENMER_SCORE)
+    # Hyperscan database compiled once per process from TENMER_SCORE
+    TENMER_DB = TenmerHyperscanDB(TENMER_SCORE)
+    # 'table' or 'hyperscan'; the table wins on hit-dense (GC-rich) input,
+    # where Hyperscan pays one Python callback per match
+    TENMER_ENGINE = 'table'
+
     def get_motif_class_name(self) -> str:
         return "Z-DNA"
 
@@ -1046,16 +1194,11 @@ class ZDNADetector(BaseMotifDetector):
         and summing per-base contributions inside merged regions.
         """
         seq = sequence.upper()
-        merged = self._find_and_merge_10mer_matches(seq)
-        if not merged:
-            return 0.0
-        contrib = self._build_per_base_contrib(seq)
-        total = 0.0
-        for s, e in merged:
-            total += sum(contrib[s:e])
-        return float(total)
+        regions = self._score_regions(seq)
+        return float(regions['sums'].sum())
 
-    def annotate_sequence(self, sequence: str) -> List[Dict[str, Any]]:
+    def annotate_sequence(self, sequence: str,
+                          context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Return list of merged region annotations.
         
@@ -1071,160 +1214,151 @@ class ZDNADetector(BaseMotifDetector):
           - n_10mers
           - contributing_10mers: list of dicts {tenmer, start, score}
         """
-        seq = sequence.upper()
-        
-        # Step 1: Find all 10-mer matches (may overlap)
-        matches = self._find_10mer_matches(seq)
-        if not matches:
-            return []
-        
-        # Step 2: Merge overlapping/adjacent matches into regions
-        # This is the critical step that ensures no duplicate/split reporting
-        merged = self._merge_matches(matches)
-        
-        # Step 3: Build per-base contribution array for scoring
-        contrib = self._build_per_base_contrib(seq)
-        
-        # Step 4: Create annotation for each merged region
-        annotations = []
-        for (s, e, region_matches) in merged:
-            # Sum contributions across the merged region
-            sum_score = sum(contrib[s:e])
-            n10 = len(region_matches)
-            mean10 = (sum(m[2] for m in region_matches) / n10) if n10 > 0 else 0.0
-            
-            # Build merged region annotation
-            ann = {
-                "start": s,
-                "end": e,
-                "length": e - s,
-                "sum_score": round(sum_score, 6),
-                "mean_score_per10mer": round(mean10, 6),
-                "n_10mers": n10,
-                "contributing_10mers": [{"tenmer": m[1], "start": m[0], "score": m[2]} for m in region_matches]
-            }
-            annotations.append(ann)
-        return annotations
+        return self._annotate_regions(normalize_sequence(sequence), context)
 
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Override base method to use sophisticated Z-DNA detection with component details.
         
         IMPORTANT: This method ALWAYS outputs merged regions, not individual 10-mers.
         All overlapping/adjacent 10-mer matches are merged into contiguous regions
-        via annotate_sequence(), ensuring no duplicate or split reporting.
+        via _annotate_regions(), ensuring no duplicate or split reporting.
         
         Returns:
             List of motif dictionaries, each representing a merged Z-DNA region
             with start, end, length, sequence, score, and contributing 10-mer count.
         """
-        sequence = sequence.upper().strip()
+        context = SequenceContext.ensure(sequence, context)
+        sequence = context.sequence
         motifs = []
         
         # Use the annotation method to find Z-DNA regions.
         # This GUARANTEES that overlapping/adjacent 10-mer matches are merged.
-        annotations = self.annotate_sequence(sequence)
-        
-        for i, region in enumerate(annotations):
-            # Filter by meaningful score threshold
-            if region.get('sum_score', 0) > 50.0 and region.get('n_10mers', 0) >= 1:
-                start_pos = region['start']
-                end_pos = region['end']
-                motif_seq = sequence[start_pos:end_pos]
-                
-                # Extract CG/AT dinucleotides (characteristic of Z-DNA)
-                cg_count = motif_seq.count('CG') + motif_seq.count('GC')
-                at_count = motif_seq.count('AT') + motif_seq.count('TA')
-                
-                # Calculate GC content
-                gc_content = (motif_seq.count('G') + motif_seq.count('C')) / len(motif_seq) * 100 if len(motif_seq) > 0 else 0
-                
-                # Extract alternating pattern information
-                alternating_cg = len(re.findall(r'(?:CG){2,}', motif_seq)) + len(re.findall(r'(?:GC){2,}', motif_seq))
-                alternating_at = len(re.findall(r'(?:AT){2,}', motif_seq)) + len(re.findall(r'(?:TA){2,}', motif_seq))
-                
-                motifs.append({
-                    'ID': f"{sequence_name}_ZDNA_{start_pos+1}",
-                    'Sequence_Name': sequence_name,
-                    'Class': self.get_motif_class_name(),
-                    'Subclass': 'Z-DNA',
-                    'Start': start_pos + 1,  # 1-based coordinates
-                    'End': end_pos,
-                    'Length': region['length'],
-                    'Sequence': motif_seq,
-                    'Score': round(region['sum_score'], 3),
-                    'Strand': '+',
-                    'Method': 'Z-DNA_detection',
-                    'Pattern_ID': f'ZDNA_{i+1}',
-                    # Component details
-                    'Contributing_10mers': region.get('n_10mers', 0),
-                    'Mean_10mer_Score': region.get('mean_score_per10mer', 0),
-                    'CG_Dinucleotides': cg_count,
-                    'AT_Dinucleotides': at_count,
-                    'Alternating_CG_Regions': alternating_cg,
-                    'Alternating_AT_Regions': alternating_at,
-                    'GC_Content': round(gc_content, 2)
-                })
+        annotations = self._annotate_regions(sequence, context, include_matches=False)
+
+        # Filter by meaningful score threshold
+        accepted = [region for region in annotations
+                    if region.get('sum_score', 0) > 50.0 and region.get('n_10mers', 0) >= 1]
+        if not accepted:
+            return motifs
+
+        # Region features for all accepted regions at once, from prefix sums
+        starts = np.array([region['start'] for region in accepted], dtype=np.int64)
+        ends = np.array([region['end'] for region in accepted], dtype=np.int64)
+        features = context.region_features(starts, ends)
+
+        for i, region in enumerate(accepted):
+            start_pos = region['start']
+            end_pos = region['end']
+            motif_seq = sequence[start_pos:end_pos]
+            cg_count = features['cg_dinucleotides'][i]
+            at_count = features['at_dinucleotides'][i]
+            gc_content = features['gc_content'][i]
+            alternating_cg = features['alternating_cg'][i]
+            alternating_at = features['alternating_at'][i]
+
+            motifs.append({
+                'ID': f"{sequence_name}_ZDNA_{start_pos+1}",
+                'Sequence_Name': sequence_name,
+                'Class': self.get_motif_class_name(),
+                'Subclass': 'Z-DNA',
+                'Start': start_pos + 1,  # 1-based coordinates
+                'End': end_pos,
+                'Length': region['length'],
+                'Sequence': motif_seq,
+                'Score': round(region['sum_score'], 3),
+                'Strand': '+',
+                'Method': 'Z-DNA_detection',
+                'Pattern_ID': f'ZDNA_{len(motifs) + 1}',
+                # Component details
+                'Contributing_10mers': region.get('n_10mers', 0),
+                'Mean_10mer_Score': region.get('mean_score_per10mer', 0),
+                'CG_Dinucleotides': cg_count,
+                'AT_Dinucleotides': at_count,
+                'Alternating_CG_Regions': alternating_cg,
+                'Alternating_AT_Regions': alternating_at,
+                'GC_Content': round(gc_content, 2)
+            })
         
         return motifs
 
     # -------------------------
     # Core helpers
     # -------------------------
-    def _find_10mer_matches(self, seq: str) -> List[Tuple[int, str, float]]:
+    def _find_10mer_hits(self, seq: str,
+                         context: Optional[SequenceContext] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Find all exact 10-mer matches in the sequence.
-        
-        Returns list of (start, tenmer, score) tuples for each match found.
-        Uses Hyperscan if available for high performance; otherwise falls back
-        to pure-Python scanning. Matches may overlap (e.g., positions 0,1,2...).
+        Find all exact 10-mer matches as (positions, entries) arrays sorted by
+        position; entries index TENMER_TABLE.kmers / TENMER_TABLE.values.
         
-        Note: This method finds ALL matches, including overlapping ones.
-        Merging into regions happens in _merge_matches().
+        Uses the dense KmerScoreTable lookup (reusing `context` k-mer codes),
+        or Hyperscan when TENMER_ENGINE is 'hyperscan' and it is installed.
+        Matches may overlap (e.g., positions 0,1,2...).
         """
-        if _HYPERSCAN_AVAILABLE:
+        if self.TENMER_ENGINE == 'hyperscan' and _HYPERSCAN_AVAILABLE:
             try:
-                return self._hs_find_matches(seq)
+                return self.TENMER_DB.find_hits(seq)
             except Exception:
-                return self._py_find_matches(seq)
-        else:
-            return self._py_find_matches(seq)
-
-    def _hs_find_matches(self, seq: str) -> List[Tuple[int, str, float]]:
-        """Hyperscan-based matching."""
-        expressions = []
-        ids = []
-        id_to_ten = {}
-        id_to_score = {}
-        for idx, (ten, score) in enumerate(self.TENMER_SCORE.items()):
-            expressions.append(ten.encode())
-            ids.append(idx)
-            id_to_ten[idx] = ten
-            id_to_score[idx] = float(score)
-        db = hyperscan.Database()
-        db.compile(expressions=expressions, ids=ids, elements=len(expressions))
-        matches: List[Tuple[int, str, float]] = []
+                pass
+        if context is None or context.sequence != seq:
+            context = SequenceContext(seq, normalized=True)
+        return self.TENMER_TABLE.scan(context)
 
-        def on_match(id, start, end, flags, context):
-            # Hyperscan 'end' parameter is the offset after the match
-            # Calculate actual start position: end - pattern_length
-            actual_start = end - 10
-            matches.append((actual_start, id_to_ten[id], id_to_score[id]))
+    def _find_10mer_matches(self, seq: str,
+                            context: Optional[SequenceContext] = None) -> List[Tuple[int, str, float]]:
+        """
+        Find all exact 10-mer matches in the sequence.
+        
+        Returns list of (start, tenmer, score) tuples for each match found,
+        including overlapping ones. Merging into regions happens in
+        _merge_matches().
+        """
+        positions, entries = self._find_10mer_hits(seq, context)
+        return self.TENMER_TABLE.as_matches(positions, entries)
 
-        db.scan(seq.encode(), match_event_handler=on_match)
-        matches.sort(key=lambda x: x[0])
-        return matches
+    def _score_regions(self, seq: str, context: Optional[SequenceContext] = None,
+                       merge_gap: int = 0) -> Dict[str, np.ndarray]:
+        """Merged regions with prefix-sum scores (see KmerScoreTable.score_regions)"""
+        positions, entries = self._find_10mer_hits(seq, context)
+        return self.TENMER_TABLE.score_regions(len(seq), positions, entries, merge_gap)
 
-    def _py_find_matches(self, seq: str) -> List[Tuple[int, str, float]]:
-        """Pure-Python exact search (overlapping matches allowed)."""
-        n = len(seq)
-        matches: List[Tuple[int, str, float]] = []
-        for i in range(0, n - 10 + 1):
-            ten = seq[i:i + 10]
-            score = self.TENMER_SCORE.get(ten)
-            if score is not None:
-                matches.append((i, ten, float(score)))
-        return matches
+    def _annotate_regions(self, seq: str, context: Optional[SequenceContext] = None,
+                          include_matches: bool = True) -> List[Dict[str, Any]]:
+        """
+        Region annotations for annotate_sequence(); detect_motifs() skips the
+        per-10-mer 'contributing_10mers' lists it does not report.
+        """
+        # Step 1: Find all 10-mer matches (may overlap)
+        positions, entries = self._find_10mer_hits(seq, context)
+        if positions.size == 0:
+            return []
+        
+        # Step 2: Merge overlapping/adjacent matches into regions (np.diff
+        # on the sorted starts) and score them from the prefix sums of the
+        # per-base contribution track
+        regions = self.TENMER_TABLE.score_regions(len(seq), positions, entries)
+        
+        # Step 3: Create annotation for each merged region
+        matches = self.TENMER_TABLE.as_matches(positions, entries) if include_matches else None
+        bounds = regions['first'].tolist() + [int(positions.size)]
+        annotations = []
+        for i, (s, e, sum_score, mean_per10) in enumerate(zip(
+                regions['starts'].tolist(), regions['ends'].tolist(),
+                regions['sums'].tolist(), regions['means'].tolist())):
+            ann = {
+                "start": s,
+                "end": e,
+                "length": e - s,
+                "sum_score": round(sum_score, 6),
+                "mean_score_per10mer": round(mean_per10, 6),
+                "n_10mers": bounds[i + 1] - bounds[i],
+            }
+            if include_matches:
+                ann["contributing_10mers"] = [{"tenmer": m[1], "start": m[0], "score": m[2]}
+                                              for m in matches[bounds[i]:bounds[i + 1]]]
+            annotations.append(ann)
+        return annotations
 
     def _merge_matches(self, matches: List[Tuple[int, str, float]],
                        merge_gap: int = 0) -> List[Tuple[int, int, List[Tuple[int, str, float]]]]:
@@ -1250,64 +1384,40 @@ class ZDNADetector(BaseMotifDetector):
         """
         if not matches:
             return []
-        
-        merged = []
-        # Initialize with first match
-        cur_start = matches[0][0]
-        cur_end = matches[0][0] + 10
-        cur_matches = [matches[0]]
-        
-        # Iterate through remaining matches and merge if overlapping/adjacent
-        for m in matches[1:]:
-            s = m[0]
-            m_end = s + 10
-            
-            # Check if this match overlaps or is within merge_gap of current region
-            if s <= cur_end + merge_gap:
-                # Extend current region and add match
-                cur_end = max(cur_end, m_end)
-                cur_matches.append(m)
-            else:
-                # Gap too large; finalize current region and start new one
-                merged.append((cur_start, cur_end, cur_matches))
-                cur_start, cur_end = s, m_end
-                cur_matches = [m]
-        
-        # Don't forget to add the last region
-        merged.append((cur_start, cur_end, cur_matches))
-        return merged
+        positions = np.array([m[0] for m in matches], dtype=np.int64)
+        starts, ends, first = self.TENMER_TABLE.merge_hits(positions, merge_gap)
+        bounds = first.tolist() + [len(matches)]
+        return [(s, e, matches[bounds[i]:bounds[i + 1]])
+                for i, (s, e) in enumerate(zip(starts.tolist(), ends.tolist()))]
 
     def _find_and_merge_10mer_matches(self, seq: str, merge_gap: int = 0) -> List[Tuple[int, int]]:
-        matches = self._find_10mer_matches(seq)
-        merged = self._merge_matches(matches, merge_gap=merge_gap)
-        return [(s, e) for (s, e, _) in merged]
+        regions = self._score_regions(seq, merge_gap=merge_gap)
+        return list(zip(regions['starts'].tolist(), regions['ends'].tolist()))
 
-    def _build_per_base_contrib(self, seq: str) -> List[float]:
+    def _build_per_base_contrib(self, seq: str,
+                                matches: Optional[List[Tuple[int, str, float]]] = None) -> np.ndarray:
         """
         Build per-base contribution array for the sequence.
         
         For each matched 10-mer starting at position j with score S,
-        we distribute S equally across its 10 bases by adding S/10 to 
-        positions j, j+1, ..., j+9 in the contribution array.
+        S/10 is added to positions j, j+1, ..., j+9, computed
+        as a difference array plus cumsum rather than per-base additions.
         
-        This redistribution allows us to compute region scores as the sum
-        of per-base contributions, properly accounting for overlapping matches.
+        Args:
+            seq: Upper-case sequence
+            matches: Output of _find_10mer_matches(seq), if already computed
         
         Returns:
-            List of floats of length len(seq), where contrib[i] is the total
+            float64 array of length len(seq), where contrib[i] is the total
             contribution from all 10-mers covering position i.
         """
-        n = len(seq)
-        contrib = [0.0] * n
-        matches = self._find_10mer_matches(seq)
-        
-        # Distribute each 10-mer's score across its 10 bases
-        for (start, ten, score) in matches:
-            per_base = float(score) / 10.0
-            for k in range(start, min(start + 10, n)):
-                contrib[k] += per_base
-        
-        return contrib
+        if matches is None:
+            positions, entries = self._find_10mer_hits(seq)
+        else:
+            index = {kmer: i for i, kmer in enumerate(self.TENMER_TABLE.kmers)}
+            positions = np.array([m[0] for m in matches], dtype=np.int64)
+            entries = np.array([index[m[1]] for m in matches], dtype=np.int64)
+        return self.TENMER_TABLE.contributions(len(seq), positions, entries)
 
 
 # =============================================================================
@@ -1326,8 +1436,8 @@ All overlapping or adjacent 10-mer matches are automatically merged into
 contiguous regions, ensuring no duplicate or split reporting.
 
 Behavior:
-- Use Hyperscan (if available) for blazing-fast exact matching of the 10-mer list.
-- Fallback to a pure-Python exact matcher if Hyperscan isn't installed.
+- Match the 10-mer list with a dense 4**10 KmerScoreTable lookup
+  (Hyperscan optional via TENMER_ENGINE = 'hyperscan').
 - **CRITICAL**: Merge overlapping/adjacent 10-mer matches into contiguous regions.
 - Redistribute each 10-mer's avg_log2 evenly across its 10 bases (L/10 per base)
   and sum per-base contributions inside merged regions to compute a region sum score.
@@ -1360,6 +1470,10 @@ except Exception:
 class APhilicDetector(BaseMotifDetector):
     """Detector for A-philic DNA motifs using a 10-mer scoring table."""
 
+    # Chunked scanning
+    MAX_MOTIF_FOOTPRINT = 200
+    ORDINAL_PATTERN_PREFIXES = ('APHIL_',)
+
     # -------------------------
     # Full provided 10-mer -> avg_log2 table
     # -------------------------
@@ -1574,6 +1688,14 @@ class APhilicDetector(BaseMotifDetector):
         "CGGGGGCCCG": 1.6723857142857141,
     }
 
+    # Dense 4**10 lookup of TENMER_LOG2; the default match engine
+    TENMER_TABLE = KmerScoreTable(TENMER_LOG2)
+    # Hyperscan database compiled once per process from TENMER_LOG2
+    TENMER_DB = TenmerHyperscanDB(TENMER_LOG2)
+    # 'table' or 'hyperscan'; the table wins on hit-dense (GC-rich) input,
+    # where Hyperscan pays one Python callback per match
+    TENMER_ENGINE = 'table'
+
     def get_motif_class_name(self) -> str:
         return "A-philic_DNA"
 
@@ -1581,7 +1703,7 @@ class APhilicDetector(BaseMotifDetector):
         """
         Keep compatibility with framework: return a single synthetic "pattern"
         that indicates the detector uses the TENMER_LOG2 table.  The detection
-        itself will use hyperscan / Python matching inside calculate_score
+        itself will use the 10-mer table lookup inside calculate_score
         and annotate_sequence.
         """
         return {
@@ -1602,19 +1724,14 @@ class APhilicDetector(BaseMotifDetector):
         inside merged regions.
         """
         seq = sequence.upper()
-        merged_regions = self._find_and_merge_10mer_matches(seq)
-        if not merged_regions:
-            return 0.0
-        contrib = self._build_per_base_contrib(seq)
-        total_sum = 0.0
-        for s, e in merged_regions:
-            total_sum += sum(contrib[s:e])
-        return float(total_sum)
+        regions = self._score_regions(seq)
+        return float(regions['sums'].sum())
 
     # -------------------------
     # Helper: return detailed annotation
     # -------------------------
-    def annotate_sequence(self, sequence: str) -> List[Dict[str, Any]]:
+    def annotate_sequence(self, sequence: str,
+                          context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Return list of region annotations (merged regions).
         
@@ -1630,62 +1747,30 @@ class APhilicDetector(BaseMotifDetector):
           - n_10mers: number of matched 10-mers contributing
           - contributing_10mers: list of (tenmer, start, log2)
         """
-        seq = sequence.upper()
-        
-        # Step 1: Find all 10-mer matches (may overlap)
-        matches = self._find_10mer_matches(seq)
-        if not matches:
-            return []
-        
-        # Step 2: Merge overlapping/adjacent matches into regions
-        # This is the critical step that ensures no duplicate/split reporting
-        merged = self._merge_matches(matches)
-        
-        # Step 3: Build per-base contribution array for scoring
-        contrib = self._build_per_base_contrib(seq)
-        
-        # Step 4: Create annotation for each merged region
-        annotations = []
-        for region in merged:
-            s, e, region_matches = region
-            # Sum contributions across the merged region
-            sum_log2 = sum(contrib[s:e])
-            n_10 = len(region_matches)
-            mean_per10 = (sum(m[2] for m in region_matches) / n_10) if n_10 > 0 else 0.0
-            
-            # Build merged region annotation
-            ann = {
-                "start": s,
-                "end": e,
-                "length": e - s,
-                "sum_log2": round(sum_log2, 6),
-                "mean_log2_per10mer": round(mean_per10, 6),
-                "n_10mers": n_10,
-                "contributing_10mers": [{"tenmer": m[1], "start": m[0], "log2": m[2]} for m in region_matches]
-            }
-            annotations.append(ann)
-        return annotations
+        return self._annotate_regions(normalize_sequence(sequence), context)
 
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Override base method to use sophisticated A-philic detection.
         
         IMPORTANT: This method ALWAYS outputs merged regions, not individual 10-mers.
         All overlapping/adjacent 10-mer matches are merged into contiguous regions
-        via annotate_sequence(), ensuring no duplicate or split reporting.
+        via _annotate_regions(), ensuring no duplicate or split reporting.
         
         Returns:
             List of motif dictionaries, each representing a merged A-philic region
             with start, end, length, sequence, score, and contributing 10-mer count.
         """
-        sequence = sequence.upper().strip()
+        context = SequenceContext.ensure(sequence, context)
+        sequence = context.sequence
         motifs = []
         
         # Use the annotation method to find A-philic regions.
         # This GUARANTEES that overlapping/adjacent 10-mer matches are merged.
-        annotations = self.annotate_sequence(sequence)
+        annotations = self._annotate_regions(sequence, context, include_matches=False)
         
-        for i, region in enumerate(annotations):
+        for region in annotations:
             # Filter by meaningful score threshold - lowered for better sensitivity
             if region.get('sum_log2', 0) > 0.5 and region.get('n_10mers', 0) >= 1:
                 start_pos = region['start']
@@ -1703,7 +1788,7 @@ class APhilicDetector(BaseMotifDetector):
                     'Score': round(region['sum_log2'], 3),
                     'Strand': '+',
                     'Method': 'A-philic_detection',
-                    'Pattern_ID': f'APHIL_{i+1}'
+                    'Pattern_ID': f'APHIL_{len(motifs) + 1}'
                 })
         
         return motifs
@@ -1711,65 +1796,79 @@ class APhilicDetector(BaseMotifDetector):
     # -------------------------
     # Core match / merge / contrib helpers
     # -------------------------
-    def _find_10mer_matches(self, seq: str) -> List[Tuple[int, str, float]]:
+    def _find_10mer_hits(self, seq: str,
+                         context: Optional[SequenceContext] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Find all exact 10-mer matches in the sequence.
-        
-        Returns list of (start, tenmer, avg_log2) tuples for each match found.
-        Uses Hyperscan if available for high performance; otherwise falls back
-        to pure-Python scanning. Matches may overlap (e.g., positions 0,1,2...).
+        Find all exact 10-mer matches as (positions, entries) arrays sorted by
+        position; entries index TENMER_TABLE.kmers / TENMER_TABLE.values.
         
-        Note: This method finds ALL matches, including overlapping ones.
-        Merging into regions happens in _merge_matches().
+        Uses the dense KmerScoreTable lookup (reusing `context` k-mer codes),
+        or Hyperscan when TENMER_ENGINE is 'hyperscan' and it is installed.
+        Matches may overlap (e.g., positions 0,1,2...).
         """
-        if _HYPERSCAN_AVAILABLE:
+        if self.TENMER_ENGINE == 'hyperscan' and _HYPERSCAN_AVAILABLE:
             try:
-                return self._hs_find_matches(seq)
+                return self.TENMER_DB.find_hits(seq)
             except Exception:
-                return self._py_find_matches(seq)
-        else:
-            return self._py_find_matches(seq)
-
-    def _hs_find_matches(self, seq: str) -> List[Tuple[int, str, float]]:
-        """
-        Use Hyperscan compiled database of 10-mers to find matches quickly.
-        Returns list of (start, tenmer, log2) sorted by start.
-        """
-        expressions = []
-        ids = []
-        id_to_ten = {}
-        id_to_log2 = {}
-        for idx, (ten, log2) in enumerate(self.TENMER_LOG2.items()):
-            expressions.append(ten.encode())
-            ids.append(idx)
-            id_to_ten[idx] = ten
-            id_to_log2[idx] = float(log2)
-        db = hyperscan.Database()
-        db.compile(expressions=expressions, ids=ids, elements=len(expressions))
-        matches: List[Tuple[int, str, float]] = []
+                pass
+        if context is None or context.sequence != seq:
+            context = SequenceContext(seq, normalized=True)
+        return self.TENMER_TABLE.scan(context)
 
-        def on_match(id, start, end, flags, context):
-            ten = id_to_ten[id]
-            log2 = id_to_log2[id]
-            # Hyperscan 'end' parameter is the offset after the match
-            # Calculate actual start position: end - pattern_length
-            actual_start = end - 10
-            matches.append((actual_start, ten, log2))
+    def _find_10mer_matches(self, seq: str,
+                            context: Optional[SequenceContext] = None) -> List[Tuple[int, str, float]]:
+        """
+        Find all exact 10-mer matches in the sequence.
+        
+        Returns list of (start, tenmer, log2) tuples for each match found,
+        including overlapping ones. Merging into regions happens in
+        _merge_matches().
+        """
+        positions, entries = self._find_10mer_hits(seq, context)
+        return self.TENMER_TABLE.as_matches(positions, entries)
 
-        db.scan(seq.encode(), match_event_handler=on_match)
-        matches.sort(key=lambda x: x[0])
-        return matches
+    def _score_regions(self, seq: str, context: Optional[SequenceContext] = None,
+                       merge_gap: int = 0) -> Dict[str, np.ndarray]:
+        """Merged regions with prefix-sum scores (see KmerScoreTable.score_regions)"""
+        positions, entries = self._find_10mer_hits(seq, context)
+        return self.TENMER_TABLE.score_regions(len(seq), positions, entries, merge_gap)
 
-    def _py_find_matches(self, seq: str) -> List[Tuple[int, str, float]]:
-        """Pure-Python exact search (overlapping matches included)"""
-        n = len(seq)
-        matches: List[Tuple[int, str, float]] = []
-        for i in range(0, n - 10 + 1):
-            ten = seq[i:i + 10]
-            log2 = self.TENMER_LOG2.get(ten)
-            if log2 is not None:
-                matches.append((i, ten, float(log2)))
-        return matches
+    def _annotate_regions(self, seq: str, context: Optional[SequenceContext] = None,
+                          include_matches: bool = True) -> List[Dict[str, Any]]:
+        """
+        Region annotations for annotate_sequence(); detect_motifs() skips the
+        per-10-mer 'contributing_10mers' lists it does not report.
+        """
+        # Step 1: Find all 10-mer matches (may overlap)
+        positions, entries = self._find_10mer_hits(seq, context)
+        if positions.size == 0:
+            return []
+        
+        # Step 2: Merge overlapping/adjacent matches into regions (np.diff
+        # on the sorted starts) and score them from the prefix sums of the
+        # per-base contribution track
+        regions = self.TENMER_TABLE.score_regions(len(seq), positions, entries)
+        
+        # Step 3: Create annotation for each merged region
+        matches = self.TENMER_TABLE.as_matches(positions, entries) if include_matches else None
+        bounds = regions['first'].tolist() + [int(positions.size)]
+        annotations = []
+        for i, (s, e, sum_log2, mean_per10) in enumerate(zip(
+                regions['starts'].tolist(), regions['ends'].tolist(),
+                regions['sums'].tolist(), regions['means'].tolist())):
+            ann = {
+                "start": s,
+                "end": e,
+                "length": e - s,
+                "sum_log2": round(sum_log2, 6),
+                "mean_log2_per10mer": round(mean_per10, 6),
+                "n_10mers": bounds[i + 1] - bounds[i],
+            }
+            if include_matches:
+                ann["contributing_10mers"] = [{"tenmer": m[1], "start": m[0], "log2": m[2]}
+                                              for m in matches[bounds[i]:bounds[i + 1]]]
+            annotations.append(ann)
+        return annotations
 
     def _merge_matches(self, matches: List[Tuple[int, str, float]],
                        merge_gap: int = 0) -> List[Tuple[int, int, List[Tuple[int, str, float]]]]:
@@ -1795,63 +1894,40 @@ class APhilicDetector(BaseMotifDetector):
         """
         if not matches:
             return []
-        
-        merged = []
-        # Initialize with first match
-        cur_start, cur_end = matches[0][0], matches[0][0] + 10
-        cur_matches = [matches[0]]
-        
-        # Iterate through remaining matches and merge if overlapping/adjacent
-        for m in matches[1:]:
-            s = m[0]
-            m_end = s + 10
-            
-            # Check if this match overlaps or is within merge_gap of current region
-            if s <= cur_end + merge_gap:
-                # Extend current region and add match
-                cur_end = max(cur_end, m_end)
-                cur_matches.append(m)
-            else:
-                # Gap too large; finalize current region and start new one
-                merged.append((cur_start, cur_end, cur_matches))
-                cur_start, cur_end = s, m_end
-                cur_matches = [m]
-        
-        # Don't forget to add the last region
-        merged.append((cur_start, cur_end, cur_matches))
-        return merged
+        positions = np.array([m[0] for m in matches], dtype=np.int64)
+        starts, ends, first = self.TENMER_TABLE.merge_hits(positions, merge_gap)
+        bounds = first.tolist() + [len(matches)]
+        return [(s, e, matches[bounds[i]:bounds[i + 1]])
+                for i, (s, e) in enumerate(zip(starts.tolist(), ends.tolist()))]
 
     def _find_and_merge_10mer_matches(self, seq: str, merge_gap: int = 0) -> List[Tuple[int, int]]:
-        matches = self._find_10mer_matches(seq)
-        merged = self._merge_matches(matches, merge_gap=merge_gap)
-        return [(s, e) for (s, e, _) in merged]
+        regions = self._score_regions(seq, merge_gap=merge_gap)
+        return list(zip(regions['starts'].tolist(), regions['ends'].tolist()))
 
-    def _build_per_base_contrib(self, seq: str) -> List[float]:
+    def _build_per_base_contrib(self, seq: str,
+                                matches: Optional[List[Tuple[int, str, float]]] = None) -> np.ndarray:
         """
         Build per-base contribution array for the sequence.
         
         For each matched 10-mer starting at position j with log2 value L,
-        we distribute L equally across its 10 bases by adding L/10 to 
-        positions j, j+1, ..., j+9 in the contribution array.
+        L/10 is added to positions j, j+1, ..., j+9, computed
+        as a difference array plus cumsum rather than per-base additions.
         
-        This redistribution allows us to compute region scores as the sum
-        of per-base contributions, properly accounting for overlapping matches.
+        Args:
+            seq: Upper-case sequence
+            matches: Output of _find_10mer_matches(seq), if already computed
         
         Returns:
-            List of floats of length len(seq), where contrib[i] is the total
+            float64 array of length len(seq), where contrib[i] is the total
             contribution from all 10-mers covering position i.
         """
-        n = len(seq)
-        contrib = [0.0] * n
-        matches = self._find_10mer_matches(seq)
-        
-        # Distribute each 10-mer's log2 value across its 10 bases
-        for (start, ten, log2) in matches:
-            per_base = float(log2) / 10.0
-            for k in range(start, min(start + 10, n)):
-                contrib[k] += per_base
-        
-        return contrib
+        if matches is None:
+            positions, entries = self._find_10mer_hits(seq)
+        else:
+            index = {kmer: i for i, kmer in enumerate(self.TENMER_TABLE.kmers)}
+            positions = np.array([m[0] for m in matches], dtype=np.int64)
+            entries = np.array([index[m[1]] for m in matches], dtype=np.int64)
+        return self.TENMER_TABLE.contributions(len(seq), positions, entries)
 
 
 # =============================================================================
@@ -1897,6 +1973,9 @@ class SlippedDNADetector(BaseMotifDetector):
     # | Score         | float | Instability score (0-1)          |
     """
 
+    # Chunked scanning: two 300 bp units plus a 10 bp spacer
+    MAX_MOTIF_FOOTPRINT = 2 * 300 + 10
+
     def get_motif_class_name(self) -> str:
         return "Slipped_DNA"
 
@@ -1979,7 +2058,7 @@ class SlippedDNADetector(BaseMotifDetector):
         return regions
 
     def annotate_sequence(self, sequence: str) -> List[Dict[str, Any]]:
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         regions = []
 
         # Use optimized repeat_scanner if available
@@ -2076,9 +2155,11 @@ class SlippedDNADetector(BaseMotifDetector):
         regions.sort(key=lambda r: r['start'])
         return regions
     
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """Main detection method using algorithmic repeat detection with component details"""
-        regions = self.annotate_sequence(sequence)
+        context = SequenceContext.ensure(sequence, context)
+        regions = self.annotate_sequence(context.sequence)
         motifs = []
         
         for region in regions:
@@ -2251,13 +2332,17 @@ class CruciformDetector(BaseMotifDetector):
     MAX_LOOP = 100
     MAX_MISMATCHES = 0
 
+    # Chunked scanning: two 100 bp arms around a maximal loop
+    MAX_MOTIF_FOOTPRINT = 2 * 100 + MAX_LOOP
+    ORDINAL_PATTERN_PREFIXES = ('CRU_',)
+
     def find_inverted_repeats(self, sequence: str, min_arm: int = None,
                               max_loop: int = None, max_mismatches: int = None) -> List[Dict[str, Any]]:
         """
         Find inverted repeats (cruciform precursors) using optimized k-mer indexing.
-        Falls back to slower exhaustive search only if mismatch tolerance needed.
+        Mismatch-tolerant searches use the diagonal stem engine instead.
         """
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         
         if min_arm is None:
             min_arm = self.MIN_ARM
@@ -2291,7 +2376,7 @@ class CruciformDetector(BaseMotifDetector):
                     'score': round(score, 6)
                 })
         else:
-            # Fallback for mismatch tolerance or when optimized scanner unavailable
+            # Stem engine for mismatch tolerance or when optimized scanner unavailable
             hits = self._find_inverted_repeats_fallback(seq, min_arm, max_loop, max_mismatches)
         
         # Sort by descending score, then position
@@ -2300,128 +2385,38 @@ class CruciformDetector(BaseMotifDetector):
     
     def _find_inverted_repeats_fallback(self, seq: str, min_arm: int, 
                                         max_loop: int, max_mismatches: int) -> List[Dict[str, Any]]:
-        """Fallback implementation for when mismatch tolerance is needed or optimized scanner unavailable"""
-        def revcomp(s: str) -> str:
-            trans = str.maketrans("ACGTacgt", "TGCAtgca")
-            return s.translate(trans)[::-1]
-        
-        hits: List[Dict[str, Any]] = []
-        n = len(seq)
-        
-        # For very long sequences, use adaptive sampling
-        MAX_SEQUENCE_LENGTH = 1000
-        if n > MAX_SEQUENCE_LENGTH:
-            window_size = MAX_SEQUENCE_LENGTH
-            step_size = window_size // 2
-            
-            for window_start in range(0, n, step_size):
-                window_end = min(window_start + window_size, n)
-                window_seq = seq[window_start:window_end]
-                window_hits = self._find_inverted_repeats_in_window(
-                    window_seq, min_arm, max_loop, max_mismatches, revcomp
-                )
-                for hit in window_hits:
-                    hit['left_start'] += window_start
-                    hit['left_end'] += window_start
-                    hit['right_start'] += window_start
-                    hit['right_end'] += window_start
-                    hits.append(hit)
-                if window_end >= n:
-                    break
-            hits = self._deduplicate_hits(hits)
-        else:
-            hits = self._find_inverted_repeats_in_window(seq, min_arm, max_loop, max_mismatches, revcomp)
-        
-        return hits
-    
-    def _find_inverted_repeats_in_window(self, seq: str, min_arm: int, 
-                                         max_loop: int, max_mismatches: int, revcomp_fn=None) -> List[Dict[str, Any]]:
-        """Core inverted repeat detection in a single window"""
-        if revcomp_fn is None:
-            revcomp_fn = revcomp
-        
+        """
+        Stem engine for mismatch tolerance or when the optimized scanner is
+        unavailable: every maximal stem with arm >= min_arm, loop <= max_loop
+        and at most max_mismatches unpaired positions, from
+        SequenceContext.inverted_stems() (diagonals of seq vs. its reverse
+        complement; no windows or sampling).
+        """
+        context = SequenceContext(seq, normalized=True)
+        left_starts, arms, loops, mismatch_counts = context.inverted_stems(min_arm, max_loop, max_mismatches)
         hits: List[Dict[str, Any]] = []
-        n = len(seq)
-        
-        # Adaptive max_loop based on sequence length
-        if n > 500:
-            max_loop = min(max_loop, 50)
-        
-        # Sample positions for large windows
-        step = 1 if n <= 300 else 3 if n <= 600 else 5 if n <= 1000 else 10
-        
-        # Limit total iterations
-        max_iterations = 10000
-        iteration_count = 0
-        MAX_ARM = 100  # Maximum arm length for computational feasibility
-
-        for left_start in range(0, n - 2 * min_arm, step):
-            max_possible_arm = min(MAX_ARM, (n - left_start) // 2)
-            
-            # Search from larger arm lengths first (better quality)
-            for arm_len in range(max_possible_arm, min_arm - 1, -1):
-                left_end = left_start + arm_len
-                right_start_min = left_end
-                right_start_max = min(left_end + max_loop, n - arm_len)
-                
-                found_good_match = False
-                
-                # Check iteration limit
-                iteration_count += 1
-                if iteration_count > max_iterations:
-                    return hits
-                
-                for right_start in range(right_start_min, right_start_max + 1):
-                    loop_len = right_start - left_end
-                    right_end = right_start + arm_len
-                    if right_end > n:
-                        break
-                    left_seq = seq[left_start:left_end]
-                    right_seq = seq[right_start:right_end]
-                    right_rc = revcomp_fn(right_seq)
-                    mismatches = sum(1 for a, b in zip(left_seq, right_rc) if a != b)
-                    if mismatches <= max_mismatches:
-                        match_fraction = (arm_len - mismatches) / arm_len if arm_len > 0 else 0.0
-                        score = self._score_arm_loop(arm_len, loop_len, match_fraction)
-                        hits.append({
-                            'left_start': left_start,
-                            'left_end': left_end,
-                            'right_start': right_start,
-                            'right_end': right_end,
-                            'arm_len': arm_len,
-                            'loop_len': loop_len,
-                            'left_seq': left_seq,
-                            'right_seq': right_seq,
-                            'right_seq_rc': right_rc,
-                            'mismatches': mismatches,
-                            'match_fraction': round(match_fraction, 4),
-                            'score': round(score, 6)
-                        })
-                        found_good_match = True
-                        if mismatches == 0 and score > 0.5:
-                            break
-                
-                if found_good_match and arm_len >= min_arm * 2:
-                    break
-                    
+        for left_start, arm_len, loop_len, mismatches in zip(
+                left_starts.tolist(), arms.tolist(), loops.tolist(), mismatch_counts.tolist()):
+            right_start = left_start + arm_len + loop_len
+            left_seq = seq[left_start:left_start + arm_len]
+            right_seq = seq[right_start:right_start + arm_len]
+            match_fraction = (arm_len - mismatches) / arm_len
+            score = self._score_arm_loop(arm_len, loop_len, match_fraction)
+            hits.append({
+                'left_start': left_start,
+                'left_end': left_start + arm_len,
+                'right_start': right_start,
+                'right_end': right_start + arm_len,
+                'arm_len': arm_len,
+                'loop_len': loop_len,
+                'left_seq': left_seq,
+                'right_seq': right_seq,
+                'right_seq_rc': revcomp(right_seq),
+                'mismatches': mismatches,
+                'match_fraction': round(match_fraction, 4),
+                'score': round(score, 6)
+            })
         return hits
-    
-    def _deduplicate_hits(self, hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate hits that may occur in overlapping windows"""
-        if not hits:
-            return hits
-        
-        # Create a unique key for each hit based on positions
-        seen = {}
-        unique_hits = []
-        
-        for hit in hits:
-            key = (hit['left_start'], hit['left_end'], hit['right_start'], hit['right_end'])
-            if key not in seen:
-                seen[key] = True
-                unique_hits.append(hit)
-        
-        return unique_hits
 
     # --------------------------
     # Scoring function (interpretable)
@@ -2468,7 +2463,7 @@ class CruciformDetector(BaseMotifDetector):
         Return list of detected inverted repeats with details.
         If max_hits > 0, return at most that many top hits (by score). Otherwise return all.
         """
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         hits = self.find_inverted_repeats(seq,
                                          min_arm=self.MIN_ARM,
                                          max_loop=self.MAX_LOOP,
@@ -2531,9 +2526,11 @@ class CruciformDetector(BaseMotifDetector):
         non_overlapping.sort(key=lambda x: x['left_start'])
         return non_overlapping
 
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """Override base method to use sophisticated cruciform detection with component details"""
-        sequence = sequence.upper().strip()
+        context = SequenceContext.ensure(sequence, context)
+        sequence = context.sequence
         motifs = []
         
         # Use the find_inverted_repeats method which has the sophisticated logic
@@ -2560,7 +2557,7 @@ class CruciformDetector(BaseMotifDetector):
             loop_seq = sequence[repeat['left_end']:repeat['right_start']] if repeat['right_start'] > repeat['left_end'] else ''
             
             # Calculate GC content
-            gc_total = (full_seq.count('G') + full_seq.count('C')) / len(full_seq) * 100 if len(full_seq) > 0 else 0
+            gc_total = context.gc_content(start_pos, end_pos)
             gc_left_arm = (left_arm.count('G') + left_arm.count('C')) / len(left_arm) * 100 if len(left_arm) > 0 else 0
             gc_right_arm = (right_arm.count('G') + right_arm.count('C')) / len(right_arm) * 100 if len(right_arm) > 0 else 0
             gc_loop = (loop_seq.count('G') + loop_seq.count('C')) / len(loop_seq) * 100 if len(loop_seq) > 0 else 0
@@ -2617,6 +2614,8 @@ Based on Jenjaroenpun & Wongsurawat 2016.
 """
 
 import re
+import threading
+from functools import lru_cache
 from typing import List, Dict, Any, Tuple, Optional
 from collections import defaultdict
 
@@ -2628,6 +2627,19 @@ except Exception:
     HS_AVAILABLE = False
 
 
+@lru_cache(maxsize=None)
+def _rez_window_tables(lengths: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    G% and score of an REZ window for every (length row, G count), rounded
+    exactly as RLoopDetector._percent_g and _find_rez do.
+    """
+    perc = np.zeros((len(lengths), max(lengths, default=0) + 1))
+    for row, length in enumerate(lengths):
+        perc[row, :length + 1] = [round((g / float(length)) * 100.0, 2) for g in range(length + 1)]
+    score = perc * np.array(lengths, dtype=float)[:, None] / 100.0
+    return perc, score
+
+
 class RLoopDetector(BaseMotifDetector):
     """
     QmRLFS-finder (hyperscan-enhanced) R-loop detector.
@@ -2637,6 +2649,7 @@ class RLoopDetector(BaseMotifDetector):
     - Model 2 (m2): G{4,} tract patterns
     
     Uses Hyperscan when available for fast pattern matching, falls back to re otherwise.
+    One instance may be shared by many threads; each scans with its own scratch space.
     """
     
     # QmRLFS parameters (from Jenjaroenpun 2016)
@@ -2645,14 +2658,32 @@ class RLoopDetector(BaseMotifDetector):
     WINDOW_STEP = 100        # Window step for sliding window
     MAX_LENGTH_REZ = 2000    # Maximum REZ length
     MIN_PERC_G_REZ = 40      # Minimum G% in REZ
+    REZ_LENGTH_STEP = 50     # REZ window lengths are multiples of this
+
+    # G-tract grammar of the RIZ patterns, used to rebuild maximal RIZ spans
+    # without Hyperscan: minimum tract length per model, longest linker
+    RIZ_MIN_TRACT = {'qmrlfs_model_1': 3, 'qmrlfs_model_2': 4}
+    RIZ_MAX_LINKER = 10
+
+    # Chunked scanning: the REZ search reads up to 2 x MAX_LENGTH_REZ past
+    # the RIZ end; allow 500 bp for the RIZ itself
+    MAX_MOTIF_FOOTPRINT = 500 + 2 * MAX_LENGTH_REZ
+    ORDINAL_PATTERN_PREFIXES = ('QmRLFS_',)
     
     def __init__(self):
         super().__init__()
         # Compile hyperscan database if available
         self.hs_db = None
         self.hs_id_to_model = {}
+        self._local = threading.local()
         if HS_AVAILABLE:
             self._compile_hyperscan_patterns()
+        # Regex fallback, compiled once per detector
+        self.riz_linker = re.compile(r'[ATCGU]+', re.IGNORECASE | re.ASCII)
+        self.riz_regexes = {
+            model: [re.compile(pattern_info[0], re.IGNORECASE | re.ASCII) for pattern_info in pattern_list]
+            for model, pattern_list in self.get_patterns().items()
+        }
     
     def get_motif_class_name(self) -> str:
         return "R-Loop"
@@ -2690,7 +2721,9 @@ class RLoopDetector(BaseMotifDetector):
                     pattern = pattern_info[0]
                     expressions.append(pattern.encode())
                     ids.append(next_id)
-                    flags.append(hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_UTF8)
+                    # SOM_LEFTMOST: report the true RIZ start rather than 0
+                    flags.append(hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_UTF8 |
+                                 hyperscan.HS_FLAG_SOM_LEFTMOST)
                     self.hs_id_to_model[next_id] = model_name
                     next_id += 1
             
@@ -2700,53 +2733,89 @@ class RLoopDetector(BaseMotifDetector):
             # If hyperscan compilation fails, fallback to re
             self.hs_db = None
     
-    def _riz_search_hyperscan(self, seq: str, model: str) -> List[Dict[str, Any]]:
-        """Search for RIZ regions using Hyperscan (fast path)"""
+    @staticmethod
+    def _maximal_spans(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Spans not contained in another span, by start."""
+        maximal = []
+        reach = -1
+        for start, end in sorted(spans, key=lambda span: (span[0], -span[1])):
+            if end > reach:
+                maximal.append((start, end))
+                reach = end
+        return maximal
+    
+    def _riz_search_hyperscan_all(self, seq: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Search for RIZ regions of every model in one Hyperscan pass (fast path).
+        
+        Hyperscan reports each end offset of the lazy G-tract patterns, so a
+        G-rich region yields a chain of nested matches; only the maximal ones
+        are kept. Returns None when Hyperscan is unavailable; scan errors are
+        raised rather than answered by the regex path.
+        """
         if not HS_AVAILABLE or self.hs_db is None:
-            return []
+            return None
         
-        result_list = []
+        spans_by_model: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
         seq_bytes = seq.encode('utf-8')
         
         def on_match(id, from_, to, flags, context):
             model_name = self.hs_id_to_model.get(id, None)
-            if model_name and model_name == model:
-                match_bytes = seq_bytes[from_:to]
-                try:
-                    match_str = match_bytes.decode('utf-8')
-                    result_list.append({
-                        'start': from_,
-                        'end': to,
-                        'sequence': match_str
-                    })
-                except UnicodeDecodeError:
-                    pass
+            if model_name:
+                spans_by_model[model_name].append((from_, to))
             return 0
         
-        try:
-            self.hs_db.scan(seq_bytes, match_event_handler=on_match)
-        except Exception:
-            return []
+        local = self._local
+        if getattr(local, 'scratch', None) is None:
+            local.scratch = hyperscan.Scratch(self.hs_db)
         
-        return result_list
+        self.hs_db.scan(seq_bytes, match_event_handler=on_match, scratch=local.scratch)
+        
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        for model_name, spans in spans_by_model.items():
+            result_list = []
+            for from_, to in self._maximal_spans(spans):
+                try:
+                    match_str = seq_bytes[from_:to].decode('utf-8')
+                except UnicodeDecodeError:
+                    continue
+                result_list.append({
+                    'start': from_,
+                    'end': to,
+                    'sequence': match_str
+                })
+            results[model_name] = result_list
+        return results
+    
+    def _riz_search_hyperscan(self, seq: str, model: str) -> List[Dict[str, Any]]:
+        """Search for RIZ regions using Hyperscan (fast path)"""
+        return (self._riz_search_hyperscan_all(seq) or {}).get(model, [])
     
     def _riz_search_regex(self, seq: str, model: str) -> List[Dict[str, Any]]:
-        """Search for RIZ regions using regex (fallback path)"""
-        result_list = []
-        patterns = self.get_patterns()
+        """
+        Search for RIZ regions using regex (fallback path).
         
-        if model not in patterns:
-            return result_list
+        Returns the same maximal spans as the Hyperscan path. G-tracts at
+        most RIZ_MAX_LINKER bases apart are chained, and each chain the
+        model pattern matches as a whole is one RIZ; every shorter match
+        lies inside such a chain.
+        """
+        chains = []
+        for tract in re.finditer('G{%d,}' % self.RIZ_MIN_TRACT[model], seq, re.IGNORECASE):
+            start, end = tract.span()
+            if (chains and start - chains[-1][1] <= self.RIZ_MAX_LINKER
+                    and self.riz_linker.fullmatch(seq, chains[-1][1], start)):
+                chains[-1][1] = end
+            else:
+                chains.append([start, end])
         
-        for pattern_info in patterns[model]:
-            pattern = pattern_info[0]
-            compiled_pattern = re.compile(pattern, re.IGNORECASE | re.ASCII)
-            
-            for match in compiled_pattern.finditer(seq):
+        result_list = []
+        for start, end in chains:
+            if any(pattern.fullmatch(seq, start, end) for pattern in self.riz_regexes.get(model, [])):
                 result_list.append({
-                    'start': match.start(),
-                    'end': match.end(),
-                    'sequence': match.group(0)
+                    'start': start,
+                    'end': end,
+                    'sequence': seq[start:end]
                 })
         
         return result_list
@@ -2756,14 +2825,17 @@ class RLoopDetector(BaseMotifDetector):
         Search for RIZ (R-loop Initiation Zone) regions.
         Uses Hyperscan if available, otherwise falls back to regex.
         """
-        # Try hyperscan first
-        if HS_AVAILABLE and self.hs_db is not None:
-            results = self._riz_search_hyperscan(seq, model)
-            if results:
-                return results
-        
-        # Fallback to regex
-        return self._riz_search_regex(seq, model)
+        return self._riz_search_models(seq, [model])[model]
+    
+    def _riz_search_models(self, seq: str, models: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        RIZ regions for each model: one Hyperscan pass for all models, or the
+        regex search when Hyperscan is unavailable.
+        """
+        found = self._riz_search_hyperscan_all(seq)
+        if found is None:
+            return {model: self._riz_search_regex(seq, model) for model in models}
+        return {model: found.get(model, []) for model in models}
     
     def _percent_g(self, seq: str) -> float:
         """Calculate percentage of G in sequence"""
@@ -2776,40 +2848,63 @@ class RLoopDetector(BaseMotifDetector):
         Find REZ (R-loop Extension Zone) following a RIZ.
         Searches for G-rich regions downstream of RIZ.
         """
+        g_prefix = SequenceContext(seq, normalized=True).prefix_counts('G')
+        return self._find_rez_many(seq, [riz_end], g_prefix)[riz_end]
+
+    def _find_rez_many(self, seq: str, riz_ends: List[int],
+                       g_prefix: np.ndarray) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Best REZ for each RIZ end, keyed by RIZ end.
+
+        Windows start every WINDOW_STEP bases from riz_end + NUM_LINKER and
+        grow in REZ_LENGTH_STEP steps below MAX_LENGTH_REZ. The G count of
+        every window comes from the G prefix sums, and G% and score from
+        tables indexed by (length, G count). The best window is the first
+        maximum in scan order, so the result is the same as a window-by-window
+        search. RIZs that end at the same position share one search, and
+        all RIZs are scored in batches.
+        """
         seq_len = len(seq)
-        
-        # Start search from RIZ end + linker
-        search_start = riz_end + self.NUM_LINKER
-        if search_start >= seq_len:
-            return None
-        
-        # Find the best REZ within max length
-        best_rez = None
-        max_score = 0.0
-        
-        # Sliding window to find best G-rich region
-        for window_start in range(search_start, min(seq_len, riz_end + self.MAX_LENGTH_REZ), self.WINDOW_STEP):
-            for window_end in range(window_start + 50, min(seq_len, window_start + self.MAX_LENGTH_REZ), 50):
-                window_seq = seq[window_start:window_end]
-                
-                perc_g = self._percent_g(window_seq)
-                if perc_g >= self.MIN_PERC_G_REZ:
-                    # Score based on G% and length
-                    score = perc_g * (window_end - window_start) / 100.0
-                    
-                    if score > max_score:
-                        max_score = score
-                        best_rez = {
-                            'start': window_start,
-                            'end': window_end,
-                            'sequence': window_seq,
-                            'perc_g': perc_g,
-                            'length': window_end - window_start,
-                            'score': score
-                        }
-        
-        return best_rez
+        lengths = tuple(range(self.REZ_LENGTH_STEP, self.MAX_LENGTH_REZ, self.REZ_LENGTH_STEP))
+        perc_table, score_table = _rez_window_tables(lengths)
+        window_lengths = np.array(lengths, dtype=np.int64)
+        rows = np.arange(len(lengths))
+        # Window starts relative to the RIZ end
+        offsets = np.arange(self.NUM_LINKER, self.MAX_LENGTH_REZ, self.WINDOW_STEP, dtype=np.int64)
+
+        rez_by_end: Dict[int, Optional[Dict[str, Any]]] = {}
+        unique_ends = np.unique(np.asarray(riz_ends, dtype=np.int64))
+        for chunk in range(0, unique_ends.size, 1024):
+            ends = unique_ends[chunk:chunk + 1024]
+            starts = ends[:, None] + offsets
+            stops = starts[:, :, None] + window_lengths
+            g_counts = (g_prefix[np.minimum(stops, seq_len)]
+                        - g_prefix[np.minimum(starts, seq_len)][:, :, None])
+            eligible = (stops < seq_len) & (perc_table[rows, g_counts] >= self.MIN_PERC_G_REZ)
+            scores = np.where(eligible, score_table[rows, g_counts], 0.0).reshape(ends.size, -1)
+            best = scores.argmax(axis=1) if scores.size else np.zeros(ends.size, dtype=np.int64)
+            for row, riz_end, flat in zip(range(ends.size), ends.tolist(), best.tolist()):
+                if not scores.size or scores[row, flat] <= 0.0:
+                    rez_by_end[riz_end] = None
+                    continue
+                slot, length_row = divmod(flat, len(lengths))
+                window_start = riz_end + int(offsets[slot])
+                window_end = window_start + lengths[length_row]
+                g_count = int(g_counts[row, slot, length_row])
+                rez_by_end[riz_end] = {
+                    'start': window_start,
+                    'end': window_end,
+                    'sequence': seq[window_start:window_end],
+                    'perc_g': float(perc_table[length_row, g_count]),
+                    'length': window_end - window_start,
+                    'score': float(score_table[length_row, g_count])
+                }
+        return rez_by_end
     
+    def motif_footprint(self, motif: Dict[str, Any]) -> int:
+        """RIZ plus the full REZ search range, which extends past the motif end."""
+        return motif.get('RIZ_Length', motif.get('Length', 0)) + 2 * self.MAX_LENGTH_REZ
+
     def _count_g_tracts(self, seq: str, min_g: int) -> Tuple[int, int]:
         """Count G-tracts of minimum length"""
         pattern = r'G{' + str(min_g) + r',}'
@@ -2817,45 +2912,54 @@ class RLoopDetector(BaseMotifDetector):
         total_g = sum(len(t) for t in tracts)
         return len(tracts), total_g
     
-    def annotate_sequence(self, sequence: str, models: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    def annotate_sequence(self, sequence: str, models: Optional[List[str]] = None,
+                          context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Annotate sequence with QmRLFS predictions.
         
         Args:
             sequence: DNA sequence to analyze
             models: List of models to use ['qmrlfs_model_1', 'qmrlfs_model_2'], default both
+            context: Shared SequenceContext built by the caller (optional)
         
         Returns:
             List of R-loop region annotations with RIZ and REZ information
         """
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
+        if context is None:
+            context = SequenceContext(seq, normalized=True)
         
         if models is None:
             models = ['qmrlfs_model_1', 'qmrlfs_model_2']
         
+        # RIZ regions per model that meet the G% threshold
+        riz_by_model = self._riz_search_models(seq, models)
+        for model in models:
+            kept = []
+            for riz in riz_by_model[model]:
+                perc_g_riz = self._percent_g(riz['sequence'])
+                if perc_g_riz >= self.MIN_PERC_G_RIZ:
+                    kept.append((riz, perc_g_riz))
+            riz_by_model[model] = kept
+        
+        # REZ search for all RIZ ends at once
+        rez_by_end = self._find_rez_many(
+            seq, [riz['end'] for kept in riz_by_model.values() for riz, _ in kept],
+            context.prefix_counts('G'))
+        
         results = []
         
         for model in models:
-            # Find all RIZ regions for this model
-            riz_regions = self._riz_search(seq, model)
-            
-            for riz in riz_regions:
+            for riz, perc_g_riz in riz_by_model[model]:
                 riz_seq = riz['sequence']
                 riz_start = riz['start']
                 riz_end = riz['end']
                 
-                # Check if RIZ meets G% threshold
-                perc_g_riz = self._percent_g(riz_seq)
-                if perc_g_riz < self.MIN_PERC_G_RIZ:
-                    continue
-                
                 # Count G-tracts in RIZ
-                min_g = 3 if model == 'qmrlfs_model_1' else 4
                 num_3gs, total_3gs_riz = self._count_g_tracts(riz_seq, 3)
                 num_4gs, total_4gs_riz = self._count_g_tracts(riz_seq, 4)
                 
-                # Try to find REZ
-                rez = self._find_rez(seq, riz_end)
+                rez = rez_by_end[riz_end]
                 
                 # Create result entry
                 result = {
@@ -2976,17 +3080,19 @@ class RLoopDetector(BaseMotifDetector):
         """Quality threshold for R-loop detection"""
         return score >= 0.4
     
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Detect R-loop forming sequences using QmRLFS algorithm.
         
         Returns motifs with RIZ and REZ component information.
         """
-        sequence = sequence.upper().strip()
+        context = SequenceContext.ensure(sequence, context)
+        sequence = context.sequence
         motifs = []
         
         # Use annotation method to find R-loops
-        annotations = self.annotate_sequence(sequence)
+        annotations = self.annotate_sequence(sequence, context=context)
         
         for i, ann in enumerate(annotations):
             # Determine model subclass
@@ -3075,6 +3181,9 @@ class TriplexDetector(BaseMotifDetector):
     # | Score       | float | Formation potential (0-1)        |
     """
 
+    # Chunked scanning: mirror arms around a loop of up to 100 bp
+    MAX_MOTIF_FOOTPRINT = 300
+
     def get_motif_class_name(self) -> str:
         return "Triplex"
 
@@ -3091,16 +3200,22 @@ class TriplexDetector(BaseMotifDetector):
         }
     
     def annotate_sequence(self, sequence: str) -> List[Dict[str, Any]]:
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         results = []
         used = [False] * len(seq)
         patterns = self.get_patterns()['triplex_forming_sequences']
 
         # Use optimized scanner if available
-        if _find_mirror_repeats_optimized is not None:
-            mirror_results = _find_mirror_repeats_optimized(seq, min_arm=10, max_loop=100, 
-                                                            purine_pyrimidine_threshold=0.9)
-            
+        if _find_triplex_mirror_repeats_optimized is not None:
+            # Mirror repeats whose arms pass the triplex threshold (>90% purine
+            # or pyrimidine); seeds outside purine/pyrimidine-rich stretches
+            # are never paired
+            mirror_results = _find_triplex_mirror_repeats_optimized(seq, min_arm=10, max_loop=100,
+                                                                    purine_pyrimidine_threshold=0.9)
+            # Claim positions left to right (longest first at a tie) rather than
+            # in k-mer index order, so calls do not depend on the scan window
+            mirror_results.sort(key=lambda r: (r['Start'], -r['Length']))
+
             # Only keep those that pass the triplex threshold (>90% purine or pyrimidine)
             for mr_rec in mirror_results:
                 if mr_rec.get('Is_Triplex', False):
@@ -3271,9 +3386,11 @@ class TriplexDetector(BaseMotifDetector):
         """Lower threshold for triplex detection"""
         return score >= 0.2  # Lower threshold for better sensitivity
 
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """Override base method to use sophisticated triplex detection with component details"""
-        sequence = sequence.upper().strip()
+        context = SequenceContext.ensure(sequence, context)
+        sequence = context.sequence
         motifs = []
         
         # Use the annotate_sequence method which has the sophisticated logic
@@ -3385,6 +3502,23 @@ CLASS_PRIORITY = [
 class GQuadruplexDetector(BaseMotifDetector):
     """Detector for G-quadruplex DNA motifs using G4Hunter scoring and overlap resolution."""
 
+    # Chunked scanning
+    MAX_MOTIF_FOOTPRINT = 200
+
+    # Per family, from get_patterns(): (shortest G-run every match starts and
+    # ends with, longest stretch inside a match free of such runs). A match
+    # therefore lies within a chain of G-runs of at least that length whose
+    # gaps never exceed the bound, so each regex only runs over those chains.
+    CANDIDATE_TRACTS = {
+        'canonical_g4': (3, 7),
+        'relaxed_g4': (2, 12),
+        'long_loop_g4': (3, 15),
+        'bulged_g4': (2, 11),      # [ACGT]{0,3} + single-G bulge + 7-base loop
+        'multimeric_g4': (3, 7),
+        'imperfect_g4': (2, 22),   # 10-base loop + [AG]G + 10-base loop
+        'g_triplex': (3, 7),
+    }
+
     def get_motif_class_name(self) -> str:
         """Returns high-level motif class name for reporting."""
         return "G-Quadruplex"
@@ -3437,20 +3571,24 @@ class GQuadruplexDetector(BaseMotifDetector):
     def calculate_score(self, sequence: str, pattern_info: Tuple = None) -> float:
         """Compute total score for all accepted G4 regions after overlap resolution."""
         seq = sequence.upper()
-        candidates = self._find_all_candidates(seq)
-        scored = [self._score_candidate(c, seq) for c in candidates]
+        context = SequenceContext(seq, normalized=True)
+        candidates = self._find_all_candidates(seq, context)
+        scored = self._score_candidates(candidates, seq, context)
         accepted = self._resolve_overlaps(scored)
         total = sum(a['score'] for a in accepted)
         return float(total)
 
-    def annotate_sequence(self, sequence: str) -> List[Dict[str, Any]]:
+    def annotate_sequence(self, sequence: str,
+                          context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Annotate all accepted motif regions after overlap resolution.
         Returns dicts: class_name, pattern_id, start, end, length, score, matched_seq, details.
         """
-        seq = sequence.upper()
-        candidates = self._find_all_candidates(seq)
-        scored = [self._score_candidate(c, seq) for c in candidates]
+        seq = normalize_sequence(sequence)
+        if context is None:
+            context = SequenceContext(seq, normalized=True)
+        candidates = self._find_all_candidates(seq, context)
+        scored = self._score_candidates(candidates, seq, context)
         accepted = self._resolve_overlaps(scored)
         anns = []
         for a in accepted:
@@ -3467,50 +3605,90 @@ class GQuadruplexDetector(BaseMotifDetector):
             anns.append(ann)
         return anns
 
-    def _find_all_candidates(self, seq: str) -> List[Dict[str, Any]]:
+    def _tract_chains(self, context: SequenceContext, min_run: int, max_gap: int,
+                      min_length: int = MIN_REGION_LEN) -> List[Tuple[int, int]]:
+        """
+        (start, end) of each chain of G-runs of at least min_run bases whose
+        gaps are at most max_gap bases of A/C/G/T, from the G-run table.
+        Chains shorter than min_length are left out.
+        """
+        starts, ends = context.g_runs
+        long_enough = (ends - starts) >= min_run
+        starts, ends = starts[long_enough], ends[long_enough]
+        if starts.size == 0:
+            return []
+        non_acgt = context.prefix_counts('N')
+        broken = ((starts[1:] - ends[:-1]) > max_gap) | (non_acgt[starts[1:]] > non_acgt[ends[:-1]])
+        heads = np.flatnonzero(np.concatenate(([True], broken)))
+        tails = np.concatenate((heads[1:], [starts.size])) - 1
+        chain_starts, chain_ends = starts[heads], ends[tails]
+        long_enough = (chain_ends - chain_starts) >= min_length
+        return list(zip(chain_starts[long_enough].tolist(), chain_ends[long_enough].tolist()))
+
+    def _find_all_candidates(self, seq: str,
+                             context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Find all regions matching any G4 motif.
         Returns: list of {class_name, pattern_id, start, end, match_text}.
+
+        Each family's regex only scans the G-run chains that can hold one of
+        its matches (CANDIDATE_TRACTS) and are at least MIN_REGION_LEN long;
+        matches never cross a chain boundary, so the result equals a scan of
+        the whole sequence.
         """
+        if context is None:
+            context = SequenceContext(seq, normalized=True)
         patt_groups = self.get_patterns()
         candidates = []
         for class_name, patterns in patt_groups.items():
+            tracts = self.CANDIDATE_TRACTS.get(class_name)
+            spans = self._tract_chains(context, *tracts) if tracts else [(0, len(seq))]
             for pat in patterns:
-                regex = pat[0]
+                regex = re.compile(pat[0])
                 pattern_id = pat[1] if len(pat) > 1 else f"{class_name}_pat"
-                for m in re.finditer(regex, seq):
-                    s, e = m.start(), m.end()
-                    if (e - s) < MIN_REGION_LEN:
-                        continue
-                    candidates.append({
-                        'class_name': class_name,
-                        'pattern_id': pattern_id,
-                        'start': s,
-                        'end': e,
-                        'match_text': seq[s:e]
-                    })
+                for span_start, span_end in spans:
+                    for m in regex.finditer(seq, span_start, span_end):
+                        s, e = m.start(), m.end()
+                        if (e - s) < MIN_REGION_LEN:
+                            continue
+                        candidates.append({
+                            'class_name': class_name,
+                            'pattern_id': pattern_id,
+                            'start': s,
+                            'end': e,
+                            'match_text': seq[s:e]
+                        })
         return candidates
 
-    def _score_candidate(self, candidate: Dict[str, Any], seq: str, window_size: int = WINDOW_SIZE_DEFAULT) -> Dict[str, Any]:
+    def _score_candidates(self, candidates: List[Dict[str, Any]], seq: str,
+                          context: SequenceContext,
+                          window_size: int = WINDOW_SIZE_DEFAULT) -> List[Dict[str, Any]]:
+        """
+        _score_candidate for every candidate, with the G4Hunter window peaks
+        of all candidates read from one sequence-wide table.
+        """
+        if not candidates:
+            return []
+        peaks = context.g4hunter_peaks([c['start'] for c in candidates],
+                                       [c['end'] for c in candidates], window_size)
+        return [self._score_candidate(c, seq, window_size, max_abs)
+                for c, max_abs in zip(candidates, peaks.tolist())]
+
+    def _score_candidate(self, candidate: Dict[str, Any], seq: str, window_size: int = WINDOW_SIZE_DEFAULT,
+                         max_abs: Optional[int] = None) -> Dict[str, Any]:
         """
         Calculate per-region G4Hunter-derived score plus tract/GC penalties.
         Returns candidate dict plus 'score' and 'details'.
         Also extracts G-quadruplex components (stems and loops).
+        max_abs is the region's peak |G - C| window when already known.
         """
         s = candidate['start']
         e = candidate['end']
         region = seq[s:e]
         L = len(region)
-        vals = [1 if ch == 'G' else -1 if ch == 'C' else 0 for ch in region]
         ws = min(window_size, L)
-        max_abs = 0
-        if ws > 0:
-            cur = sum(vals[0:ws])
-            max_abs = abs(cur)
-            for i in range(1, L - ws + 1):
-                cur += vals[i + ws - 1] - vals[i - 1]
-                if abs(cur) > max_abs:
-                    max_abs = abs(cur)
+        if max_abs is None:
+            max_abs = g4hunter_peak(region, window_size)
         normalized_window = (max_abs / ws) if ws > 0 else 0.0
         g_tracts = re.findall(r'G{2,}', region)
         n_g = len(g_tracts)
@@ -3620,7 +3798,8 @@ class GQuadruplexDetector(BaseMotifDetector):
         accepted.sort(key=lambda x: x['start'])
         return accepted
 
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Override base method to use annotate_sequence with overlap resolution.
         
@@ -3630,11 +3809,12 @@ class GQuadruplexDetector(BaseMotifDetector):
         Returns:
             List of motif dictionaries with complete G4 component information
         """
-        sequence = sequence.upper().strip()
+        context = SequenceContext.ensure(sequence, context)
+        sequence = context.sequence
         motifs = []
         
         # Use annotate_sequence which includes overlap resolution
-        annotations = self.annotate_sequence(sequence)
+        annotations = self.annotate_sequence(sequence, context=context)
         
         for i, annotation in enumerate(annotations):
             # Map class_name to subclass display name
@@ -3745,6 +3925,10 @@ def _class_prio_idx(class_name: str) -> int:
 class IMotifDetector(BaseMotifDetector):
     """Detector for i-motif DNA structures (updated: Hur et al. 2021, Benabou 2014)[web:92][web:98][web:100]"""
 
+    # Chunked scanning
+    MAX_MOTIF_FOOTPRINT = 200
+    ORDINAL_PATTERN_PREFIXES = ('IMOT_',)
+
     def get_motif_class_name(self) -> str:
         return "i-Motif"
 
@@ -3771,7 +3955,7 @@ class IMotifDetector(BaseMotifDetector):
         }
 
     def find_validated_matches(self, sequence: str, check_revcomp: bool = False) -> List[Dict[str, Any]]:
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         out = []
         for vid, vseq, desc, cite in VALIDATED_SEQS:
             idx = seq.find(vseq)
@@ -3785,7 +3969,7 @@ class IMotifDetector(BaseMotifDetector):
         return out
 
     def find_hur_ac_candidates(self, sequence: str, scan_rc: bool = True) -> List[Dict[str, Any]]:
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         candidates = []
 
         def _matches_hur_ac(target, strand):
@@ -3815,7 +3999,7 @@ class IMotifDetector(BaseMotifDetector):
         return candidates
 
     def _find_regex_candidates(self, sequence: str) -> List[Dict[str, Any]]:
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         patterns = self.get_patterns()
         out = []
         for class_name, pats in patterns.items():
@@ -3916,7 +4100,7 @@ class IMotifDetector(BaseMotifDetector):
         return total
 
     def annotate_sequence(self, sequence: str) -> Dict[str, Any]:
-        seq = sequence.upper()
+        seq = normalize_sequence(sequence)
         res = {}
         res['validated_matches'] = self.find_validated_matches(seq, check_revcomp=True)
         hur_cands = self.find_hur_ac_candidates(seq, scan_rc=True)
@@ -3932,14 +4116,16 @@ class IMotifDetector(BaseMotifDetector):
         res['accepted'] = self._resolve_overlaps_greedy(combined, merge_gap=0)
         return res
     
-    def detect_motifs(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+    def detect_motifs(self, sequence: str, sequence_name: str = "sequence",
+                      context: Optional[SequenceContext] = None) -> List[Dict[str, Any]]:
         """
         Detect i-motif structures with component details and overlap resolution.
         
         This ensures that for overlapping i-motif subclass motifs, only the longest or 
         highest-scoring non-overlapping motif is reported within each subclass.
         """
-        seq = sequence.upper()
+        context = SequenceContext.ensure(sequence, context)
+        seq = context.sequence
         motifs = []
         
         # Use annotate_sequence which includes overlap resolution
@@ -3975,7 +4161,7 @@ class IMotifDetector(BaseMotifDetector):
                     loops.append(motif_seq[loop_start:loop_end])
             
             # Calculate GC content
-            gc_total = (motif_seq.count('G') + motif_seq.count('C')) / len(motif_seq) * 100 if len(motif_seq) > 0 else 0
+            gc_total = context.gc_content(start_pos, end_pos)
             gc_stems = 0
             if c_tracts:
                 all_stems = ''.join(c_tracts)
@@ -4015,3 +4201,113 @@ class IMotifDetector(BaseMotifDetector):
             motifs.append(motif)
         
         return motifs
+
+
+# =============================================================================
+# Shared Detector Instances
+# =============================================================================
+"""
+Detectors keep no per-call state: everything they build in __init__ (pattern
+tables, compiled regexes, Hyperscan databases) is read-only afterwards. One
+instance per class can therefore be shared by every NonBScanner, registry and
+worker in a process, so constructing a scanner no longer recompiles anything.
+"""
+
+DETECTOR_CLASSES = {
+    'curved_dna': CurvedDNADetector,
+    'slipped_dna': SlippedDNADetector,
+    'cruciform': CruciformDetector,
+    'r_loop': RLoopDetector,
+    'triplex': TriplexDetector,
+    'g_quadruplex': GQuadruplexDetector,
+    'i_motif': IMotifDetector,
+    'z_dna': ZDNADetector,
+    'a_philic': APhilicDetector,
+}
+
+_SHARED_DETECTORS: Dict[str, BaseMotifDetector] = {}
+_SHARED_DETECTORS_LOCK = threading.Lock()
+
+
+def get_shared_detector(key: str) -> BaseMotifDetector:
+    """
+    Return the process-wide instance of a detector, constructing it on first use.
+    
+    Args:
+        key: Detector key from DETECTOR_CLASSES (e.g. 'g_quadruplex')
+    """
+    detector = _SHARED_DETECTORS.get(key)
+    if detector is None:
+        with _SHARED_DETECTORS_LOCK:
+            detector = _SHARED_DETECTORS.get(key)
+            if detector is None:
+                detector = DETECTOR_CLASSES[key]()
+                _SHARED_DETECTORS[key] = detector
+    return detector
+
+
+# =============================================================================
+# Class Selection
+# =============================================================================
+
+# Motif Class reported by each detector
+# | Key          | Class        | Also accepted |
+# |--------------|--------------|---------------|
+# | curved_dna   | Curved_DNA   | curved        |
+# | slipped_dna  | Slipped_DNA  | slipped       |
+# | cruciform    | Cruciform    |               |
+# | r_loop       | R-Loop       |               |
+# | triplex      | Triplex      |               |
+# | g_quadruplex | G-Quadruplex | g4            |
+# | i_motif      | i-Motif      |               |
+# | z_dna        | Z-DNA        |               |
+# | a_philic     | A-philic_DNA | aphilic       |
+DETECTOR_MOTIF_CLASSES = {
+    'curved_dna': 'Curved_DNA',
+    'slipped_dna': 'Slipped_DNA',
+    'cruciform': 'Cruciform',
+    'r_loop': 'R-Loop',
+    'triplex': 'Triplex',
+    'g_quadruplex': 'G-Quadruplex',
+    'i_motif': 'i-Motif',
+    'z_dna': 'Z-DNA',
+    'a_philic': 'A-philic_DNA',
+}
+
+_CLASS_ALIASES = {'curved': 'curved_dna', 'slipped': 'slipped_dna',
+                  'g4': 'g_quadruplex', 'aphilic': 'a_philic'}
+
+
+def _normalize_class_label(label: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', label.lower())
+
+
+_CLASS_LOOKUP = {_normalize_class_label(label): key
+                 for key, name in DETECTOR_MOTIF_CLASSES.items() for label in (key, name)}
+_CLASS_LOOKUP.update({_normalize_class_label(alias): key for alias, key in _CLASS_ALIASES.items()})
+
+
+def resolve_detector_keys(classes=None) -> List[str]:
+    """
+    Map a class selection to DETECTOR_CLASSES keys, in registry order.
+    
+    Args:
+        classes: Detector keys ('g_quadruplex'), motif Class names
+            ('G-Quadruplex') or the aliases above, case- and
+            punctuation-insensitive. None selects every detector.
+    
+    Raises:
+        ValueError: If a label matches no detector
+    """
+    if classes is None:
+        return list(DETECTOR_CLASSES)
+    if isinstance(classes, str):
+        classes = [classes]
+    selected = set()
+    for label in classes:
+        key = _CLASS_LOOKUP.get(_normalize_class_label(label))
+        if key is None:
+            raise ValueError(f"Unknown motif class: {label!r}. "
+                             f"Choose from {', '.join(DETECTOR_CLASSES)}")
+        selected.add(key)
+    return [key for key in DETECTOR_CLASSES if key in selected]
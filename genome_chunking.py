@@ -0,0 +1,185 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                        GENOME CHUNKING MODULE                                 ║
+║          Footprint-Sized Overlaps and Exact Stitching of Chunk Results       ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+MODULE: genome_chunking.py
+AUTHOR: Dr. Venkata Rajesh Yella
+VERSION: 2024.2 - Boundary-Correct Chunking
+LICENSE: MIT
+
+DESCRIPTION:
+    Splits a long sequence into fixed-size core chunks and scans each core
+    inside a padded window. Padding is sized from the detectors' declared
+    MAX_MOTIF_FOOTPRINT rather than a fixed overlap, so a motif is always seen
+    whole by the window of the chunk that owns it. A motif belongs to the chunk
+    whose core contains its start, which removes duplicates by construction.
+
+STITCHING RULES:
+    ┌──────────────────────┬──────────────────────────────────────────────────┐
+    │ Step                 │ Action                                           │
+    ├──────────────────────┼──────────────────────────────────────────────────┤
+    │ 1. Pad               │ window = core ± max footprint of the detectors   │
+    │ 2. Grow              │ Rescan with a wider window when a motif touching │
+    │                      │ the core reaches a cut edge                      │
+    │ 3. Own               │ Keep motifs whose start lies inside the core     │
+    │ 4. Shift             │ Move coordinates, IDs and component positions    │
+    │ 5. Renumber          │ Re-issue ordinal Pattern_IDs genome-wide         │
+    └──────────────────────┴──────────────────────────────────────────────────┘
+
+    Detector output is stitched per detector, in chunk order, so the merged
+    lists match what the detector returns for the whole sequence. Hybrid and
+    cluster detection run afterwards on the merged lists (see NonBScanner).
+
+USAGE:
+    from genome_chunking import scan_chunked
+
+    per_detector = scan_chunked(scanner.detectors, sequence, "chr1", 1_000_000)
+"""
+
+import warnings
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sequence_context import SequenceContext
+
+DEFAULT_CHUNK_SIZE = 1_000_000  # 1 Mb cores keep per-window memory small
+
+# Motif fields holding sequence coordinates besides Start/End
+# | Field            | Convention        | Detector  |
+# |------------------|-------------------|-----------|
+# | RIZ_Start        | 1-based           | R-loop    |
+# | RIZ_End          | 1-based inclusive | R-loop    |
+# | REZ_Start        | 0-based (or None) | R-loop    |
+# | REZ_End          | 0-based (or None) | R-loop    |
+# | Center_Positions | 0-based list      | Curved    |
+POSITION_FIELDS = ('RIZ_Start', 'RIZ_End', 'REZ_Start', 'REZ_End')
+POSITION_LIST_FIELDS = ('Center_Positions',)
+
+
+def max_motif_footprint(detectors: Iterable[Any]) -> int:
+    """Largest MAX_MOTIF_FOOTPRINT over detector instances or classes."""
+    return max((d.MAX_MOTIF_FOOTPRINT for d in detectors), default=0)
+
+
+def plan_chunks(length: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Split [0, length) into consecutive, non-overlapping (start, end) cores."""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    return [(start, min(start + chunk_size, length))
+            for start in range(0, length, chunk_size)]
+
+
+def shift_motif(motif: Dict[str, Any], offset: int) -> Dict[str, Any]:
+    """
+    Move a motif found in a window starting at `offset` to sequence
+    coordinates. Updates Start/End, the position suffix of ID and the
+    component positions listed in POSITION_FIELDS, in place.
+    """
+    if not offset:
+        return motif
+    motif['Start'] += offset
+    motif['End'] += offset
+    motif_id = motif.get('ID')
+    if isinstance(motif_id, str) and '_' in motif_id:
+        motif['ID'] = f"{motif_id[:motif_id.rfind('_') + 1]}{motif['Start']}"
+    for field in POSITION_FIELDS:
+        if motif.get(field) is not None:
+            motif[field] += offset
+    for field in POSITION_LIST_FIELDS:
+        if field in motif:
+            motif[field] = [pos + offset for pos in motif[field]]
+    return motif
+
+
+def _scan_window(detectors: Dict[str, Any], window: str,
+                 sequence_name: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Run every detector over one window with a shared context."""
+    context = SequenceContext(window, normalized=True)
+    found = {}
+    for key, detector in detectors.items():
+        try:
+            found[key] = detector.detect_motifs(window, sequence_name, context=context)
+        except Exception as e:
+            warnings.warn(f"Error in {key} detector: {e}")
+            found[key] = []
+    return found
+
+
+def scan_chunk(detectors: Dict[str, Any], sequence: str, sequence_name: str,
+               core_start: int, core_end: int,
+               pad: int = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Detect the motifs owned by one core chunk.
+
+    Args:
+        detectors: Detector instances keyed by name (NonBScanner.detectors)
+        sequence: Full normalized sequence
+        sequence_name: Identifier for the sequence
+        core_start, core_end: 0-based half-open core interval
+        pad: Initial padding on both sides (default: max footprint)
+
+    Returns:
+        Dict of detector key → motifs in sequence coordinates, each motif
+        starting inside the core
+    """
+    n = len(sequence)
+    if pad is None:
+        pad = max_motif_footprint(detectors.values())
+    left = right = pad
+
+    while True:
+        win_start = max(0, core_start - left)
+        win_end = min(n, core_end + right)
+        found = _scan_window(detectors, sequence[win_start:win_end], sequence_name)
+
+        # A motif that begins within its own length of the left cut may be
+        # the tail of a longer one; a motif whose footprint runs past the
+        # right cut was called on truncated context. Widen and rescan.
+        need_left = need_right = 0
+        for key, motifs in found.items():
+            detector = detectors[key]
+            for motif in motifs:
+                start = win_start + motif['Start'] - 1
+                end = win_start + motif['End']
+                if win_start > 0 and start < core_start < end and start - win_start < end - start:
+                    need_left = max(need_left, 2 * (end - start))
+                reach = start + detector.motif_footprint(motif)
+                if win_end < n and start < core_end and reach > win_end:
+                    need_right = max(need_right, reach - core_end + pad)
+
+        grown = False
+        if need_left > left:
+            left, grown = need_left, True
+        if need_right > right:
+            right, grown = need_right, True
+        if not grown:
+            break
+
+    owned = {}
+    for key, motifs in found.items():
+        owned[key] = [
+            shift_motif(motif, win_start) for motif in motifs
+            if core_start <= win_start + motif['Start'] - 1 < core_end
+        ]
+    return owned
+
+
+def scan_chunked(detectors: Dict[str, Any], sequence: str, sequence_name: str,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run all detectors over `sequence` chunk by chunk.
+
+    The result has the same shape as running each detector on the whole
+    sequence: per-detector motif lists in detector output order, with
+    ordinal Pattern_IDs numbered across the full sequence.
+    """
+    pad = max_motif_footprint(detectors.values())
+    merged = {key: [] for key in detectors}
+    for core_start, core_end in plan_chunks(len(sequence), chunk_size):
+        owned = scan_chunk(detectors, sequence, sequence_name, core_start, core_end, pad)
+        for key, motifs in owned.items():
+            merged[key].extend(motifs)
+    for key, detector in detectors.items():
+        detector.number_ordinal_pattern_ids(merged[key])
+    return merged
@@ -24,6 +24,8 @@ DESCRIPTION:
 ARCHITECTURE:
     - 11 motif types registered (one entry per detector class)
     - Seed patterns: Simple regex without backtracking for initial filtering
+    - Repeat seeds: k-mer pair / periodicity tests for repeat families, which
+      no backtracking-free regex can express (see REPEAT SEED FINDERS)
     - Scan functions: Sophisticated scoring with backtracking for accuracy
     - Window sizes: Configurable padding around seed matches
     - Parallel execution: Each motif can be processed independently
@@ -40,6 +42,16 @@ from typing import List, Dict, Any, Tuple, Callable, Optional
 from dataclasses import dataclass
 import re
 
+import numpy as np
+
+from sequence_context import SequenceContext, find_runs
+from scanner import (
+    DIRECT_MIN_UNIT, DIRECT_MAX_UNIT, DIRECT_MAX_SPACER,
+    INVERTED_MIN_ARM, INVERTED_MAX_LOOP,
+    MIRROR_MIN_ARM, MIRROR_MAX_LOOP,
+    STR_MIN_UNIT, STR_MAX_UNIT, STR_MIN_TOTAL
+)
+
 # Try to import hyperscan
 try:
     import hyperscan
@@ -61,6 +73,9 @@ class MotifClass:
         scan_fn: Function(seq_window) -> List[Hit] for Layer 2 scoring
         description: Human-readable description
         priority: Processing priority (higher = process first)
+        detector_key: DETECTOR_CLASSES key of the detector behind scan_fn
+        seed_fn: Function(SequenceContext) -> (starts, ends) candidate
+                 intervals; replaces seed_regex when set
     """
     name: str
     seed_regex: str
@@ -69,6 +84,90 @@ class MotifClass:
     scan_fn: Callable[[str, str], List[Dict[str, Any]]]
     description: str
     priority: int = 5
+    detector_key: str = ''
+    seed_fn: Optional[Callable[[SequenceContext], Tuple[np.ndarray, np.ndarray]]] = None
+
+
+# =============================================================================
+# REPEAT SEED FINDERS
+# =============================================================================
+"""
+Every repeat the scanner.py finders report implies an exact k-mer relation
+near its centre, so these tests are necessary conditions: a region with no
+seed cannot contain a motif. All seeds of one family are merged into
+candidate intervals with a coverage sweep, so Layer 1 emits one hit per
+region rather than one per k-mer pair.
+
+# | Family          | Seed (k-mers at p < q)                   | q - p              |
+# |-----------------|------------------------------------------|--------------------|
+# | Direct repeat   | kmer(p) == kmer(q), k = DIRECT_MIN_UNIT  | unit + spacer      |
+# | Inverted repeat | kmer(p) == revcomp(kmer(q)), k = min arm | k + loop           |
+# | Mirror repeat   | kmer(p) == reverse(kmer(q)), k = min arm | k + loop           |
+# | STR             | base(i) == base(i + u), run >= total - u | u = 1..STR_MAX_UNIT|
+
+For inverted and mirror repeats the seed is the innermost k-mer of each arm,
+so the registry window must cover the arms' outward extension.
+"""
+
+
+def _merge_spans(length: int, starts: List[np.ndarray],
+                 ends: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Union of [start, end) spans as disjoint (starts, ends) intervals"""
+    coverage = np.zeros(length + 1, dtype=np.int64)
+    for s, e in zip(starts, ends):
+        np.add.at(coverage, s, 1)
+        np.add.at(coverage, e, -1)
+    return find_runs(np.cumsum(coverage[:length]) > 0)
+
+
+def _kmer_pair_seeds(context: SequenceContext, k: int, how: str,
+                     min_gap: int, max_gap: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Spans [p, q + k) of k-mer pairs with matching codes and min_gap <= q - p <= max_gap"""
+    left = context.kmer_codes(k)
+    right = context.kmer_codes(k, how)
+    m = len(left)
+    starts, ends = [], []
+    for gap in range(min_gap, min(max_gap, m - 1) + 1):
+        a = left[:m - gap]
+        p = np.flatnonzero((a == right[gap:]) & (a >= 0))
+        if p.size:
+            starts.append(p)
+            ends.append(p + gap + k)
+    return _merge_spans(context.length, starts, ends)
+
+
+def direct_repeat_seeds(context: SequenceContext) -> Tuple[np.ndarray, np.ndarray]:
+    """Candidate direct repeats: equal DIRECT_MIN_UNIT-mers one unit + spacer apart"""
+    return _kmer_pair_seeds(context, DIRECT_MIN_UNIT, 'forward',
+                            DIRECT_MIN_UNIT, DIRECT_MAX_UNIT + DIRECT_MAX_SPACER)
+
+
+def inverted_repeat_seeds(context: SequenceContext) -> Tuple[np.ndarray, np.ndarray]:
+    """Candidate inverted repeats: inner arm k-mers that are reverse complements"""
+    return _kmer_pair_seeds(context, INVERTED_MIN_ARM, 'revcomp',
+                            INVERTED_MIN_ARM, INVERTED_MIN_ARM + INVERTED_MAX_LOOP)
+
+
+def mirror_repeat_seeds(context: SequenceContext) -> Tuple[np.ndarray, np.ndarray]:
+    """Candidate mirror repeats: inner arm k-mers that are reverses of each other"""
+    return _kmer_pair_seeds(context, MIRROR_MIN_ARM, 'reverse',
+                            MIRROR_MIN_ARM, MIRROR_MIN_ARM + MIRROR_MAX_LOOP)
+
+
+def str_seeds(context: SequenceContext) -> Tuple[np.ndarray, np.ndarray]:
+    """Candidate STRs: runs where the sequence is periodic with a 1-9 bp unit"""
+    codes = context.codes
+    starts, ends = [], []
+    for unit in range(STR_MIN_UNIT, STR_MAX_UNIT + 1):
+        if unit >= context.length:
+            break
+        head = codes[:-unit]
+        run_starts, run_ends = find_runs((head == codes[unit:]) & (head < 4))
+        # A run of r matches is r + unit periodic bases: >= 2 copies, >= min total
+        keep = (run_ends - run_starts) >= max(STR_MIN_TOTAL - unit, unit)
+        starts.append(run_starts[keep])
+        ends.append(run_ends[keep] + unit)
+    return _merge_spans(context.length, starts, ends)
 
 
 class MotifRegistry:
@@ -85,6 +184,7 @@ class MotifRegistry:
         self.motifs: List[MotifClass] = []
         self._register_all_motifs()
         self._compiled_db = None
+        self._subset_dbs = {}
         
     def _register_all_motifs(self):
         """Register all 11 motif types with seed patterns and scan functions"""
@@ -108,16 +208,17 @@ class MotifRegistry:
             """Create scan function that properly captures detector instance"""
             return lambda seq, name: detector.detect_motifs(seq, name)
         
-        # Create detector instances
-        g4_detector = GQuadruplexDetector()
-        imotif_detector = IMotifDetector()
-        zdna_detector = ZDNADetector()
-        curved_detector = CurvedDNADetector()
-        slipped_detector = SlippedDNADetector()
-        cruciform_detector = CruciformDetector()
-        rloop_detector = RLoopDetector()
-        triplex_detector = TriplexDetector()
-        aphilic_detector = APhilicDetector()
+        # Reuse the process-wide detector instances
+        from detectors import get_shared_detector
+        g4_detector = get_shared_detector('g_quadruplex')
+        imotif_detector = get_shared_detector('i_motif')
+        zdna_detector = get_shared_detector('z_dna')
+        curved_detector = get_shared_detector('curved_dna')
+        slipped_detector = get_shared_detector('slipped_dna')
+        cruciform_detector = get_shared_detector('cruciform')
+        rloop_detector = get_shared_detector('r_loop')
+        triplex_detector = get_shared_detector('triplex')
+        aphilic_detector = get_shared_detector('a_philic')
         
         # 1. G-Quadruplex (7 subclasses)
         self.motifs.append(MotifClass(
@@ -127,7 +228,8 @@ class MotifRegistry:
             window_size=200,
             scan_fn=make_scan_fn(g4_detector),
             description="Canonical G-quadruplex seed",
-            priority=10
+            priority=10,
+            detector_key='g_quadruplex'
         ))
         
         # 2. i-Motif (3 subclasses)
@@ -138,7 +240,8 @@ class MotifRegistry:
             window_size=200,
             scan_fn=make_scan_fn(imotif_detector),
             description="i-Motif seed pattern",
-            priority=9
+            priority=9,
+            detector_key='i_motif'
         ))
         
         # 3. Z-DNA (2 subclasses)
@@ -149,7 +252,8 @@ class MotifRegistry:
             window_size=150,
             scan_fn=make_scan_fn(zdna_detector),
             description="Z-DNA alternating purine-pyrimidine",
-            priority=8
+            priority=8,
+            detector_key='z_dna'
         ))
         
         # 4. Curved DNA (2 subclasses)
@@ -160,40 +264,47 @@ class MotifRegistry:
             window_size=150,
             scan_fn=make_scan_fn(curved_detector),
             description="Curved DNA A-tracts",
-            priority=7
+            priority=7,
+            detector_key='curved_dna'
         ))
         
         # 5. Slipped DNA - Direct Repeat
         self.motifs.append(MotifClass(
             name="Direct_Repeat",
-            seed_regex=r"([ACGT]{6,})",  # Simple repeat unit seed
+            seed_regex='',  # k-mer pair seed (see seed_fn)
             seed_id=5,
-            window_size=300,
+            window_size=DIRECT_MAX_SPACER,  # seeds tile the whole repeat
             scan_fn=make_scan_fn(slipped_detector),
             description="Direct repeat seed",
-            priority=6
+            priority=6,
+            seed_fn=direct_repeat_seeds,
+            detector_key='slipped_dna'
         ))
         
         # 6. Slipped DNA - STR
         self.motifs.append(MotifClass(
             name="STR",
-            seed_regex=r"([ACGT]{1,6})\1{2,}",  # 3-4 unit repeats
+            seed_regex='',  # periodicity seed (see seed_fn)
             seed_id=6,
-            window_size=200,
+            window_size=STR_MAX_UNIT,
             scan_fn=make_scan_fn(slipped_detector),
             description="Short tandem repeat seed",
-            priority=6
+            priority=6,
+            seed_fn=str_seeds,
+            detector_key='slipped_dna'
         ))
         
         # 7. Cruciform - Inverted Repeat
         self.motifs.append(MotifClass(
             name="Inverted_Repeat",
-            seed_regex=r"[ACGT]{6,}",  # Arm seed (minimal loop)
+            seed_regex='',  # inner-arm revcomp k-mer pair (see seed_fn)
             seed_id=7,
-            window_size=250,
+            window_size=100,  # outward arm extension
             scan_fn=make_scan_fn(cruciform_detector),
             description="Inverted repeat arm seed",
-            priority=6
+            priority=6,
+            seed_fn=inverted_repeat_seeds,
+            detector_key='cruciform'
         ))
         
         # 8. R-Loop (3 subclasses)
@@ -204,18 +315,21 @@ class MotifRegistry:
             window_size=300,
             scan_fn=make_scan_fn(rloop_detector),
             description="R-loop formation site seed",
-            priority=7
+            priority=7,
+            detector_key='r_loop'
         ))
         
         # 9. Triplex - Mirror Repeat
         self.motifs.append(MotifClass(
             name="Mirror_Repeat",
-            seed_regex=r"[GA]{10,}|[CT]{10,}",  # Homopurine/homopyrimidine
+            seed_regex='',  # inner-arm mirrored k-mer pair (see seed_fn)
             seed_id=9,
-            window_size=250,
+            window_size=150,  # outward arm extension
             scan_fn=make_scan_fn(triplex_detector),
             description="Triplex mirror repeat seed",
-            priority=6
+            priority=6,
+            seed_fn=mirror_repeat_seeds,
+            detector_key='triplex'
         ))
         
         # 10. Triplex - Sticky DNA
@@ -226,7 +340,8 @@ class MotifRegistry:
             window_size=150,
             scan_fn=make_scan_fn(triplex_detector),
             description="Sticky DNA GAA/TTC repeats",
-            priority=6
+            priority=6,
+            detector_key='triplex'
         ))
         
         # 11. A-philic DNA
@@ -237,7 +352,8 @@ class MotifRegistry:
             window_size=150,
             scan_fn=make_scan_fn(aphilic_detector),
             description="A-philic DNA regions",
-            priority=5
+            priority=5,
+            detector_key='a_philic'
         ))
     
     def get_seed_patterns(self) -> List[Tuple[str, int]]:
@@ -247,7 +363,8 @@ class MotifRegistry:
         Returns:
             List of (pattern, pattern_id) tuples
         """
-        return [(motif.seed_regex, motif.seed_id) for motif in self.motifs]
+        return [(motif.seed_regex, motif.seed_id) for motif in self.motifs
+                if motif.seed_fn is None]
     
     def get_motif_by_id(self, seed_id: int) -> Optional[MotifClass]:
         """Get motif class by seed ID"""
@@ -256,8 +373,13 @@ class MotifRegistry:
                 return motif
         return None
     
-    def compile_hyperscan_db(self):
-        """Compile all seed patterns into Hyperscan database"""
+    def get_motifs_for_detectors(self, detector_keys) -> List[MotifClass]:
+        """Registered seeds whose scan function runs one of `detector_keys`"""
+        keys = set(detector_keys)
+        return [motif for motif in self.get_all_motifs() if motif.detector_key in keys]
+    
+    def compile_hyperscan_db(self, seed_ids=None):
+        """Compile all seed patterns (or only `seed_ids`) into a Hyperscan database"""
         if not HYPERSCAN_AVAILABLE:
             return None
         
@@ -267,27 +389,42 @@ class MotifRegistry:
         flags = []
         
         for motif in self.motifs:
+            if motif.seed_fn is not None:
+                continue
+            if seed_ids is not None and motif.seed_id not in seed_ids:
+                continue
             patterns.append(motif.seed_regex.encode('utf-8'))
             ids.append(motif.seed_id)
             flags.append(hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST)
         
         # Compile database
-        self._compiled_db = hyperscan.Database()
-        self._compiled_db.compile(
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
             expressions=patterns,
             ids=ids,
             elements=len(patterns),
-            flags=flags,
-            mode=hyperscan.HS_MODE_BLOCK
+            flags=flags
         )
         
-        return self._compiled_db
+        if seed_ids is None:
+            self._compiled_db = db
+        return db
     
-    def get_hyperscan_db(self):
-        """Get compiled Hyperscan database"""
-        if self._compiled_db is None and HYPERSCAN_AVAILABLE:
-            self.compile_hyperscan_db()
-        return self._compiled_db
+    def get_hyperscan_db(self, seed_ids=None):
+        """
+        Get compiled Hyperscan database, for all seeds or the subset
+        `seed_ids` (each subset is compiled once and cached)
+        """
+        if not HYPERSCAN_AVAILABLE:
+            return None
+        if seed_ids is None:
+            if self._compiled_db is None:
+                self.compile_hyperscan_db()
+            return self._compiled_db
+        seed_ids = frozenset(seed_ids)
+        if seed_ids not in self._subset_dbs:
+            self._subset_dbs[seed_ids] = self.compile_hyperscan_db(seed_ids)
+        return self._subset_dbs[seed_ids]
     
     def get_all_motifs(self) -> List[MotifClass]:
         """Get all registered motif classes"""
@@ -21,8 +21,9 @@ DESCRIPTION:
     - Results export and visualization
 
 MAIN API FUNCTIONS:
-    analyze_sequence(sequence, name) -> List[motif_dict]
-        Primary function for single sequence analysis
+    analyze_sequence(sequence, name, classes=None) -> List[motif_dict]
+        Primary function for single sequence analysis; `classes` runs only
+        the selected detectors (e.g. ['G4', 'i-Motif'])
         
     analyze_fasta(fasta_content) -> Dict[name, List[motif_dict]]
         Analyze multiple sequences from FASTA format
@@ -30,8 +31,18 @@ MAIN API FUNCTIONS:
     analyze_file(filename) -> Dict[name, List[motif_dict]]
         Analyze sequences from FASTA file
         
+    iter_analyze_file(filename, sinks) -> Iterator[(name, List[motif_dict])]
+        Stream a FASTA file with bounded memory, writing BED/TSV/JSONL
+        
     get_motif_info() -> Dict
         Get information about detected motif classes
+        
+    estimate_detector_seconds(length, keys) -> Dict[key, seconds]
+        Calibrated per-detector cost model for scheduling
+        
+    analyze_multiple_sequences(sequences, use_multiprocessing=True)
+        Cost-aware batch analysis: splits large sequences, batches small
+        ones, runs longest tasks first and reports per-task timings
 
 SUPPORTED MOTIF CLASSES:
     1. Curved DNA (A-tract mediated bending)
@@ -49,7 +60,7 @@ SUPPORTED MOTIF CLASSES:
 PERFORMANCE:
     - Standard: ~5,800 bp/second (10kb sequences)
     - Optimized: ~24,674 bp/second (100K sequences, fast detectors)
-    - Genome-scale: 100MB+ sequences supported
+    - Genome-scale: 100MB+ sequences supported (chunk_size=... for bounded memory)
     - Memory efficient: ~5 MB for 100K sequences
 
 EXAMPLE USAGE:
@@ -66,9 +77,12 @@ EXAMPLE USAGE:
 import os
 import re
 import math
+import time
+import random
 import warnings
-from typing import List, Dict, Any, Optional, Union, Tuple
-from collections import defaultdict, Counter
+from typing import List, Dict, Any, Optional, Union, Tuple, Iterator, Iterable
+from collections import defaultdict, Counter, deque
+from multiprocessing import shared_memory
 import pandas as pd
 
 warnings.filterwarnings("ignore")
@@ -83,13 +97,28 @@ from detectors import (
     GQuadruplexDetector,
     IMotifDetector,
     ZDNADetector,
-    APhilicDetector
+    APhilicDetector,
+    DETECTOR_CLASSES,
+    get_shared_detector,
+    resolve_detector_keys
+)
+
+from sequence_context import SequenceContext
+from genome_chunking import (
+    DEFAULT_CHUNK_SIZE,
+    max_motif_footprint,
+    plan_chunks,
+    scan_chunk,
+    scan_chunked
 )
 
 # Import utilities
 from utilities import (
     parse_fasta,
     read_fasta_file,
+    iter_fasta,
+    open_motif_sink,
+    MotifSink,
     validate_sequence,
     export_to_csv,
     export_to_bed,
@@ -104,6 +133,103 @@ from utilities import (
 __version__ = "2024.1"
 __author__ = "Dr. Venkata Rajesh Yella"
 
+# =============================================================================
+# DETECTOR COST MODEL
+# =============================================================================
+
+CALIBRATION_LENGTH = 10_000  # bp per calibration run
+MAX_COST_EXPONENT = 3.0      # cap on fitted runtime scaling (time ~ length**exponent)
+
+# Fitted cost per detector key, filled lazily per process
+# | Field         | Type  | Description                                  |
+# |---------------|-------|----------------------------------------------|
+# | bp_per_second | float | Throughput on the calibration sequence       |
+# | exponent      | float | Runtime scaling between half and full length |
+# | length        | int   | Calibration length in bp                     |
+_DETECTOR_COSTS: Dict[str, Dict[str, float]] = {}
+
+
+def calibration_sequence(length: int = CALIBRATION_LENGTH, seed: int = 0) -> str:
+    """
+    Deterministic calibration sequence: random background with motif-rich
+    blocks for every class, so each detector does representative work.
+    """
+    rng = random.Random(seed)
+    blocks = [
+        'GGGTTAGGGTTAGGGTTAGGG', 'CCCTAACCCTAACCCTAACCC', 'CGCGCGCGCGCGCGCG',
+        'AAAAAATTTAAAAAATTTAAAAAATTTAAAAAA', 'GAAGAAGAAGAAGAAGAA',
+        'CAGCAGCAGCAGCAGCAGCAG', 'GGGGAGGGGAGGGGAGGGGTGGGGAGGGG',
+        'ATGCATGCAAGCTTGCATGCAT', 'AGGAGAAGGAGGAAGAGGAAGA',
+    ]
+    parts, total = [], 0
+    while total < length:
+        if rng.random() < 0.2:
+            part = rng.choice(blocks)
+        else:
+            part = ''.join(rng.choice('ACGT') for _ in range(rng.randint(20, 200)))
+        parts.append(part)
+        total += len(part)
+    return ''.join(parts)[:length]
+
+
+def _time_detector(detector, sequence: str) -> float:
+    context = SequenceContext(sequence, normalized=True)
+    started = time.perf_counter()
+    detector.detect_motifs(sequence, "calibration", context=context)
+    return max(time.perf_counter() - started, 1e-6)
+
+
+def calibrate_detectors(keys: Optional[Iterable[str]] = None,
+                        length: int = CALIBRATION_LENGTH) -> Dict[str, Dict[str, float]]:
+    """
+    Measure each detector once per process and cache its cost model.
+    
+    Every detector is timed on calibration_sequence(length) and on its first
+    half; the ratio gives the runtime scaling exponent (1 = linear), clamped
+    to [1, MAX_COST_EXPONENT]. Runs too short to time reliably count as linear.
+    
+    Args:
+        keys: Detector keys (default: all)
+        length: Calibration length for detectors not yet measured
+    """
+    keys = list(DETECTOR_CLASSES) if keys is None else list(keys)
+    missing = [key for key in keys if key not in _DETECTOR_COSTS]
+    if missing:
+        sequence = calibration_sequence(length)
+        for key in missing:
+            detector = get_shared_detector(key)
+            half = _time_detector(detector, sequence[:length // 2])
+            full = _time_detector(detector, sequence)
+            exponent = 1.0
+            if half > 0.005:
+                exponent = min(max(math.log2(full / half), 1.0), MAX_COST_EXPONENT)
+            _DETECTOR_COSTS[key] = {'bp_per_second': length / full,
+                                    'exponent': exponent, 'length': length}
+    return {key: _DETECTOR_COSTS[key] for key in keys}
+
+
+def detector_throughput(keys: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Calibrated bp/s per detector key (see calibrate_detectors)"""
+    return {key: cost['bp_per_second'] for key, cost in calibrate_detectors(keys).items()}
+
+
+def estimate_detector_seconds(length: int, keys: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Predicted runtime in seconds of each detector on a `length` bp sequence.
+    
+    # Typical Use:
+    # | Caller        | Use                                              |
+    # |---------------|--------------------------------------------------|
+    # | Scheduler     | Predict per-sequence runtime to balance workers  |
+    # | Class subsets | Estimate the saving from skipping detectors      |
+    """
+    estimates = {}
+    for key, cost in calibrate_detectors(keys).items():
+        seconds = cost['length'] / cost['bp_per_second']
+        estimates[key] = seconds * (length / cost['length']) ** cost['exponent']
+    return estimates
+
+
 # =============================================================================
 # MAIN SCANNER CLASS
 # =============================================================================
@@ -113,29 +239,48 @@ class NonBScanner:
     Main scanner class orchestrating all motif detectors
     """
     
-    def __init__(self, enable_all_detectors: bool = True):
+    CLUSTER_WINDOW = 500  # bp window for cluster detection
+    
+    def __init__(self, enable_all_detectors: bool = True,
+                 classes: Optional[Iterable[str]] = None):
         """
         Initialize NonBScanner with all detector modules
         
         Args:
             enable_all_detectors: Enable all 9 detector classes (default: True)
+            classes: Only load these motif classes, e.g. ['G4', 'i-Motif']
+                (detector keys or Class names, see resolve_detector_keys)
         """
         self.detectors = {}
         
         if enable_all_detectors:
-            self.detectors = {
-                'curved_dna': CurvedDNADetector(),
-                'slipped_dna': SlippedDNADetector(),
-                'cruciform': CruciformDetector(),
-                'r_loop': RLoopDetector(),
-                'triplex': TriplexDetector(),
-                'g_quadruplex': GQuadruplexDetector(),
-                'i_motif': IMotifDetector(),
-                'z_dna': ZDNADetector(),
-                'a_philic': APhilicDetector()
-            }
-    
-    def analyze_sequence(self, sequence: str, sequence_name: str = "sequence") -> List[Dict[str, Any]]:
+            # Detector instances are shared process-wide, so building a
+            # scanner per call does not recompile patterns or databases
+            self.detectors = {key: get_shared_detector(key)
+                              for key in resolve_detector_keys(classes)}
+    
+    def _select_detectors(self, classes: Optional[Iterable[str]]) -> Dict[str, Any]:
+        """Detectors for one call: the scanner's own, or the requested subset"""
+        if classes is None:
+            return self.detectors
+        return {key: self.detectors.get(key) or get_shared_detector(key)
+                for key in resolve_detector_keys(classes)}
+    
+    def detector_throughput(self) -> Dict[str, float]:
+        """Calibrated bp/s of each loaded detector (see calibrate_detectors)"""
+        return detector_throughput(self.detectors)
+    
+    def estimate_runtime(self, length: int, classes: Optional[Iterable[str]] = None) -> float:
+        """
+        Predicted detector time in seconds for a sequence of `length` bp,
+        from the calibrated per-detector cost model. Post-processing is not
+        included; it scales with the number of motifs, not the length.
+        """
+        return sum(estimate_detector_seconds(length, self._select_detectors(classes)).values())
+    
+    def analyze_sequence(self, sequence: str, sequence_name: str = "sequence",
+                         chunk_size: Optional[int] = None,
+                         classes: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
         """
         Detect all Non-B DNA motifs in a sequence with high performance.
         
@@ -143,9 +288,11 @@ class NonBScanner:
         # | Step | Action                                    | Performance  |
         # |------|-------------------------------------------|--------------|
         # | 1    | Validate sequence (ACGT check)            | O(n)         |
-        # | 2    | Run 9 specialized detectors in parallel   | O(n) each    |
-        # | 3    | Merge results                             | O(m log m)   |
-        # | 4    | Sort by position                          | O(m log m)   |
+        # | 2    | Build shared SequenceContext (encode once)| O(n)         |
+        # | 3    | Run selected detectors on the context     | O(n) each    |
+        # |      | (per padded chunk when chunk_size is set) |              |
+        # | 4    | Merge results                             | O(m log m)   |
+        # | 5    | Sort by position                          | O(m log m)   |
         
         # Output Motif Fields:
         # | Field         | Type  | Description                       |
@@ -165,6 +312,14 @@ class NonBScanner:
         Args:
             sequence: DNA sequence to analyze (ATGC characters)
             sequence_name: Identifier for the sequence
+            chunk_size: Scan sequences longer than this in chunks of this
+                size (default: None, whole sequence at once). Chunks are
+                padded by the detectors' MAX_MOTIF_FOOTPRINT, so the result
+                is the same as an unchunked scan while detector memory stays
+                bounded by the chunk size
+            classes: Restrict this call to these motif classes (default:
+                the scanner's detectors). Hybrid and cluster detection are
+                skipped when fewer than two classes are found
             
         Returns:
             List of motif dictionaries sorted by genomic position
@@ -188,35 +343,125 @@ class NonBScanner:
         if not is_valid:
             raise ValueError(f"Invalid sequence: {msg}")
         
-        all_motifs = []
+        detectors = self._select_detectors(classes)
         
-        # Run all detectors
-        for detector_name, detector in self.detectors.items():
-            try:
-                motifs = detector.detect_motifs(sequence, sequence_name)
-                all_motifs.extend(motifs)
-            except Exception as e:
-                warnings.warn(f"Error in {detector_name} detector: {e}")
-                continue
+        if chunk_size and len(sequence) > chunk_size:
+            # Footprint-padded chunks, stitched back per detector
+            per_detector = scan_chunked(detectors, sequence, sequence_name, chunk_size)
+            all_motifs = [m for motifs in per_detector.values() for m in motifs]
+        else:
+            all_motifs = self._run_detectors(sequence, sequence_name, detectors)
         
-        # Remove overlaps within same class
-        filtered_motifs = self._remove_overlaps(all_motifs)
+        return self._postprocess(all_motifs, sequence)
+    
+    def iter_analyze_sequence(self, sequence: str, sequence_name: str = "sequence",
+                              chunk_size: int = DEFAULT_CHUNK_SIZE,
+                              classes: Optional[Iterable[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield final motifs chunk by chunk, in genomic order.
+        
+        Each core chunk is scanned as in analyze_sequence(chunk_size=...);
+        overlap removal, hybrid and cluster detection then run over the raw
+        motifs within one footprint plus CLUSTER_WINDOW of the chunk, and
+        only motifs starting in the chunk are yielded. Memory holds the
+        sequence plus the motifs of a few chunks, independent of how many
+        motifs the sequence has.
+        
+        Args:
+            sequence: DNA sequence to analyze
+            sequence_name: Identifier for the sequence
+            chunk_size: Core chunk size in bp
+            classes: Restrict the scan to these motif classes
+            
+        Yields:
+            Lists of motif dictionaries sorted by position, one per chunk
+        """
+        sequence = sequence.upper().strip()
         
-        # Detect hybrid and cluster motifs
-        hybrid_motifs = self._detect_hybrid_motifs(filtered_motifs, sequence)
-        cluster_motifs = self._detect_clusters(filtered_motifs, sequence)
+        is_valid, msg = validate_sequence(sequence)
+        if not is_valid:
+            raise ValueError(f"Invalid sequence: {msg}")
+        
+        if len(sequence) <= chunk_size:
+            yield self.analyze_sequence(sequence, sequence_name, classes=classes)
+            return
         
-        # Apply overlap removal to hybrid and cluster motifs too
-        hybrid_motifs = self._remove_overlaps(hybrid_motifs)
-        cluster_motifs = self._remove_overlaps(cluster_motifs)
+        detectors = self._select_detectors(classes)
+        pad = max_motif_footprint(detectors.values())
+        reach = pad + self.CLUSTER_WINDOW  # how far post-processing looks around a motif
+        counters = {key: {} for key in detectors}
+        window = deque()   # scanned (core, per-detector raw motifs)
+        pending = deque()  # scanned cores not yet yielded
         
-        final_motifs = filtered_motifs + hybrid_motifs + cluster_motifs
+        for core in plan_chunks(len(sequence), chunk_size):
+            owned = scan_chunk(detectors, sequence, sequence_name, core[0], core[1], pad)
+            for key, detector in detectors.items():
+                detector.number_ordinal_pattern_ids(owned[key], counters[key])
+            window.append((core, owned))
+            pending.append(core)
+            
+            # A core is final once everything within `reach` after it is scanned
+            while pending and pending[0][1] + reach <= core[1]:
+                target = pending.popleft()
+                yield self._finalize_core(detectors, window, target, sequence)
+                while window[0][0][1] + reach <= target[1]:
+                    window.popleft()
+        
+        for target in pending:
+            yield self._finalize_core(detectors, window, target, sequence)
+    
+    def _finalize_core(self, detectors, window, core: Tuple[int, int],
+                       sequence: str) -> List[Dict[str, Any]]:
+        """Post-process the raw motifs in `window`, keeping those owned by `core`"""
+        # Detector-major order, as in a whole-sequence scan
+        raw = [motif for key in detectors
+               for _, owned in window for motif in owned[key]]
+        core_start, core_end = core
+        return [m for m in self._postprocess(raw, sequence)
+                if core_start < m.get('Start', 0) <= core_end]
+    
+    def _postprocess(self, all_motifs: List[Dict[str, Any]], sequence: str) -> List[Dict[str, Any]]:
+        """Overlap removal, hybrid/cluster detection and positional sort"""
+        # Remove overlaps within same class
+        filtered_motifs = self._remove_overlaps(all_motifs)
+        
+        # Hybrids and clusters both need two different classes; a targeted
+        # scan (e.g. Slipped DNA only) skips the quadratic passes entirely
+        final_motifs = filtered_motifs
+        if len({m.get('Class') for m in filtered_motifs}) >= 2:
+            hybrid_motifs = self._detect_hybrid_motifs(filtered_motifs, sequence)
+            cluster_motifs = self._detect_clusters(filtered_motifs, sequence)
+            
+            # Apply overlap removal to hybrid and cluster motifs too
+            hybrid_motifs = self._remove_overlaps(hybrid_motifs)
+            cluster_motifs = self._remove_overlaps(cluster_motifs)
+            
+            final_motifs = filtered_motifs + hybrid_motifs + cluster_motifs
         
         # Sort by position
         final_motifs.sort(key=lambda x: x.get('Start', 0))
         
         return final_motifs
     
+    def _run_detectors(self, sequence: str, sequence_name: str,
+                       detectors: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run the detectors over the whole sequence with one shared context"""
+        # Encode once; every detector reuses the same context
+        context = SequenceContext(sequence, normalized=True)
+        
+        all_motifs = []
+        if detectors is None:
+            detectors = self.detectors
+        for detector_name, detector in detectors.items():
+            try:
+                motifs = detector.detect_motifs(sequence, sequence_name, context=context)
+                all_motifs.extend(motifs)
+            except Exception as e:
+                warnings.warn(f"Error in {detector_name} detector: {e}")
+                continue
+        
+        return all_motifs
+    
     def _remove_overlaps(self, motifs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove overlapping motifs within the same class/subclass"""
         if not motifs:
@@ -228,7 +473,7 @@ class NonBScanner:
             key = f"{motif.get('Class', '')}-{motif.get('Subclass', '')}"
             groups[key].append(motif)
         
-        filtered_motifs = []
+        kept = set()
         
         for group_motifs in groups.values():
             # Sort by score (highest first), then by length (longest first)
@@ -246,9 +491,11 @@ class NonBScanner:
                 if not overlaps:
                     non_overlapping.append(motif)
             
-            filtered_motifs.extend(non_overlapping)
+            kept.update(id(motif) for motif in non_overlapping)
         
-        return filtered_motifs
+        # Survivors keep their input order, so ties at one Start do not
+        # depend on which classes happened to appear earlier in the input
+        return [motif for motif in motifs if id(motif) in kept]
     
     def _calculate_overlap(self, motif1: Dict[str, Any], motif2: Dict[str, Any]) -> float:
         """Calculate overlap ratio between two motifs"""
@@ -306,7 +553,7 @@ class NonBScanner:
             return []
         
         cluster_motifs = []
-        window_size = 500  # 500bp window
+        window_size = self.CLUSTER_WINDOW
         min_density = 3     # Minimum 3 motifs per window
         
         sorted_motifs = sorted(motifs, key=lambda x: x.get('Start', 0))
@@ -375,7 +622,9 @@ class NonBScanner:
 # =============================================================================
 
 def analyze_sequence(sequence: str, sequence_name: str = "sequence", 
-                    use_fast_mode: bool = False) -> List[Dict[str, Any]]:
+                    use_fast_mode: bool = False,
+                    chunk_size: Optional[int] = None,
+                    classes: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
     """
     Analyze a single DNA sequence for all Non-B DNA motifs (high-performance API).
     
@@ -411,6 +660,10 @@ def analyze_sequence(sequence: str, sequence_name: str = "sequence",
         sequence: DNA sequence (ATGC characters, case-insensitive)
         sequence_name: Identifier for the sequence
         use_fast_mode: Enable parallel processing for ~9x wall-clock speedup (9 parallel threads)
+        chunk_size: Scan long sequences in footprint-padded chunks of this size
+            (standard mode only; output is identical to an unchunked scan)
+        classes: Only detect these motif classes, e.g. ['G4', 'i-Motif'] or
+            ['slipped_dna']; unselected detectors are not run at all
         
     Returns:
         List of motif dictionaries sorted by genomic position
@@ -439,13 +692,14 @@ def analyze_sequence(sequence: str, sequence_name: str = "sequence",
         # Use parallel processing for 9x speedup
         try:
             from parallel_scanner import analyze_sequence_parallel
-            return analyze_sequence_parallel(sequence, sequence_name, use_parallel=True)
+            return analyze_sequence_parallel(sequence, sequence_name, use_parallel=True,
+                                             classes=classes)
         except ImportError:
             warnings.warn("Fast mode not available (parallel_scanner module not found), falling back to standard mode")
     
     # Standard mode (sequential)
-    scanner = NonBScanner()
-    return scanner.analyze_sequence(sequence, sequence_name)
+    scanner = NonBScanner(classes=classes)
+    return scanner.analyze_sequence(sequence, sequence_name, chunk_size=chunk_size)
 
 
 def analyze_fasta(fasta_content: str) -> Dict[str, List[Dict[str, Any]]]:
@@ -487,6 +741,9 @@ def analyze_file(filename: str) -> Dict[str, List[Dict[str, Any]]]:
     Example:
         >>> results = analyze_file("sequences.fasta")
         >>> print(f"Analyzed {len(results)} sequences")
+        
+    Note: Holds the whole file and all results in memory; use
+          iter_analyze_file for large assemblies.
     """
     if not os.path.exists(filename):
         raise FileNotFoundError(f"File not found: {filename}")
@@ -501,6 +758,56 @@ def analyze_file(filename: str) -> Dict[str, List[Dict[str, Any]]]:
     return results
 
 
+def iter_analyze_file(filename: str,
+                      sinks: Iterable[Union[str, MotifSink]] = (),
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Stream a FASTA file through the scanner with bounded memory.
+    
+    # Pipeline:
+    # | Stage   | Action                                      | Memory held          |
+    # |---------|---------------------------------------------|----------------------|
+    # | Parse   | iter_fasta reads one record at a time       | Current record       |
+    # | Scan    | Records > chunk_size scanned chunk by chunk | A few chunks' motifs |
+    # | Write   | Each batch appended to every sink           | None (flushed rows)  |
+    # | Yield   | (sequence_name, motifs) per batch           | Caller's choice      |
+    
+    The largest record bounds memory: iter_fasta holds it whole, at about
+    3 bytes per base while it is read, and the scan keeps the record
+    string until its last chunk is yielded.
+    
+    Args:
+        filename: Path to FASTA file (plain or .gz)
+        sinks: Output paths (.bed, .tsv/.txt, .jsonl) or open MotifSink objects;
+               paths are opened and closed here, sink objects are left open
+        chunk_size: Core chunk size for long records (default: 1 Mb)
+        
+    Yields:
+        (sequence_name, motifs) batches in file and genomic order
+        
+    Example:
+        >>> for name, motifs in iter_analyze_file("genome.fa.gz", sinks=["out.bed", "out.jsonl"]):
+        ...     print(f"{name}: {len(motifs)} motifs")
+    """
+    if not os.path.exists(filename):
+        raise FileNotFoundError(f"File not found: {filename}")
+    
+    sinks = list(sinks)
+    owned_sinks = [open_motif_sink(s) for s in sinks if isinstance(s, str)]
+    all_sinks = owned_sinks + [s for s in sinks if not isinstance(s, str)]
+    scanner = NonBScanner()
+    
+    try:
+        for name, seq in iter_fasta(filename):
+            for motifs in scanner.iter_analyze_sequence(seq, name, chunk_size=chunk_size):
+                for sink in all_sinks:
+                    sink.write(motifs)
+                yield name, motifs
+    finally:
+        for sink in owned_sinks:
+            sink.close()
+
+
 def get_motif_info() -> Dict[str, Any]:
     """
     Get comprehensive information about motif classification system
@@ -580,44 +887,261 @@ def export_results(motifs: List[Dict[str, Any]], format: str = 'csv',
 # BATCH PROCESSING UTILITIES
 # =============================================================================
 
+SCHEDULE_BATCH_BP = 50_000  # short sequences are packed into tasks of about this many bp
+
+
+def estimate_sequence_cost(sequence: str, keys: Optional[Iterable[str]] = None,
+                           scanned_length: Optional[int] = None) -> float:
+    """
+    Predicted detector seconds for `sequence`: the calibrated cost of its
+    length (or `scanned_length`, e.g. a padded chunk window) scaled by its
+    ACGT fraction, since N-masked stretches yield no candidates.
+    """
+    if not sequence:
+        return 0.0
+    acgt = sum(sequence.count(base) for base in 'ACGT') / len(sequence)
+    length = scanned_length or len(sequence)
+    return sum(estimate_detector_seconds(length, keys).values()) * max(acgt, 0.05)
+
+
+def schedule_chunk_size(keys: Optional[Iterable[str]] = None) -> int:
+    """
+    Core size that minimises detector time per bp for split sequences.
+    
+    A core of c bp is scanned in a window of c + 2 * footprint bp, so
+    superlinear detectors favour small cores and linear ones large cores;
+    candidate sizes from one footprint up to DEFAULT_CHUNK_SIZE are compared
+    with the calibrated cost model.
+    """
+    keys = resolve_detector_keys(keys)
+    pad = max_motif_footprint(get_shared_detector(key) for key in keys)
+    best_size, best_cost = DEFAULT_CHUNK_SIZE, float('inf')
+    size = max(pad, 1000)
+    while size <= DEFAULT_CHUNK_SIZE:
+        cost = sum(estimate_detector_seconds(size + 2 * pad, keys).values()) / size
+        if cost < best_cost:
+            best_size, best_cost = size, cost
+        size *= 2
+    return best_size
+
+
+def plan_sequence_tasks(sequences: Dict[str, str],
+                        classes: Optional[Iterable[str]] = None,
+                        chunk_size: Optional[int] = None,
+                        batch_bp: int = SCHEDULE_BATCH_BP) -> List[Dict[str, Any]]:
+    """
+    Split, batch and order sequences into worker tasks, costliest first.
+    
+    Sequences longer than `chunk_size` (default: schedule_chunk_size())
+    become one task per footprint-padded core; shorter ones are packed in
+    input order into batches of up to `batch_bp`. Submitting the tasks in
+    the returned order is longest-processing-time-first scheduling.
+    
+    # Task Fields:
+    # | Field             | Type        | Description                        |
+    # |-------------------|-------------|------------------------------------|
+    # | kind              | str         | 'chunk' or 'batch'                 |
+    # | names             | List[str]   | Sequences the task covers          |
+    # | core              | Tuple / None| 0-based half-open core for chunks  |
+    # | bp                | int         | Bases owned by the task            |
+    # | estimated_seconds | float       | estimate_sequence_cost() total     |
+    """
+    keys = resolve_detector_keys(classes)
+    if chunk_size is None:
+        chunk_size = schedule_chunk_size(keys)
+    pad = max_motif_footprint(get_shared_detector(key) for key in keys)
+    
+    tasks, batch = [], None
+    for name, sequence in sequences.items():
+        if len(sequence) > chunk_size:
+            for core_start, core_end in plan_chunks(len(sequence), chunk_size):
+                window = min(len(sequence), core_end - core_start + 2 * pad)
+                cost = estimate_sequence_cost(sequence[core_start:core_end], keys, window)
+                tasks.append({'kind': 'chunk', 'names': [name], 'core': (core_start, core_end),
+                              'bp': core_end - core_start, 'estimated_seconds': cost})
+            continue
+        if batch is None or batch['bp'] + len(sequence) > batch_bp:
+            batch = {'kind': 'batch', 'names': [], 'core': None, 'bp': 0, 'estimated_seconds': 0.0}
+            tasks.append(batch)
+        batch['names'].append(name)
+        batch['bp'] += len(sequence)
+        batch['estimated_seconds'] += estimate_sequence_cost(sequence, keys)
+    
+    tasks.sort(key=lambda task: task['estimated_seconds'], reverse=True)
+    return tasks
+
+
+# Sequence most recently read from shared memory by this worker process
+_WORKER_SHARED_SEQUENCE: Dict[str, str] = {}
+
+
+def _read_shared_sequence(shm_name: str, length: int) -> str:
+    """Decode a split sequence from shared memory, once per worker"""
+    if shm_name not in _WORKER_SHARED_SEQUENCE:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            sequence = bytes(shm.buf[:length]).decode('ascii')
+        finally:
+            shm.close()
+        _WORKER_SHARED_SEQUENCE.clear()
+        _WORKER_SHARED_SEQUENCE[shm_name] = sequence
+    return _WORKER_SHARED_SEQUENCE[shm_name]
+
+
+def _run_scheduled_task(args: Tuple[str, Any, Optional[List[str]]]) -> Tuple[Any, float, int]:
+    """
+    Worker task for analyze_multiple_sequences.
+    
+    Detectors come from the worker's process-wide cache, so the task only
+    carries sequence data: ('chunk', (name, shm_name, length, core), keys)
+    returns scan_chunk() output; ('batch', [(name, sequence), ...], keys)
+    returns {name: motifs or exception}.
+    """
+    kind, payload, keys = args
+    started = time.perf_counter()
+    scanner = NonBScanner(classes=keys)
+    if kind == 'chunk':
+        name, shm_name, length, (core_start, core_end) = payload
+        sequence = _read_shared_sequence(shm_name, length)
+        result = scan_chunk(scanner.detectors, sequence, name, core_start, core_end)
+    else:
+        result = {}
+        for name, sequence in payload:
+            try:
+                result[name] = scanner.analyze_sequence(sequence, name)
+            except Exception as e:
+                result[name] = e
+    return result, time.perf_counter() - started, os.getpid()
+
+
 def analyze_multiple_sequences(sequences: Dict[str, str], 
-                              use_multiprocessing: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+                              use_multiprocessing: bool = False,
+                              classes: Optional[Iterable[str]] = None,
+                              max_workers: Optional[int] = None,
+                              chunk_size: Optional[int] = None,
+                              return_timings: bool = False):
     """
     Analyze multiple sequences in batch
     
+    With multiprocessing, work is planned by plan_sequence_tasks(): large
+    sequences are split into footprint-padded cores (placed once in shared
+    memory), small ones are batched, and tasks are submitted costliest
+    first so one long chromosome does not leave the other workers idle.
+    Split sequences are stitched and post-processed in the parent, giving
+    the same motifs as analyze_sequence().
+    
+    # Timing Fields (one entry per task, in submission order):
+    # | Field             | Type       | Description                          |
+    # |-------------------|------------|--------------------------------------|
+    # | kind              | str        | 'chunk' or 'batch'                   |
+    # | names             | List[str]  | Sequences the task covered           |
+    # | core              | Tuple/None | Core interval of chunk tasks         |
+    # | bp                | int        | Bases owned by the task              |
+    # | estimated_seconds | float/None | Scheduler estimate (None if serial)  |
+    # | seconds           | float      | Measured worker time                 |
+    # | worker            | int        | Worker process id                    |
+    
     Args:
         sequences: Dictionary of {name: sequence}
         use_multiprocessing: Enable parallel processing (default: False)
+        classes: Restrict the scan to these motif classes
+        max_workers: Worker processes (default: CPU count)
+        chunk_size: Split size for large sequences (default: schedule_chunk_size())
+        return_timings: Also return the per-task timing list
         
     Returns:
-        Dictionary of {name: motifs_list}
+        Dictionary of {name: motifs_list} in input order, or
+        (results, timings) when return_timings is True
     """
     results = {}
+    timings = []
     scanner = NonBScanner()
     
-    if use_multiprocessing:
+    if use_multiprocessing and sequences:
         # Parallel processing
         from concurrent.futures import ProcessPoolExecutor, as_completed
         import multiprocessing as mp
         
-        with ProcessPoolExecutor(max_workers=min(len(sequences), mp.cpu_count())) as executor:
-            future_to_name = {
-                executor.submit(scanner.analyze_sequence, seq, name): name 
-                for name, seq in sequences.items()
-            }
+        keys = resolve_detector_keys(classes)
+        normalized, failed = {}, set()
+        for name, seq in sequences.items():
+            normalized[name] = seq.upper().strip()
+            is_valid, msg = validate_sequence(normalized[name])
+            if not is_valid:
+                warnings.warn(f"Error processing {name}: Invalid sequence: {msg}")
+                failed.add(name)
+        tasks = plan_sequence_tasks({name: seq for name, seq in normalized.items() if name not in failed},
+                                    keys, chunk_size)
+        
+        blocks = {}
+        chunks = defaultdict(list)
+        try:
+            for task in tasks:
+                name = task['names'][0]
+                if task['kind'] == 'chunk' and name not in blocks:
+                    data = normalized[name].encode('ascii')
+                    blocks[name] = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+                    blocks[name].buf[:len(data)] = data
             
-            for future in as_completed(future_to_name):
-                name = future_to_name[future]
-                try:
-                    results[name] = future.result()
-                except Exception as e:
-                    warnings.warn(f"Error processing {name}: {e}")
-                    results[name] = []
+            workers = min(len(tasks), max_workers or mp.cpu_count()) or 1
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {}
+                for index, task in enumerate(tasks):
+                    if task['kind'] == 'chunk':
+                        name = task['names'][0]
+                        payload = (name, blocks[name].name, len(normalized[name]), task['core'])
+                    else:
+                        payload = [(name, normalized[name]) for name in task['names']]
+                    futures[executor.submit(_run_scheduled_task, (task['kind'], payload, keys))] = index
+                    timings.append(dict(task, seconds=None, worker=None))
+                
+                for future in as_completed(futures):
+                    task = tasks[futures[future]]
+                    try:
+                        result, seconds, worker = future.result()
+                    except Exception as e:
+                        warnings.warn(f"Error processing {', '.join(task['names'])}: {e}")
+                        failed.update(task['names'])
+                        continue
+                    timings[futures[future]].update(seconds=seconds, worker=worker)
+                    if task['kind'] == 'chunk':
+                        chunks[task['names'][0]].append((task['core'], result))
+                        continue
+                    for name, motifs in result.items():
+                        if isinstance(motifs, Exception):
+                            warnings.warn(f"Error processing {name}: {motifs}")
+                            failed.add(name)
+                        else:
+                            results[name] = motifs
+        finally:
+            for shm in blocks.values():
+                shm.close()
+                shm.unlink()
+        
+        # Stitch split sequences per detector, as scan_chunked() does
+        detectors = scanner._select_detectors(keys)
+        for name, parts in chunks.items():
+            if name in failed:
+                continue
+            parts.sort(key=lambda part: part[0])
+            merged = {key: [m for _, owned in parts for m in owned[key]] for key in detectors}
+            for key, detector in detectors.items():
+                detector.number_ordinal_pattern_ids(merged[key])
+            results[name] = scanner._postprocess(
+                [m for motifs in merged.values() for m in motifs], normalized[name])
+        
+        results = {name: results.get(name, []) for name in sequences}
     else:
         # Sequential processing
         for name, seq in sequences.items():
-            results[name] = scanner.analyze_sequence(seq, name)
+            started = time.perf_counter()
+            results[name] = scanner.analyze_sequence(seq, name, classes=classes)
+            timings.append({'kind': 'batch', 'names': [name], 'core': None, 'bp': len(seq),
+                            'estimated_seconds': None, 'seconds': time.perf_counter() - started,
+                            'worker': os.getpid()})
     
+    if return_timings:
+        return results, timings
     return results
 
 
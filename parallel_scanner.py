@@ -15,19 +15,213 @@ DESCRIPTION:
     - No overhead from seed matching or window extraction
     - Direct parallelization for maximum speedup
     
+EXECUTION MODES:
+    ┌───────────┬──────────────────────────────────────────────────────────┐
+    │ Mode      │ Behaviour                                                │
+    ├───────────┼──────────────────────────────────────────────────────────┤
+    │ 'thread'  │ ThreadPoolExecutor; detectors share the GIL (default)    │
+    │ 'process' │ Persistent process pool; sequence placed once in         │
+    │           │ multiprocessing.shared_memory; each worker keeps its own │
+    │           │ constructed detectors; results returned as packed tuples │
+    └───────────┴──────────────────────────────────────────────────────────┘
+
+    ScannerPool(n_workers).submit(seq, name) keeps pre-started workers with
+    warm detectors for high-rate scanning of many short sequences.
+
 PERFORMANCE:
     - Single detector: ~5,000-8,000 bp/s (same as standard mode)
-    - All 9 detectors parallel: ~9x faster wall-clock time (not throughput)
-    - Multi-core system with 9+ cores: Near-linear speedup
+    - 'thread' mode: limited by the GIL for pure-Python detectors
+    - 'process' mode: real multi-core wall-clock speedup, bounded by the
+      slowest detector on the sequence
     - Foundation for further optimization: Hyperscan, chunk processing, etc.
 """
 
-from typing import List, Dict, Any, Optional
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
 import multiprocessing as mp
+import atexit
+import os
 import time
 
 
+# =============================================================================
+# PROCESS-MODE WORKER STATE
+# =============================================================================
+# Each worker process builds one NonBScanner in its initializer and keeps it
+# for the lifetime of the pool, so detectors, compiled regexes and Hyperscan
+# databases are constructed once per worker rather than once per task.
+_WORKER_SCANNER = None
+
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_PROCESS_POOL_WORKERS = 0
+
+
+def _init_worker() -> None:
+    """Process-pool initializer: construct the worker's detectors once."""
+    global _WORKER_SCANNER
+    from nonbscanner import NonBScanner
+    _WORKER_SCANNER = NonBScanner()
+
+
+def _get_worker_scanner():
+    """Return the worker's scanner, building it if the initializer did not run."""
+    if _WORKER_SCANNER is None:
+        _init_worker()
+    return _WORKER_SCANNER
+
+
+def _get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the module-wide persistent process pool, (re)creating it on demand."""
+    global _PROCESS_POOL, _PROCESS_POOL_WORKERS
+    if _PROCESS_POOL is None or _PROCESS_POOL_WORKERS != max_workers:
+        shutdown_process_pool()
+        _PROCESS_POOL = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+        _PROCESS_POOL_WORKERS = max_workers
+    return _PROCESS_POOL
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the persistent process pool used by 'process' mode."""
+    global _PROCESS_POOL, _PROCESS_POOL_WORKERS
+    if _PROCESS_POOL is not None:
+        _PROCESS_POOL.shutdown(wait=True)
+        _PROCESS_POOL = None
+        _PROCESS_POOL_WORKERS = 0
+
+
+atexit.register(shutdown_process_pool)
+
+
+def _attach_shared_sequence(shm_name: str, length: int) -> str:
+    """Read a sequence placed in shared memory by the parent process."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return bytes(shm.buf[:length]).decode('ascii')
+    finally:
+        shm.close()
+
+
+def pack_motifs(motifs: List[Dict[str, Any]]) -> List[Tuple[Tuple[str, ...], List[tuple]]]:
+    """
+    Pack motif dicts into compact (field_names, rows) groups for IPC.
+    
+    Motifs sharing the same field layout are sent as one tuple of field
+    names plus one value tuple per motif, instead of one pickled dict each.
+    """
+    groups: Dict[Tuple[str, ...], List[tuple]] = {}
+    for position, motif in enumerate(motifs):
+        keys = tuple(motif.keys())
+        groups.setdefault(keys, []).append((position,) + tuple(motif.values()))
+    return list(groups.items())
+
+
+def unpack_motifs(packed: List[Tuple[Tuple[str, ...], List[tuple]]]) -> List[Dict[str, Any]]:
+    """Inverse of pack_motifs(); restores the original motif order."""
+    indexed = []
+    for keys, rows in packed:
+        for row in rows:
+            indexed.append((row[0], dict(zip(keys, row[1:]))))
+    indexed.sort(key=lambda item: item[0])
+    return [motif for _, motif in indexed]
+
+
+def _detector_task(args: Tuple[str, int, str, str]) -> Tuple[str, List]:
+    """
+    Worker task: run one detector on the shared-memory sequence.
+    
+    Args:
+        args: (shm_name, sequence_length, detector_key, sequence_name)
+    
+    Returns:
+        (detector_key, packed motifs)
+    """
+    shm_name, length, detector_key, sequence_name = args
+    sequence = _attach_shared_sequence(shm_name, length)
+    detector = _get_worker_scanner().detectors[detector_key]
+    return detector_key, pack_motifs(detector.detect_motifs(sequence, sequence_name))
+
+
+def _scan_task(args: Tuple[str, str]) -> List:
+    """Worker task: full NonBScanner analysis of one sequence, packed for IPC."""
+    sequence, sequence_name = args
+    return pack_motifs(_get_worker_scanner().analyze_sequence(sequence, sequence_name))
+
+
+def _warmup_task(_: int) -> int:
+    """Worker task used to start and initialise every pool process up front."""
+    _get_worker_scanner()
+    return os.getpid()
+
+
+class ScannerPool:
+    """
+    Long-lived pool of pre-started workers with warm detectors.
+    
+    Every worker builds one NonBScanner when it starts (detectors, compiled
+    regexes and Hyperscan databases) and reuses it for all later jobs, so the
+    per-call cost is only the scan itself. Suited to services that scan many
+    short sequences.
+    
+    # Pool API:
+    # | Method                    | Returns                                 |
+    # |---------------------------|-----------------------------------------|
+    # | submit(seq, name)         | Future resolving to List[motif_dict]    |
+    # | map(sequences)            | Dict[name, List[motif_dict]]            |
+    # | close()                   | Shuts the workers down                  |
+    
+    Example:
+        >>> with ScannerPool(4) as pool:
+        ...     future = pool.submit("GGGTTAGGGTTAGGGTTAGGG", "amplicon_1")
+        ...     motifs = future.result()
+    """
+    
+    def __init__(self, n_workers: Optional[int] = None):
+        """
+        Start the workers and wait until each has built its detectors.
+        
+        Args:
+            n_workers: Number of worker processes (default: CPU count)
+        """
+        self.n_workers = n_workers or mp.cpu_count()
+        self._executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker)
+        list(self._executor.map(_warmup_task, range(self.n_workers)))
+    
+    def submit(self, sequence: str, sequence_name: str = "sequence") -> Future:
+        """
+        Queue one sequence for analysis.
+        
+        Returns:
+            Future whose result is the same motif list NonBScanner returns
+        """
+        result: Future = Future()
+        inner = self._executor.submit(_scan_task, (sequence, sequence_name))
+        
+        def _unpack(done: Future) -> None:
+            try:
+                result.set_result(unpack_motifs(done.result()))
+            except Exception as e:
+                result.set_exception(e)
+        
+        inner.add_done_callback(_unpack)
+        return result
+    
+    def map(self, sequences: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Analyze several sequences and return results keyed by name."""
+        futures = {name: self.submit(seq, name) for name, seq in sequences.items()}
+        return {name: future.result() for name, future in futures.items()}
+    
+    def close(self, wait: bool = True) -> None:
+        """Shut the worker processes down."""
+        self._executor.shutdown(wait=wait)
+    
+    def __enter__(self) -> 'ScannerPool':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
 class ParallelScanner:
     """
     Parallel scanner that processes each motif type independently.
@@ -39,14 +233,29 @@ class ParallelScanner:
     - Scales near-linearly with number of cores (up to 9 cores)
     """
     
-    def __init__(self, max_workers: Optional[int] = None):
+    PROCESS_DETECTORS = (
+        'curved_dna', 'slipped_dna', 'cruciform', 'r_loop', 'triplex',
+        'g_quadruplex', 'i_motif', 'z_dna', 'a_philic'
+    )
+    
+    def __init__(self, max_workers: Optional[int] = None, mode: str = 'thread',
+                 classes: Optional[List[str]] = None):
         """
         Initialize parallel scanner.
         
         Args:
             max_workers: Maximum parallel workers (default: CPU count)
+            mode: 'thread' (default) or 'process' for a persistent,
+                  shared-memory process pool
+            classes: Only run these motif classes (see resolve_detector_keys)
         """
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"Unknown mode '{mode}' (expected 'thread' or 'process')")
+        from detectors import resolve_detector_keys
         self.max_workers = max_workers or mp.cpu_count()
+        self.mode = mode
+        self.detector_keys = [key for key in resolve_detector_keys(classes)
+                              if key in self.PROCESS_DETECTORS]
     
     def analyze_sequence(self, sequence: str, sequence_name: str = "sequence",
                         use_parallel: bool = True) -> List[Dict[str, Any]]:
@@ -62,32 +271,23 @@ class ParallelScanner:
             List of detected motifs
         """
         sequence = sequence.upper().strip()
+        if not sequence.isascii():
+            # Process mode ships the sequence as ASCII bytes; replace other
+            # characters (one '?' each, so positions hold) in both modes
+            sequence = sequence.encode('ascii', errors='replace').decode('ascii')
         
-        # Import detector classes
-        from detectors import (
-            CurvedDNADetector,
-            SlippedDNADetector,
-            CruciformDetector,
-            RLoopDetector,
-            TriplexDetector,
-            GQuadruplexDetector,
-            IMotifDetector,
-            ZDNADetector,
-            APhilicDetector
-        )
-        
-        # Create detector instances and tasks
-        detectors = [
-            ('Curved_DNA', CurvedDNADetector()),
-            ('Slipped_DNA', SlippedDNADetector()),
-            ('Cruciform', CruciformDetector()),
-            ('R_Loop', RLoopDetector()),
-            ('Triplex', TriplexDetector()),
-            ('G_Quadruplex', GQuadruplexDetector()),
-            ('i_Motif', IMotifDetector()),
-            ('Z_DNA', ZDNADetector()),
-            ('A_Philic', APhilicDetector())
-        ]
+        if use_parallel and self.mode == 'process':
+            return self._analyze_with_processes(sequence, sequence_name)
+        
+        from sequence_context import SequenceContext
+        
+        # Shared, lazily-populated context; safe to read from several threads
+        context = SequenceContext(sequence, normalized=True)
+        
+        # Reuse process-wide detector instances (constructed once)
+        from detectors import get_shared_detector
+        
+        detectors = [(key, get_shared_detector(key)) for key in self.detector_keys]
         
         all_motifs = []
         
@@ -97,7 +297,7 @@ class ParallelScanner:
                 futures = {}
                 
                 for name, detector in detectors:
-                    future = executor.submit(detector.detect_motifs, sequence, sequence_name)
+                    future = executor.submit(detector.detect_motifs, sequence, sequence_name, context)
                     futures[future] = name
                 
                 # Collect results as they complete
@@ -112,7 +312,7 @@ class ParallelScanner:
             # Sequential processing
             for name, detector in detectors:
                 try:
-                    motifs = detector.detect_motifs(sequence, sequence_name)
+                    motifs = detector.detect_motifs(sequence, sequence_name, context)
                     all_motifs.extend(motifs)
                 except Exception as e:
                     print(f"Warning: Error in {name} detector: {e}")
@@ -125,6 +325,45 @@ class ParallelScanner:
         
         return all_motifs
     
+    def _analyze_with_processes(self, sequence: str, sequence_name: str) -> List[Dict[str, Any]]:
+        """
+        Run each detector in the persistent process pool.
+        
+        The sequence bytes are copied once into a shared-memory block; tasks
+        only carry its name and length. Workers reuse their own detector
+        instances and return packed tuples, which are merged here in fixed
+        detector order so output does not depend on completion order.
+        """
+        data = sequence.encode('ascii')
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        try:
+            shm.buf[:len(data)] = data
+            pool = _get_process_pool(self.max_workers)
+            futures = {
+                pool.submit(_detector_task, (shm.name, len(data), key, sequence_name)): key
+                for key in self.detector_keys
+            }
+            
+            results: Dict[str, List[Dict[str, Any]]] = {}
+            for future in as_completed(futures):
+                detector_name = futures[future]
+                try:
+                    _, packed = future.result()
+                    results[detector_name] = unpack_motifs(packed)
+                except Exception as e:
+                    print(f"Warning: Error in {detector_name} detector: {e}")
+        finally:
+            shm.close()
+            shm.unlink()
+        
+        all_motifs = []
+        for key in self.detector_keys:
+            all_motifs.extend(results.get(key, []))
+        
+        all_motifs = self._remove_overlaps(all_motifs)
+        all_motifs.sort(key=lambda x: x.get('Start', 0))
+        return all_motifs
+    
     def _remove_overlaps(self, motifs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove overlapping motifs within same class/subclass"""
         if not motifs:
@@ -164,15 +403,17 @@ class ParallelScanner:
         """Get scanner statistics"""
         return {
             'scanner_type': 'parallel',
+            'mode': self.mode,
             'max_workers': self.max_workers,
-            'num_detectors': 9
+            'num_detectors': len(self.detector_keys)
         }
 
 
 # Convenience function
 
 def analyze_sequence_parallel(sequence: str, sequence_name: str = "sequence",
-                              use_parallel: bool = True) -> List[Dict[str, Any]]:
+                              use_parallel: bool = True, mode: str = 'thread',
+                              classes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Fast parallel analysis.
     
@@ -180,11 +421,13 @@ def analyze_sequence_parallel(sequence: str, sequence_name: str = "sequence",
         sequence: DNA sequence
         sequence_name: Sequence identifier
         use_parallel: Enable parallel processing
+        mode: 'thread' or 'process' (see ParallelScanner)
+        classes: Only run these motif classes (default: all)
         
     Returns:
         List of detected motifs
     """
-    scanner = ParallelScanner()
+    scanner = ParallelScanner(mode=mode, classes=classes)
     return scanner.analyze_sequence(sequence, sequence_name, use_parallel=use_parallel)
 
 
@@ -220,3 +463,14 @@ if __name__ == "__main__":
     print(f"Motifs: {len(motifs_multi)}")
     print(f"Speed: {len(test_seq)/time_multi:.0f} bp/s")
     print(f"Speedup: {time_single/time_multi:.2f}x")
+    
+    # Test process pool (shared-memory sequence, warm workers)
+    print("\n--- Multi-process ---")
+    process_scanner = ParallelScanner(mode='process')
+    start = time.time()
+    motifs_proc = process_scanner.analyze_sequence(test_seq, "test", use_parallel=True)
+    time_proc = time.time() - start
+    print(f"Time: {time_proc:.4f}s")
+    print(f"Motifs: {len(motifs_proc)}")
+    print(f"Speed: {len(test_seq)/time_proc:.0f} bp/s")
+    print(f"Speedup: {time_single/time_proc:.2f}x")
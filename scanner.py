@@ -37,9 +37,14 @@ Optimized genome-scale Python scanner for:
  - STRs (unit size 1..9 bp, total repeated length >= 10 bp)
 
 Design:
- - Seed-and-extend using k-mer indices (dict: kmer -> list(positions))
+ - Seed-and-extend using k-mer indices (KmerIndex: 2-bit codes -> grouped positions)
+ - Direct repeats: one batched longest-common-extension query per seed pair
  - Rolling-hash-free verification: uses direct slice compare for correctness
  - Candidate pruning: only consider seed position pairs with delta <= max_unit + max_spacer
+   (k + max_loop for inverted / mirror repeats, found by bisecting sorted positions;
+   longer arms are extended outward from their innermost seed pair)
+ - Triplex mirror repeats: left seeds restricted to starts of purine/pyrimidine-rich
+   windows (prefix sums + sliding maximum) before any pairing
  - Tuned defaults and safe-guards to avoid explosion on highly-repetitive seeds
 
 Usage:
@@ -54,6 +59,10 @@ import math
 from collections import defaultdict
 from typing import List, Dict, Tuple
 
+import numpy as np
+
+from sequence_context import BASE_CODES, LCEIndex, SequenceContext, find_runs, g4hunter_values
+
 # -------------------------
 # Parameters (user constraints)
 # -------------------------
@@ -102,41 +111,188 @@ def _calc_gc_content(seq: str) -> float:
 # -------------------------
 # K-mer index builder
 # -------------------------
-def build_kmer_index(seq: str, k: int) -> Dict[str, List[int]]:
+class KmerIndex:
     """
-    Build k-mer position index for seed-and-extend pattern matching.
-    
+    Compact k-mer position index for seed-and-extend pattern matching.
+
     # Index Structure:
-    # | Field    | Type       | Description                        |
-    # |----------|------------|------------------------------------|
-    # | key      | str        | k-mer sequence (length k)          |
-    # | value    | List[int]  | 0-based positions in sequence      |
-    
+    # | Field     | Type       | Description                                |
+    # |-----------|------------|--------------------------------------------|
+    # | k         | int        | k-mer length                               |
+    # | codes     | np.ndarray | int64 2-bit code of each k-mer, ascending  |
+    # | offsets   | np.ndarray | int64[len(codes)+1]; group g is            |
+    # |           |            | positions[offsets[g]:offsets[g+1]]         |
+    # | positions | np.ndarray | int32 0-based positions, grouped by code   |
+    # |           |            | and ascending within each group            |
+    # | order     | np.ndarray | Group indices in first-occurrence order    |
+
+    Built from the rolling codes of SequenceContext.kmer_codes() with one
+    stable argsort, instead of a dict of Python lists. Windows containing
+    anything but upper-case A/C/G/T are left out, and k-mers seen more than
+    max_positions times are dropped. As a read-only mapping it behaves like
+    the former Dict[str, List[int]] (keys iterate in first-occurrence
+    order), while the seed searches work on group indices directly.
+    """
+
+    def __init__(self, seq: str, k: int, max_positions: int = MAX_POSITIONS_PER_KMER):
+        self.k = k
+        codes = SequenceContext(seq, normalized=True).kmer_codes(k)
+        if codes.size and seq != seq.upper():
+            # Lower-case bases encode like upper-case ones; the index only
+            # accepts A/C/G/T
+            lower = np.isin(np.frombuffer(seq.encode('ascii', errors='replace'), dtype=np.uint8),
+                            np.frombuffer(b'acgt', dtype=np.uint8))
+            blocked = np.zeros(len(seq) + 1, dtype=np.int64)
+            np.cumsum(lower, out=blocked[1:])
+            codes = np.where(blocked[k:] - blocked[:codes.size] > 0, -1, codes)
+
+        valid = np.flatnonzero(codes >= 0)
+        by_code = np.argsort(codes[valid], kind='stable')
+        sorted_codes = codes[valid][by_code]
+        positions = valid[by_code].astype(np.int32)
+        heads = np.flatnonzero(np.concatenate(([True], sorted_codes[1:] != sorted_codes[:-1])))[:sorted_codes.size]
+        counts = np.diff(np.concatenate((heads, [sorted_codes.size])))
+
+        # Frequency cap: drop over-represented k-mers as whole groups
+        keep = counts <= max_positions
+        if not keep.all():
+            member = np.repeat(keep, counts)
+            positions = positions[member]
+            heads, counts = heads[keep], counts[keep]
+        self.codes = sorted_codes[heads]
+        self.positions = positions
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.order = np.argsort(positions[self.offsets[:-1]], kind='stable')
+
+    # -------------------------
+    # Group access
+    # -------------------------
+    def group_of(self, codes: np.ndarray) -> np.ndarray:
+        """Group index of each k-mer code (-1 where not indexed)."""
+        codes = np.asarray(codes, dtype=np.int64)
+        if self.codes.size == 0:
+            return np.full(codes.shape, -1, dtype=np.int64)
+        slot = np.minimum(np.searchsorted(self.codes, codes), self.codes.size - 1)
+        return np.where(self.codes[slot] == codes, slot, -1)
+
+    def group_positions(self, group: int) -> np.ndarray:
+        """Sorted positions of one group."""
+        return self.positions[self.offsets[group]:self.offsets[group + 1]]
+
+    def partner_groups(self, how: str) -> np.ndarray:
+        """
+        For each group, the group of its 'reverse' or 'revcomp' k-mer
+        (-1 where that k-mer is not indexed).
+        """
+        reverse = np.zeros_like(self.codes)
+        rest = self.codes.copy()
+        for _ in range(self.k):
+            reverse = (reverse << 2) | (rest & 3)
+            rest >>= 2
+        if how == 'revcomp':
+            reverse = (4 ** self.k - 1) - reverse
+        elif how != 'reverse':
+            raise ValueError(f"Unknown k-mer orientation '{how}'")
+        return self.group_of(reverse)
+
+    def decode(self, code: int) -> str:
+        """k-mer string for a 2-bit code."""
+        return ''.join('ACGT'[(code >> (2 * shift)) & 3] for shift in range(self.k - 1, -1, -1))
+
+    def encode(self, kmer: str) -> int:
+        """2-bit code for a k-mer string (-1 if not a k-length A/C/G/T word)."""
+        if len(kmer) != self.k or kmer.strip('ACGT'):
+            return -1
+        code = 0
+        for base in kmer:
+            code = (code << 2) | BASE_CODES[base]
+        return code
+
+    # -------------------------
+    # Mapping interface (kmer -> positions)
+    # -------------------------
+    def __len__(self) -> int:
+        return int(self.codes.size)
+
+    def __contains__(self, kmer: str) -> bool:
+        code = self.encode(kmer)
+        return code >= 0 and int(self.group_of(np.array([code]))[0]) >= 0
+
+    def __getitem__(self, kmer: str) -> List[int]:
+        code = self.encode(kmer)
+        group = int(self.group_of(np.array([code]))[0]) if code >= 0 else -1
+        if group < 0:
+            raise KeyError(kmer)
+        return self.group_positions(group).tolist()
+
+    def __iter__(self):
+        return self.keys()
+
+    def keys(self):
+        for group in self.order.tolist():
+            yield self.decode(int(self.codes[group]))
+
+    def items(self):
+        for group in self.order.tolist():
+            yield self.decode(int(self.codes[group])), self.group_positions(group).tolist()
+
+
+def build_kmer_index(seq: str, k: int) -> KmerIndex:
+    """
+    Build k-mer position index for seed-and-extend pattern matching.
+
     Args:
         seq: DNA sequence (ACGT)
         k: K-mer length
         
     Returns:
-        Dictionary mapping k-mer -> position list (filtered for frequency)
+        KmerIndex mapping k-mer -> position list (filtered for frequency)
     """
-    n = len(seq)
-    idx: Dict[str, List[int]] = defaultdict(list)
-    
-    # Build index with early filtering
-    valid_bases = frozenset("ACGT")
-    for i in range(n - k + 1):
-        kmer = seq[i:i + k]
-        if all(ch in valid_bases for ch in kmer):
-            lst = idx[kmer]
-            if len(lst) <= MAX_POSITIONS_PER_KMER:
-                lst.append(i)
-    
-    # Remove overly-frequent k-mers in-place for memory efficiency
-    for kmer in list(idx.keys()):
-        if len(idx[kmer]) > MAX_POSITIONS_PER_KMER:
-            del idx[kmer]
-    
-    return idx
+    return KmerIndex(seq, k)
+
+
+def _seed_pairs(index: KmerIndex, max_delta: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All (i, j) position pairs sharing a k-mer with 0 < j - i <= max_delta.
+
+    Pairs are taken at growing rank distance d inside each group, and a left
+    position retires once its d-th successor is out of reach, so the work is
+    proportional to the number of pairs. They come back ordered by k-mer
+    (first-occurrence order), then i, then j, as from nested loops over the
+    index.
+    """
+    positions = index.positions.astype(np.int64)
+    group = np.repeat(np.arange(len(index)), np.diff(index.offsets))
+    lefts, rights = [], []
+    active = np.arange(positions.size)
+    d = 1
+    while active.size:
+        active = active[active + d < positions.size]
+        partner = active + d
+        reach = (group[partner] == group[active]) & (positions[partner] - positions[active] <= max_delta)
+        active = active[reach]
+        lefts.append(active)
+        rights.append(active + d)
+        d += 1
+    left = np.concatenate(lefts) if lefts else np.zeros(0, dtype=np.int64)
+    right = np.concatenate(rights) if rights else np.zeros(0, dtype=np.int64)
+
+    rank = np.empty(len(index), dtype=np.int64)
+    rank[index.order] = np.arange(len(index))
+    order = np.lexsort((right, left, rank[group[left]]))
+    return positions[left[order]], positions[right[order]]
+
+
+def _partner_windows(left: np.ndarray, right: np.ndarray,
+                     max_delta: int) -> Tuple[List[int], List[int]]:
+    """
+    For sorted seed positions `left` and partner positions `right`, the
+    bounds [lo, hi) in `right` of the partners j with 0 < j - i <= max_delta
+    for each i, by bisection.
+    """
+    lo = np.searchsorted(right, left, side='right')
+    hi = np.searchsorted(right, left + max_delta, side='right')
+    return lo.tolist(), hi.tolist()
 
 
 # -------------------------
@@ -164,66 +320,228 @@ def find_direct_repeats(seq: str,
     Returns:
         List of direct repeat dictionaries
     """
-    n = len(seq)
     idx = build_kmer_index(seq, K_DIRECT)
     results = []
     max_delta = max_unit + max_spacer
-    
-    for kmer, poses in idx.items():
-        m = len(poses)
-        if m < 2:
+
+    # Seed pairs within reach of each other
+    left, right = _seed_pairs(idx, max_delta)
+    if not left.size:
+        return []
+
+    # The longest unit L in [L_min, L_max] with seq[i:i+L] == seq[j:j+L]
+    # is min(L_max, LCE(i, j)), one query per pair
+    delta = right - left
+    l_min = np.maximum(min_unit, delta - max_spacer)
+    l_max = np.minimum(max_unit, delta)
+    units = np.minimum(l_max, LCEIndex(seq).query(left, right, l_max))
+    found = np.flatnonzero(units >= l_min)
+    if not found.size:
+        return []
+
+    # Deduplicate: prefer maximal unit_length per (Left_Pos, Spacer), the
+    # first such pair winning ties; keys keep their first-seen order
+    spacers = delta[found] - units[found]
+    order = np.lexsort((found, -units[found], spacers, left[found]))
+    sorted_left, sorted_spacer = left[found][order], spacers[order]
+    heads = np.flatnonzero(np.concatenate((
+        [True], (sorted_left[1:] != sorted_left[:-1]) | (sorted_spacer[1:] != sorted_spacer[:-1]))))
+    first_seen = np.minimum.reduceat(order, heads)
+    winners = found[order[heads][np.argsort(first_seen, kind='stable')]]
+
+    for i, j_start, L in zip(left[winners].tolist(), right[winners].tolist(), units[winners].tolist()):
+        unit_seq = seq[i:i + L]
+        spacer_seq = seq[i + L:j_start] if j_start > i + L else ''
+        full_seq = seq[i:j_start + L]
+        
+        rec = {
+            'Class': 'Direct_Repeat',
+            'Subclass': f'Direct_L{L}',
+            'Start': i + 1,
+            'End': j_start + L,
+            'Length': (j_start + L) - i,
+            'Unit_Length': L,
+            'Spacer': j_start - (i + L),
+            'Left_Pos': i + 1,
+            'Right_Pos': j_start + 1,
+            'Unit_Seq': unit_seq,
+            'Spacer_Seq': spacer_seq,
+            'Sequence': full_seq,
+            'Left_Unit': unit_seq,
+            'Right_Unit': seq[j_start:j_start + L],
+            'GC_Unit': round(_calc_gc_content(unit_seq), 2),
+            'GC_Spacer': round(_calc_gc_content(spacer_seq), 2),
+            'GC_Total': round(_calc_gc_content(full_seq), 2)
+        }
+        results.append(rec)
+    return results
+
+
+# -------------------------
+# Inverted / Mirror arm search (shared seed-and-extend)
+# -------------------------
+def _position_groups(index: KmerIndex, n: int) -> np.ndarray:
+    """Group index of the k-mer starting at each position (-1 where not indexed)."""
+    groups = np.full(n, -1, dtype=np.int64)
+    groups[index.positions] = np.repeat(np.arange(len(index)), np.diff(index.offsets))
+    return groups
+
+
+def _window_keys(seq: str, k: int) -> np.ndarray:
+    """
+    Rolling key of every k-base window of seq. Equal windows get equal
+    keys; keys wrap around in int64, so equal keys are only a prefilter.
+    """
+    if seq.isascii():
+        symbols = np.frombuffer(seq.encode('ascii'), dtype=np.uint8).astype(np.int64)
+    else:
+        symbols = np.fromiter(map(ord, seq), dtype=np.int64, count=len(seq))
+    keys = np.zeros(max(symbols.size - k + 1, 0), dtype=np.int64)
+    for offset in range(k):
+        keys = keys * 1000003 + symbols[offset:offset + keys.size]
+    return keys
+
+
+def _long_arm_hits(seq: str, k: int, groups: np.ndarray, partners: np.ndarray, partner: str,
+                   min_arm: int, max_loop: int, min_delta: int,
+                   left_mask: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Longest arm of every seed pair (i, j) with j - i > min_delta, as arrays.
+    `groups` holds the k-mer group at each position (_position_groups) and
+    `partners` the partner group of each group.
+
+    A hit (i, j, arm) pairs seq[i + t] with partner[j + arm - 1 - t], where
+    `partner` is the complement of seq (inverted) or seq itself (mirror).
+    With j - i = arm + loop and loop <= max_loop, a hit beyond min_delta =
+    k + max_loop has arm > k, so its innermost k pairs, the k-mer ending at
+    i + arm - 1 against the k-mer at j, lie at most k + max_loop apart. Those
+    innermost pairs are found per loop length by comparing window keys, and
+    the stem is extended outward with one batched LCE query. Every arm the
+    stem allows then names a left start i, which is a hit when (i, j) is a
+    seed pair of the index; the longest such arm is kept per pair.
+    """
+    n = len(seq)
+    empty = np.zeros(0, dtype=np.int64)
+    if n < 2 * k + 1 or partners.size == 0:
+        return empty, empty, empty
+    inner_keys = _window_keys(seq, k)
+    # Key of partner[y:y + k] read backwards, at n - k - y
+    outer_keys = _window_keys(partner[::-1], k)
+    # seq[x - t] against partner[y + t] is an LCE between seq reversed and partner
+    lce = LCEIndex(seq[::-1] + partner)
+
+    lefts, rights, arms = [], [], []
+    for loop in range(max_loop + 1):
+        # Innermost pair (x, x + loop + 1) with k pairs fitting on both sides
+        inner = np.arange(k - 1, n - k - loop, dtype=np.int64)
+        inner = inner[inner_keys[inner - k + 1] == outer_keys[n - k - loop - 1 - inner]]
+        if inner.size == 0:
             continue
-            
-        for a in range(m):
-            i = poses[a]
-            b = a + 1
-            while b < m:
-                j = poses[b]
+        right = inner + loop + 1
+        reach = lce.query(n - 1 - inner, n + right, np.minimum(inner + 1, n - right))
+        shortest = max(min_arm, min_delta + 1 - loop)
+        # The right seed sits at the innermost pair, so it must be indexed
+        long_enough = (reach >= shortest) & (groups[right] >= 0)
+        inner, right, reach = inner[long_enough], right[long_enough], reach[long_enough]
+        if inner.size == 0:
+            continue
+        counts = reach - shortest + 1
+        heads = np.repeat(np.cumsum(counts) - counts, counts)
+        arm = shortest + np.arange(int(counts.sum()), dtype=np.int64) - heads
+        right = np.repeat(right, counts)
+        left = np.repeat(inner, counts) - arm + 1
+        group = groups[left]
+        seeded = (group >= 0) & (partners[np.maximum(group, 0)] == groups[right])
+        if left_mask is not None:
+            seeded &= left_mask[left]
+        lefts.append(left[seeded])
+        rights.append(right[seeded])
+        arms.append(arm[seeded])
+    left = np.concatenate(lefts + [empty])
+    if left.size == 0:
+        return empty, empty, empty
+    right, arm = np.concatenate(rights), np.concatenate(arms)
+    order = np.lexsort((-arm, right, left))
+    left, right, arm = left[order], right[order], arm[order]
+    first = np.concatenate(([True], (left[1:] != left[:-1]) | (right[1:] != right[:-1])))
+    return left[first], right[first], arm[first]
+
+
+def _arm_hits(seq: str, how: str, min_arm: int, max_loop: int,
+              left_mask: np.ndarray = None) -> List[Tuple[int, int, int]]:
+    """
+    (i, j, arm) for the longest arm of every seed pair, in k-mer index order
+    (then i, then j), for inverted (how='revcomp') or mirror (how='reverse')
+    repeats. With left_mask, only left seeds i where left_mask[i] is set
+    are paired.
+
+    Seed pairs at most k + max_loop apart try each arm length directly. For
+    pairs further apart the arm must be long, and _long_arm_hits() finds
+    them by extending outward from their innermost seed pair, so arms of
+    any length are reported without pairing every seed with every partner.
+    """
+    n = len(seq)
+    k = K_INVERTED if how == 'revcomp' else K_MIRROR
+    idx = build_kmer_index(seq, k)
+    partner = seq.translate(_RC_TRANS) if how == 'revcomp' else seq
+    partners = idx.partner_groups(how)
+    near = k + max_loop
+    hits = []
+    
+    groups = idx.order
+    if left_mask is not None:
+        # Only groups with at least one admissible left seed
+        member = np.repeat(np.arange(idx.codes.size), np.diff(idx.offsets))
+        wanted = np.zeros(idx.codes.size, dtype=bool)
+        wanted[member[left_mask[idx.positions]]] = True
+        groups = groups[wanted[groups]]
+    
+    for group in groups.tolist():
+        partner_group = int(partners[group])
+        if partner_group < 0:
+            continue
+        left_positions = idx.group_positions(group)
+        if left_mask is not None:
+            left_positions = left_positions[left_mask[left_positions]]
+        partner_positions = idx.group_positions(partner_group)
+        windows = _partner_windows(left_positions, partner_positions, near)
+        partner_positions = partner_positions.tolist()
+        for i, lo, hi in zip(left_positions.tolist(), *windows):
+            for j in partner_positions[lo:hi]:
                 delta = j - i
-                if delta > max_delta:
-                    break
-                    
-                L_min = max(min_unit, delta - max_spacer)
-                L_max = min(max_unit, delta)
-                if L_min <= L_max:
-                    for L in range(L_max, L_min - 1, -1):
-                        j_start = j
-                        if j_start + L > n or i + L > n:
-                            continue
-                        if seq[i:i + L] == seq[j_start:j_start + L]:
-                            unit_seq = seq[i:i + L]
-                            spacer_seq = seq[i + L:j_start] if j_start > i + L else ''
-                            full_seq = seq[i:j_start + L]
-                            
-                            rec = {
-                                'Class': 'Direct_Repeat',
-                                'Subclass': f'Direct_L{L}',
-                                'Start': i + 1,
-                                'End': j_start + L,
-                                'Length': (j_start + L) - i,
-                                'Unit_Length': L,
-                                'Spacer': j_start - (i + L),
-                                'Left_Pos': i + 1,
-                                'Right_Pos': j_start + 1,
-                                'Unit_Seq': unit_seq,
-                                'Spacer_Seq': spacer_seq,
-                                'Sequence': full_seq,
-                                'Left_Unit': unit_seq,
-                                'Right_Unit': seq[j_start:j_start + L],
-                                'GC_Unit': round(_calc_gc_content(unit_seq), 2),
-                                'GC_Spacer': round(_calc_gc_content(spacer_seq), 2),
-                                'GC_Total': round(_calc_gc_content(full_seq), 2)
-                            }
-                            results.append(rec)
-                            break
-                b += 1
-    
-    # Deduplicate: prefer maximal unit_length per (Left_Pos, Spacer)
-    dedup: Dict[Tuple[int, int], Dict] = {}
-    for rec in results:
-        key = (rec['Left_Pos'], rec['Spacer'])
-        if key not in dedup or rec['Unit_Length'] > dedup[key]['Unit_Length']:
-            dedup[key] = rec
+                arm_min = max(min_arm, delta - max_loop)
+                arm_max = min(delta, n - j, n - i)
+                if arm_min > arm_max:
+                    continue
+                for arm in range(arm_max, arm_min - 1, -1):
+                    if seq[i:i + arm] == partner[j:j + arm][::-1]:
+                        hits.append((i, j, arm))
+                        break
+    
+    position_groups = _position_groups(idx, n)
+    far = _long_arm_hits(seq, k, position_groups, partners, partner,
+                         min_arm, max_loop, near, left_mask)
+    if far[0].size == 0:
+        return hits
+    # Merge the far hits into k-mer index order
+    rank = np.empty(len(idx), dtype=np.int64)
+    rank[idx.order] = np.arange(len(idx))
+    near_hits = np.array(hits, dtype=np.int64).reshape(-1, 3)
+    left = np.concatenate((near_hits[:, 0], far[0]))
+    right = np.concatenate((near_hits[:, 1], far[1]))
+    arm = np.concatenate((near_hits[:, 2], far[2]))
+    order = np.lexsort((right, left, rank[position_groups[left]]))
+    return list(zip(left[order].tolist(), right[order].tolist(), arm[order].tolist()))
+
+
+def _dedupe_arm_hits(hits: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """Keep the maximal arm per (left start, loop), in first-seen order."""
+    dedup: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+    for hit in hits:
+        i, j, arm = hit
+        key = (i, j - i - arm)
+        if key not in dedup or arm > dedup[key][2]:
+            dedup[key] = hit
     return list(dedup.values())
 
 
@@ -250,75 +568,91 @@ def find_inverted_repeats(seq: str,
     Returns:
         List of inverted repeat dictionaries
     """
-    n = len(seq)
-    idx = build_kmer_index(seq, K_INVERTED)
     results = []
-    
-    # Precompute reverse complement mapping
-    rc_map = {}
-    for kmer in list(idx.keys()):
-        rc = revcomp(kmer)
-        if rc in idx:
-            rc_map[kmer] = idx[rc]
-    
-    # Find inverted repeats
-    for kmer, rc_positions in rc_map.items():
-        left_positions = idx[kmer]
-        for i in left_positions:
-            for j in rc_positions:
-                if j <= i:
-                    continue
-                delta = j - i
-                arm_min = max(min_arm, delta - max_loop)
-                arm_max = min(delta, n - j, n - i)
-                if arm_min > arm_max:
-                    continue
-                    
-                for arm in range(arm_max, arm_min - 1, -1):
-                    if i + arm > n or j + arm > n:
-                        continue
-                    left_sub = seq[i:i + arm]
-                    right_sub = seq[j:j + arm]
-                    if left_sub == revcomp(right_sub):
-                        loop_seq = seq[i + arm:j] if j > i + arm else ''
-                        full_seq = seq[i:j + arm]
-                        
-                        rec = {
-                            'Class': 'Inverted_Repeat',
-                            'Subclass': f'Inverted_arm_{arm}',
-                            'Start': i + 1,
-                            'End': j + arm,
-                            'Length': (j + arm) - i,
-                            'Left_Start': i + 1,
-                            'Right_Start': j + 1,
-                            'Arm_Length': arm,
-                            'Loop': delta - arm,
-                            'Loop_Length': len(loop_seq),
-                            'Left_Arm': left_sub,
-                            'Right_Arm': right_sub,
-                            'Loop_Seq': loop_seq,
-                            'Sequence': full_seq,
-                            'Stem': f'{left_sub}...{right_sub}',
-                            'GC_Left_Arm': round(_calc_gc_content(left_sub), 2),
-                            'GC_Right_Arm': round(_calc_gc_content(right_sub), 2),
-                            'GC_Loop': round(_calc_gc_content(loop_seq), 2),
-                            'GC_Total': round(_calc_gc_content(full_seq), 2)
-                        }
-                        results.append(rec)
-                        break
-    
     # Deduplicate: keep maximal arm per (Left_Start, Loop)
-    dedup: Dict[Tuple[int, int], Dict] = {}
-    for rec in results:
-        key = (rec['Left_Start'], rec['Loop'])
-        if key not in dedup or rec['Arm_Length'] > dedup[key]['Arm_Length']:
-            dedup[key] = rec
-    return list(dedup.values())
+    for i, j, arm in _dedupe_arm_hits(_arm_hits(seq, 'revcomp', min_arm, max_loop)):
+        left_sub = seq[i:i + arm]
+        right_sub = seq[j:j + arm]
+        loop_seq = seq[i + arm:j] if j > i + arm else ''
+        full_seq = seq[i:j + arm]
+        
+        rec = {
+            'Class': 'Inverted_Repeat',
+            'Subclass': f'Inverted_arm_{arm}',
+            'Start': i + 1,
+            'End': j + arm,
+            'Length': (j + arm) - i,
+            'Left_Start': i + 1,
+            'Right_Start': j + 1,
+            'Arm_Length': arm,
+            'Loop': j - i - arm,
+            'Loop_Length': len(loop_seq),
+            'Left_Arm': left_sub,
+            'Right_Arm': right_sub,
+            'Loop_Seq': loop_seq,
+            'Sequence': full_seq,
+            'Stem': f'{left_sub}...{right_sub}',
+            'GC_Left_Arm': round(_calc_gc_content(left_sub), 2),
+            'GC_Right_Arm': round(_calc_gc_content(right_sub), 2),
+            'GC_Loop': round(_calc_gc_content(loop_seq), 2),
+            'GC_Total': round(_calc_gc_content(full_seq), 2)
+        }
+        results.append(rec)
+    return results
 
 
 # -------------------------
 # Mirror Repeats (Triplex DNA component)
 # -------------------------
+def _purine_pyrimidine_fractions(arms: str) -> Tuple[float, float]:
+    total_bases = len(arms)
+    if total_bases == 0:
+        return 0, 0
+    purine_count = arms.count('A') + arms.count('G')
+    pyrimidine_count = arms.count('C') + arms.count('T')
+    return purine_count / total_bases, pyrimidine_count / total_bases
+
+
+def _mirror_record(seq: str, i: int, j: int, arm: int, purine_fraction: float,
+                   pyrimidine_fraction: float, is_triplex: bool) -> Dict:
+    left_arm = seq[i:i + arm]
+    right_arm = seq[j:j + arm]
+    loop_seq = seq[i + arm:j] if j > i + arm else ''
+    full_seq = seq[i:j + arm]
+    
+    # Calculate GC content for components
+    gc_left_arm = (left_arm.count('G') + left_arm.count('C')) / len(left_arm) * 100 if len(left_arm) > 0 else 0
+    gc_right_arm = (right_arm.count('G') + right_arm.count('C')) / len(right_arm) * 100 if len(right_arm) > 0 else 0
+    gc_loop = (loop_seq.count('G') + loop_seq.count('C')) / len(loop_seq) * 100 if len(loop_seq) > 0 else 0
+    gc_total = (full_seq.count('G') + full_seq.count('C')) / len(full_seq) * 100 if len(full_seq) > 0 else 0
+    
+    return {
+        'Class': 'Mirror_Repeat',
+        'Subclass': f'Mirror_arm_{arm}',
+        'Start': i + 1,
+        'End': j + arm,
+        'Length': (j + arm) - i,
+        'Left_Start': i + 1,
+        'Right_Start': j + 1,
+        'Arm_Length': arm,
+        'Loop': j - i - arm,
+        'Loop_Length': len(loop_seq),
+        'Left_Arm': left_arm,
+        'Right_Arm': right_arm,
+        'Loop_Seq': loop_seq,
+        'Sequence': full_seq,
+        'Is_Triplex': is_triplex,
+        'Purine_Fraction': round(purine_fraction, 3),
+        'Pyrimidine_Fraction': round(pyrimidine_fraction, 3),
+        # Component details
+        'Stem': f'{left_arm}...{right_arm}',
+        'GC_Left_Arm': round(gc_left_arm, 2),
+        'GC_Right_Arm': round(gc_right_arm, 2),
+        'GC_Loop': round(gc_loop, 2),
+        'GC_Total': round(gc_total, 2)
+    }
+
+
 def find_mirror_repeats(seq: str, 
                        min_arm: int = MIRROR_MIN_ARM, 
                        max_loop: int = MIRROR_MAX_LOOP,
@@ -329,159 +663,186 @@ def find_mirror_repeats(seq: str,
     
     For Triplex DNA, we also filter for >90% purine or pyrimidine content in arms.
     """
+    results = []
+    for i, j, arm in _dedupe_arm_hits(_arm_hits(seq, 'reverse', min_arm, max_loop)):
+        # Check purine/pyrimidine content for Triplex DNA
+        purine_fraction, pyrimidine_fraction = _purine_pyrimidine_fractions(
+            seq[i:i + arm] + seq[j:j + arm])
+        is_triplex = (purine_fraction >= purine_pyrimidine_threshold or 
+                      pyrimidine_fraction >= purine_pyrimidine_threshold)
+        results.append(_mirror_record(seq, i, j, arm, purine_fraction,
+                                      pyrimidine_fraction, is_triplex))
+    return results
+
+
+def _triplex_arm_starts(seq: str, min_arm: int, threshold: float) -> np.ndarray:
+    """
+    Positions i where some window seq[i:i + L], L >= min_arm, is at least
+    `threshold` purine or at least `threshold` pyrimidine.
+
+    A window of L bases tolerates (1 - threshold) * L off-class bases, so
+    with P the running count of one class this is
+    max(P[x] - threshold * x for x >= i + min_arm) >= P[i] - threshold * i:
+    one prefix sum and one suffix maximum per class.
+    """
     n = len(seq)
-    idx = build_kmer_index(seq, K_MIRROR)
+    starts = np.zeros(n, dtype=bool)
+    if n < min_arm:
+        return starts
+    codes = SequenceContext(seq, normalized=True).codes
+    offsets = np.arange(n + 1) * threshold
+    for members in ((0, 2), (1, 3)):
+        running = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.isin(codes, members), out=running[1:])
+        balance = running - offsets
+        best = np.maximum.accumulate(balance[min_arm:][::-1])[::-1]
+        # Slack for rounding; the exact fraction is checked per hit
+        starts[:n - min_arm + 1] |= best >= balance[:n - min_arm + 1] - 1e-9
+    return starts
+
+
+def find_triplex_mirror_repeats(seq: str,
+                                min_arm: int = MIRROR_MIN_ARM,
+                                max_loop: int = MIRROR_MAX_LOOP,
+                                purine_pyrimidine_threshold: float = 0.9) -> List[Dict]:
+    """
+    The Is_Triplex records of find_mirror_repeats(), in the same order.
+
+    Mirror arms share their composition, so a triplex left arm is itself a
+    window of at least min_arm bases that passes the purine/pyrimidine
+    threshold. Seeds are only paired from left positions that start such a
+    window (see _triplex_arm_starts), which skips most of a typical genome,
+    and records are only built for hits that pass the threshold.
+    """
+    left_mask = _triplex_arm_starts(seq, min_arm, purine_pyrimidine_threshold)
+    if not left_mask.any():
+        return []
     results = []
-    
-    keys = list(idx.keys())
-    # For mirror, the reverse of substring is simply reversed string
-    rev_map = {}
-    for kmer in keys:
-        rev = kmer[::-1]
-        if rev in idx:
-            rev_map[kmer] = idx[rev]
-    
-    for kmer, rev_positions in rev_map.items():
-        left_positions = idx[kmer]
-        for i in left_positions:
-            for j in rev_positions:
-                if j <= i:
-                    continue
-                delta = j - i
-                arm_min = max(min_arm, delta - max_loop)
-                arm_max = min(delta, n - j, n - i)
-                if arm_min > arm_max:
-                    continue
-                for arm in range(arm_max, arm_min - 1, -1):
-                    if i + arm > n or j + arm > n:
-                        continue
-                    left_arm = seq[i:i + arm]
-                    right_arm = seq[j:j + arm]
-                    if left_arm == right_arm[::-1]:
-                        # Check purine/pyrimidine content for Triplex DNA
-                        combined_arms = left_arm + right_arm
-                        purine_count = sum(1 for b in combined_arms if b in 'AG')
-                        pyrimidine_count = sum(1 for b in combined_arms if b in 'CT')
-                        total_bases = len(combined_arms)
-                        
-                        purine_fraction = purine_count / total_bases if total_bases > 0 else 0
-                        pyrimidine_fraction = pyrimidine_count / total_bases if total_bases > 0 else 0
-                        
-                        is_triplex = (purine_fraction >= purine_pyrimidine_threshold or 
-                                     pyrimidine_fraction >= purine_pyrimidine_threshold)
-                        
-                        # Calculate component details
-                        loop_seq = seq[i + arm:j] if j > i + arm else ''
-                        full_seq = seq[i:j + arm]
-                        
-                        # Calculate GC content for components
-                        gc_left_arm = (left_arm.count('G') + left_arm.count('C')) / len(left_arm) * 100 if len(left_arm) > 0 else 0
-                        gc_right_arm = (right_arm.count('G') + right_arm.count('C')) / len(right_arm) * 100 if len(right_arm) > 0 else 0
-                        gc_loop = (loop_seq.count('G') + loop_seq.count('C')) / len(loop_seq) * 100 if len(loop_seq) > 0 else 0
-                        gc_total = (full_seq.count('G') + full_seq.count('C')) / len(full_seq) * 100 if len(full_seq) > 0 else 0
-                        
-                        rec = {
-                            'Class': 'Mirror_Repeat',
-                            'Subclass': f'Mirror_arm_{arm}',
-                            'Start': i + 1,
-                            'End': j + arm,
-                            'Length': (j + arm) - i,
-                            'Left_Start': i + 1,
-                            'Right_Start': j + 1,
-                            'Arm_Length': arm,
-                            'Loop': delta - arm,
-                            'Loop_Length': len(loop_seq),
-                            'Left_Arm': left_arm,
-                            'Right_Arm': right_arm,
-                            'Loop_Seq': loop_seq,
-                            'Sequence': full_seq,
-                            'Is_Triplex': is_triplex,
-                            'Purine_Fraction': round(purine_fraction, 3),
-                            'Pyrimidine_Fraction': round(pyrimidine_fraction, 3),
-                            # Component details
-                            'Stem': f'{left_arm}...{right_arm}',
-                            'GC_Left_Arm': round(gc_left_arm, 2),
-                            'GC_Right_Arm': round(gc_right_arm, 2),
-                            'GC_Loop': round(gc_loop, 2),
-                            'GC_Total': round(gc_total, 2)
-                        }
-                        results.append(rec)
-                        break
-    
-    # dedupe maximal arms
-    dedup: Dict[Tuple[int, int], Dict] = {}
-    for rec in results:
-        key = (rec['Left_Start'], rec['Loop'])
-        if key not in dedup or rec['Arm_Length'] > dedup[key]['Arm_Length']:
-            dedup[key] = rec
-    return list(dedup.values())
+    for i, j, arm in _dedupe_arm_hits(_arm_hits(seq, 'reverse', min_arm, max_loop, left_mask)):
+        purine_fraction, pyrimidine_fraction = _purine_pyrimidine_fractions(
+            seq[i:i + arm] + seq[j:j + arm])
+        if (purine_fraction >= purine_pyrimidine_threshold or
+                pyrimidine_fraction >= purine_pyrimidine_threshold):
+            results.append(_mirror_record(seq, i, j, arm, purine_fraction,
+                                          pyrimidine_fraction, True))
+    return results
 
 
 # -------------------------
 # STRs (Short Tandem Repeats)
 # -------------------------
+def _all_true_windows(mask: np.ndarray, width: int) -> np.ndarray:
+    """out[p] = mask[p:p + width].all(), by log2(width) shifted ANDs."""
+    out, span = mask, 1
+    while span * 2 <= width:
+        out = out[:-span] & out[span:]
+        span *= 2
+    if span < width:
+        out = out[:-(width - span)] & out[width - span:]
+    return out
+
+
+def _str_period_runs(seq: str, min_u: int, max_u: int,
+                     min_total: int) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Period-match runs for every unit size at once.
+
+    Row k of the mask matrix holds seq[p] == seq[p + k]; a perfect k-periodic
+    stretch of b - a + k bases is a maximal True run [a, b) in that row. Only
+    runs that can hold a tract of min_total bases (at least
+    max(k, min_total - k) long) matter, so each row is first eroded to the
+    starts of such windows, which leaves few run edges even on Mb inputs.
+    The rows are flattened with a False separator so one find_runs() call
+    run-length encodes all unit sizes.
+
+    Returns:
+        [(k, starts, ends)] for k = min_u..max_u, runs 0-based half-open
+    """
+    n = len(seq)
+    if seq.isascii():
+        raw = np.frombuffer(seq.encode('ascii'), dtype=np.uint8)
+    else:
+        raw = np.fromiter(map(ord, seq), dtype=np.uint32, count=n)
+    units = list(range(min_u, max_u + 1))
+    min_runs = [max(k, min_total - k) for k in units]
+    width = n + 1
+    windows = np.zeros((len(units), width), dtype=bool)
+    for row, k in enumerate(units):
+        if n - k >= min_runs[row]:
+            eroded = _all_true_windows(raw[:n - k] == raw[k:], min_runs[row])
+            windows[row, :eroded.size] = eroded
+    starts, ends = find_runs(windows.ravel())
+    rows = starts // width
+    starts -= rows * width
+    ends -= rows * width
+
+    runs = []
+    for row, k in enumerate(units):
+        in_row = rows == row
+        runs.append((k, starts[in_row], ends[in_row] + min_runs[row] - 1))
+    return runs
+
+
 def find_strs(seq: str, 
               min_u: int = STR_MIN_UNIT, 
               max_u: int = STR_MAX_UNIT, 
               min_total: int = STR_MIN_TOTAL) -> List[Dict]:
     """
     Greedy detection of perfect STRs (tandem repeats).
-    For each unit size k in 1..9, slide and count consecutive copies.
+
+    For each unit size k in 1..9, tracts are read off the period-match runs
+    of _str_period_runs() instead of sliding over the sequence. A run [a, b)
+    holds 1 + (b - i) // k copies of the unit starting at i; as in a
+    left-to-right greedy scan, a tract that ends past b blocks the next run
+    up to its end, and the same locus is reported once per unit size that
+    tiles it (e.g. as a 2-mer and a 4-mer repeat).
     """
-    n = len(seq)
     results = []
-    for k in range(min_u, max_u + 1):
-        i = 0
-        while i <= n - k:
-            unit = seq[i:i + k]
-            # require at least one repeat following to qualify quickly
-            if i + k >= n or seq[i + k:i + 2 * k] != unit:
-                i += 1
+    for k, run_starts, run_ends in _str_period_runs(seq, min_u, max_u, min_total):
+        blocked = 0  # end of the previous tract of this unit size
+        for a, b in zip(run_starts.tolist(), run_ends.tolist()):
+            i = max(a, blocked)
+            if b - i < k:
                 continue
-            # count copies
-            copies = 1
-            j = i + k
-            while j + k <= n and seq[j:j + k] == unit:
-                copies += 1
-                j += k
+            copies = 1 + (b - i) // k
             total_len = copies * k
-            if total_len >= min_total:
-                # Calculate component details
-                full_seq = seq[i:j]
-                
-                # Calculate GC content
-                gc_unit = (unit.count('G') + unit.count('C')) / len(unit) * 100 if len(unit) > 0 else 0
-                gc_total = (full_seq.count('G') + full_seq.count('C')) / len(full_seq) * 100 if len(full_seq) > 0 else 0
-                
-                # Calculate AT/GC composition of unit
-                a_count = unit.count('A')
-                t_count = unit.count('T')
-                g_count = unit.count('G')
-                c_count = unit.count('C')
-                
-                results.append({
-                    'Class': 'STR',
-                    'Subclass': f'unit_{k}',
-                    'Start': i + 1,
-                    'End': j,
-                    'Unit_Length': k,
-                    'Copies': copies,
-                    'Length': total_len,
-                    'Unit_Seq': unit,
-                    'Sequence': full_seq,
-                    # Component details
-                    'Repeat_Unit': unit,
-                    'Number_of_Copies': copies,
-                    'GC_Unit': round(gc_unit, 2),
-                    'GC_Total': round(gc_total, 2),
-                    'Unit_A_Count': a_count,
-                    'Unit_T_Count': t_count,
-                    'Unit_G_Count': g_count,
-                    'Unit_C_Count': c_count
-                })
-                i = j  # skip to end of tandem block
-            else:
-                i += 1
+            if total_len < min_total:
+                continue
+            j = i + total_len
+            unit = seq[i:i + k]
+            full_seq = seq[i:j]
+
+            # Calculate GC content
+            gc_unit = (unit.count('G') + unit.count('C')) / len(unit) * 100 if len(unit) > 0 else 0
+            gc_total = (full_seq.count('G') + full_seq.count('C')) / len(full_seq) * 100 if len(full_seq) > 0 else 0
+
+            # Calculate AT/GC composition of unit
+            a_count = unit.count('A')
+            t_count = unit.count('T')
+            g_count = unit.count('G')
+            c_count = unit.count('C')
+
+            results.append({
+                'Class': 'STR',
+                'Subclass': f'unit_{k}',
+                'Start': i + 1,
+                'End': j,
+                'Unit_Length': k,
+                'Copies': copies,
+                'Length': total_len,
+                'Unit_Seq': unit,
+                'Sequence': full_seq,
+                # Component details
+                'Repeat_Unit': unit,
+                'Number_of_Copies': copies,
+                'GC_Unit': round(gc_unit, 2),
+                'GC_Total': round(gc_total, 2),
+                'Unit_A_Count': a_count,
+                'Unit_T_Count': t_count,
+                'Unit_G_Count': g_count,
+                'Unit_C_Count': c_count
+            })
+            blocked = j  # skip to end of tandem block
     return results
 """
 Modular NBD Scanner (RECOMMENDED for Production Use)
@@ -579,30 +940,11 @@ class ModularMotifDetector:
     def __init__(self, registry_dir: str = DEFAULT_REGISTRY_DIR):
         """Initialize all individual detectors (lazy import to avoid circular dependency)"""
         # Lazy import of detectors to break circular dependency
-        from detectors import (
-            CurvedDNADetector,
-            SlippedDNADetector,
-            CruciformDetector,
-            RLoopDetector,
-            TriplexDetector,
-            GQuadruplexDetector,
-            IMotifDetector,
-            ZDNADetector,
-            APhilicDetector
-        )
+        from detectors import DETECTOR_CLASSES, get_shared_detector
         
         self.registry_dir = registry_dir
-        self.detectors = {
-            'curved_dna': CurvedDNADetector(),
-            'slipped_dna': SlippedDNADetector(),
-            'cruciform': CruciformDetector(), 
-            'r_loop': RLoopDetector(),
-            'triplex': TriplexDetector(),
-            'g_quadruplex': GQuadruplexDetector(),
-            'i_motif': IMotifDetector(),
-            'z_dna': ZDNADetector(),
-            'a_philic': APhilicDetector()
-        }
+        # Shared, already-constructed detector instances
+        self.detectors = {key: get_shared_detector(key) for key in DETECTOR_CLASSES}
         # Preload Hyperscan DBs for detectors that have registries
         self._preload_detector_dbs()
     
@@ -632,8 +974,8 @@ class ModularMotifDetector:
         
         # Map class names to detector instances for optional attribute setting
         detector_map = {
-            "ZDNA": ("z_dna", ZDNADetector),
-            "APhilic": ("a_philic", APhilicDetector)
+            "ZDNA": ("z_dna", type(self.detectors['z_dna'])),
+            "APhilic": ("a_philic", type(self.detectors['a_philic']))
         }
         
         for cls in candidate_classes:
@@ -1096,13 +1438,7 @@ class MotifScoring:
         if len(sequence) < 10:
             return 0.0
         
-        score = 0.0
-        for i, base in enumerate(sequence):
-            if base == 'G':
-                score += 1
-            elif base == 'C':
-                score -= 1
-        
+        score = int(g4hunter_values(sequence).sum(dtype=np.int64))
         return score / len(sequence)
     
     @staticmethod
@@ -1582,12 +1918,14 @@ def analyze_multiple_sequences(sequences: Dict[str, str],
             results[name] = analyze_sequence(seq, name)
         return results
     
-    # Parallel processing
+    # Parallel processing: submit the longest sequences first so a large
+    # chromosome is not left running alone after the small contigs finish
     results = {}
+    order = sorted(sequences, key=lambda name: len(sequences[name]), reverse=True)
     with ProcessPoolExecutor(max_workers=min(len(sequences), mp.cpu_count())) as executor:
         future_to_name = {
-            executor.submit(analyze_sequence, seq, name): name 
-            for name, seq in sequences.items()
+            executor.submit(analyze_sequence, sequences[name], name): name 
+            for name in order
         }
         
         for future in as_completed(future_to_name):
@@ -1598,7 +1936,7 @@ def analyze_multiple_sequences(sequences: Dict[str, str],
                 print(f"Error processing {name}: {e}")
                 results[name] = []
     
-    return results
+    return {name: results[name] for name in sequences}
 
 def export_results_to_dataframe(motifs: List[Dict[str, Any]]) -> pd.DataFrame:
     """Convert motif results to pandas DataFrame with comprehensive fields"""
@@ -28,14 +28,18 @@ COORDINATE SYSTEM:
              Converted to range(0, 20) for Python indexing
 
 ARCHITECTURE:
-    - Chunks genome into overlapping segments (1000nt overlap)
-    - Parallel processing using multiprocessing.Pool
-    - Deduplication of overlapping matches
+    - Chunks genome into overlapping segments (overlap = largest detector footprint)
+    - Genome copied once into multiprocessing.shared_memory; tasks carry
+      only (start, end) offsets
+    - multiprocessing.Pool initializer loads the serialized Hyperscan
+      database (or the fallback detector) once per worker
+    - Workers return NumPy (start, end, id) structured arrays, merged with
+      a vectorized np.unique deduplication
     - No scoring logic (delegated to existing ScoringEngine)
 
 PERFORMANCE:
     - Chunk size: 50,000 bp (configurable)
-    - Overlap: 1,000 bp (handles motifs at boundaries)
+    - Overlap: max MAX_MOTIF_FOOTPRINT over detectors (4,500 bp with R-loops)
     - Worker processes: CPU count
     - Progress reporting: Per-chunk completion
 
@@ -47,9 +51,14 @@ USAGE:
 """
 
 import multiprocessing as mp
-from typing import List, Dict, Tuple, Optional, Any, Callable
+from multiprocessing import shared_memory
+from typing import List, Dict, Tuple, Optional, Any, Callable, Union
 import numpy as np
-from collections import defaultdict
+import warnings
+import zlib
+
+from detectors import DETECTOR_CLASSES
+from genome_chunking import max_motif_footprint
 
 # Try to import Hyperscan (optional dependency)
 try:
@@ -61,82 +70,139 @@ except ImportError:
 
 # Configuration constants
 CHUNK_SIZE = 50000  # 50kb chunks for memory efficiency
-OVERLAP_SIZE = 1000  # 1kb overlap to catch motifs at chunk boundaries
+# Overlap must hold the longest motif any detector can report (R-loop REZ
+# search reaches 4 kb past the RIZ), so boundary motifs are seen whole
+OVERLAP_SIZE = max_motif_footprint(DETECTOR_CLASSES.values())
 MIN_MOTIF_LENGTH = 4  # Minimum motif length to consider
 
+# Raw motif record returned by workers (0-based half-open coordinates)
+# | Field | Type  | Description                                        |
+# |-------|-------|----------------------------------------------------|
+# | start | int64 | Global 0-based start                               |
+# | end   | int64 | Global 0-based exclusive end                       |
+# | id    | int64 | Hyperscan pattern id, or fallback_pattern_id()     |
+RAW_MOTIF_DTYPE = np.dtype([('start', np.int64), ('end', np.int64), ('id', np.int64)])
+
+
+# =============================================================================
+# WORKER STATE
+# =============================================================================
+# The pool initializer attaches each worker to the shared-memory genome and
+# deserializes the Hyperscan database (or builds the fallback detector) once;
+# tasks then carry only (start, end) offsets into the shared genome.
+_WORKER_SHM = None
+_WORKER_GENOME: Optional[np.ndarray] = None
+_WORKER_HS_DB = None
+_WORKER_DETECTOR = None
+
+
+def serialize_hs_db(hs_db: Any) -> Optional[bytes]:
+    """Serialize a compiled Hyperscan database for shipping to workers."""
+    if hs_db is None or not HYPERSCAN_AVAILABLE:
+        return None
+    if isinstance(hs_db, (bytes, bytearray)):
+        return bytes(hs_db)
+    return hyperscan.dumpb(hs_db)
+
+
+def load_hs_db(db_bytes: Optional[bytes]) -> Any:
+    """Deserialize a Hyperscan block-mode database and give it its own scratch."""
+    if db_bytes is None or not HYPERSCAN_AVAILABLE:
+        return None
+    hs_db = hyperscan.loadb(db_bytes, hyperscan.HS_MODE_BLOCK)
+    hs_db.scratch = hyperscan.Scratch(hs_db)
+    return hs_db
 
-def hs_worker_task(args: Tuple[int, np.ndarray, Any]) -> List[Tuple[int, int, int]]:
+
+def fallback_pattern_id(motif_class: str, subclass: str) -> int:
+    """
+    Stable pattern id for a detector motif (same value in every process).
+    
+    Built-in hash() of str is salted per interpreter, so ids from different
+    workers (or runs) would not agree; CRC32 of 'Class_Subclass' does.
+    """
+    return zlib.crc32(f"{motif_class}_{subclass}".encode('utf-8'))
+
+
+def _init_worker(shm_name: str, genome_length: int, db_bytes: Optional[bytes]) -> None:
+    """Pool initializer: attach the shared genome and load the scanner once."""
+    global _WORKER_SHM, _WORKER_GENOME, _WORKER_HS_DB, _WORKER_DETECTOR
+    _WORKER_SHM = shared_memory.SharedMemory(name=shm_name)
+    _WORKER_GENOME = np.ndarray((genome_length,), dtype=np.uint8, buffer=_WORKER_SHM.buf)
+    _WORKER_HS_DB = load_hs_db(db_bytes)
+    if _WORKER_HS_DB is None:
+        # Fallback: regex-based detection from the existing scanner
+        from scanner import ModularMotifDetector
+        _WORKER_DETECTOR = ModularMotifDetector()
+
+
+def hs_worker_task(args: Tuple[int, int]) -> np.ndarray:
     """
     Worker function for parallel Hyperscan scanning.
     
     This is the core worker that:
-    1. Takes a chunk of the genome and its global offset
-    2. Runs Hyperscan database in Block Mode
+    1. Reads its chunk from the shared-memory genome by offset
+    2. Runs the worker's Hyperscan database in Block Mode
     3. Converts local coordinates to global coordinates
-    4. Returns raw (start, end, pattern_id) tuples
+    4. Returns raw (start, end, id) records
     
     Args:
-        args: Tuple of (offset, genome_chunk, hs_database)
-            - offset: Global starting position of this chunk
-            - genome_chunk: NumPy byte array of sequence chunk
-            - hs_database: Compiled Hyperscan database (or None for fallback)
+        args: Tuple of (chunk_start, chunk_end) global offsets
     
     Returns:
-        List of (global_start, global_end, pattern_id) tuples
+        RAW_MOTIF_DTYPE structured array of global motif locations
     """
-    offset, genome_chunk, hs_db = args
+    offset, chunk_end = args
     local_results = []
     
-    # Convert numpy array to bytes for Hyperscan
-    chunk_bytes = genome_chunk.tobytes()
+    # Copy the chunk out of shared memory for Hyperscan
+    chunk_bytes = _WORKER_GENOME[offset:chunk_end].tobytes()
     
-    if HYPERSCAN_AVAILABLE and hs_db is not None:
+    if _WORKER_HS_DB is not None:
         # Hyperscan match handler (callback function)
         def match_handler(id, start, end, flags, context):
             """Callback for Hyperscan matches"""
             # Convert local match coordinates to global coordinates
-            global_start = offset + start
-            global_end = offset + end
-            local_results.append((global_start, global_end, id))
+            local_results.append((offset + start, offset + end, id))
             return 0  # Continue scanning
         
         try:
             # Execute Hyperscan in Block Mode
-            hs_db.scan(chunk_bytes, match_handler)
+            _WORKER_HS_DB.scan(chunk_bytes, match_event_handler=match_handler)
         except Exception as e:
             # If Hyperscan fails, log but don't crash
             print(f"Warning: Hyperscan scan failed at offset {offset}: {e}")
-            return local_results
     else:
-        # Fallback: Use regex-based detection from existing scanner
-        # This maintains compatibility when Hyperscan is not available
         try:
-            # Use absolute import to avoid sys.path manipulation
-            from scanner import analyze_sequence
-            
-            # Decode chunk to string
             chunk_str = chunk_bytes.decode('utf-8', errors='ignore')
+            chunk_motifs = _WORKER_DETECTOR.analyze_sequence(chunk_str, f"chunk_{offset}")
             
-            # Run detection on chunk
-            chunk_motifs = analyze_sequence(chunk_str, f"chunk_{offset}")
-            
-            # Convert to (start, end, pattern_id) format
             # COORDINATE SYSTEM NOTE:
             # - Input motifs use 1-based INCLUSIVE coordinates (Start=1, End=20 = 20 bases)
-            # - We convert to 0-based half-open for internal tuple format
-            # - Conversion: Start-1 (to 0-based), End (already exclusive in half-open)
-            for i, motif in enumerate(chunk_motifs):
-                # Start: 1-based inclusive → 0-based (subtract 1)
-                # End: 1-based inclusive → 0-based exclusive (no change, becomes half-open)
-                global_start = offset + motif.get('Start', 0) - 1
-                global_end = offset + motif.get('End', 0)  # Becomes 0-based half-open
-                pattern_id = hash(f"{motif.get('Class', '')}_{motif.get('Subclass', '')}")
-                local_results.append((global_start, global_end, pattern_id))
+            # - Start-1 gives the 0-based start; End is already the half-open end
+            for motif in chunk_motifs:
+                local_results.append((
+                    offset + motif.get('Start', 0) - 1,
+                    offset + motif.get('End', 0),
+                    fallback_pattern_id(motif.get('Class', ''), motif.get('Subclass', ''))
+                ))
         except Exception as e:
             # Silently skip if detection fails - worker shouldn't crash the whole job
             pass
     
-    return local_results
+    return np.array(local_results, dtype=RAW_MOTIF_DTYPE)
+
+
+def deduplicate_raw_motifs(results_list: List[np.ndarray]) -> np.ndarray:
+    """
+    Merge worker arrays and drop motifs reported by two overlapping chunks.
+    
+    Duplicates have identical (start, end, id) records; np.unique on the
+    structured array removes them and sorts by start, end, then id.
+    """
+    if not results_list:
+        return np.empty(0, dtype=RAW_MOTIF_DTYPE)
+    return np.unique(np.concatenate(results_list))
 
 
 class ParallelScanner:
@@ -152,6 +218,7 @@ class ParallelScanner:
     Attributes:
         genome: Full genome sequence as NumPy byte array
         hs_db: Compiled Hyperscan database (optional)
+        hs_db_bytes: Serialized database handed to the pool initializer
         chunk_size: Size of each chunk in base pairs
         overlap_size: Overlap between chunks in base pairs
         num_workers: Number of parallel worker processes
@@ -159,25 +226,37 @@ class ParallelScanner:
     
     def __init__(self, 
                  genome: str, 
-                 hs_db: Optional[Any] = None,
+                 hs_db: Optional[Union[Any, bytes]] = None,
                  chunk_size: int = CHUNK_SIZE,
-                 overlap_size: int = OVERLAP_SIZE,
+                 overlap_size: Optional[int] = None,
                  num_workers: Optional[int] = None):
         """
         Initialize the parallel scanner.
         
         Args:
             genome: DNA sequence string (will be converted to NumPy array)
-            hs_db: Compiled Hyperscan database (optional, uses fallback if None)
+            hs_db: Compiled (or hyperscan.dumpb-serialized) Hyperscan database
+                   (optional, uses fallback if None)
             chunk_size: Size of each chunk (default: 50kb)
-            overlap_size: Overlap between chunks (default: 1kb)
+            overlap_size: Overlap between chunks (default: the largest detector
+                footprint, OVERLAP_SIZE, clamped to chunk_size // 2 with a
+                warning when chunks are too small to hold it; motifs longer
+                than a clamped overlap may then be missed at chunk boundaries)
             num_workers: Number of worker processes (default: CPU count)
         """
         # Convert genome to NumPy byte array for efficient chunking
         self.genome_array = np.frombuffer(genome.encode('utf-8'), dtype=np.uint8)
         self.genome_length = len(self.genome_array)
         self.hs_db = hs_db
+        # Database objects cannot be pickled; workers load this once instead
+        self.hs_db_bytes = serialize_hs_db(hs_db)
         self.chunk_size = chunk_size
+        if overlap_size is None:
+            overlap_size = min(OVERLAP_SIZE, chunk_size // 2)
+            if overlap_size < OVERLAP_SIZE:
+                warnings.warn(f"chunk_size {chunk_size} cannot hold the {OVERLAP_SIZE} bp detector "
+                              f"footprint; using a {overlap_size} bp overlap, so long motifs "
+                              f"spanning chunk boundaries may be missed")
         self.overlap_size = overlap_size
         self.num_workers = num_workers or mp.cpu_count()
         
@@ -193,32 +272,62 @@ class ParallelScanner:
         num_chunks = (self.genome_length + effective_chunk_size - 1) // effective_chunk_size
         return max(1, num_chunks)
     
-    def _create_tasks(self) -> List[Tuple[int, np.ndarray, Any]]:
+    def _create_tasks(self) -> List[Tuple[int, int]]:
         """
         Create task list for parallel processing.
         
-        Each task is a tuple of (offset, chunk_array, hs_db).
-        Chunks overlap by OVERLAP_SIZE to ensure motifs at boundaries are found.
+        Each task is a (chunk_start, chunk_end) pair into the shared genome.
+        Chunks overlap by overlap_size to ensure motifs at boundaries are found.
         
         Returns:
-            List of (offset, genome_chunk, hs_db) tuples for workers
+            List of (chunk_start, chunk_end) offsets for workers
         """
         tasks = []
         effective_chunk_size = self.chunk_size - self.overlap_size
         
         for i in range(self.num_chunks):
-            # Calculate chunk boundaries
+            # Chunk includes overlap with next chunk
             chunk_start = i * effective_chunk_size
             chunk_end = min(chunk_start + self.chunk_size, self.genome_length)
-            
-            # Extract chunk (includes overlap with next chunk)
-            chunk_array = self.genome_array[chunk_start:chunk_end]
-            
-            # Create task tuple
-            tasks.append((chunk_start, chunk_array, self.hs_db))
+            tasks.append((chunk_start, chunk_end))
         
         return tasks
     
+    def run_scan_array(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> np.ndarray:
+        """
+        Execute parallel scanning and return a RAW_MOTIF_DTYPE array.
+        
+        The genome is copied once into shared memory; every worker attaches
+        to it in the pool initializer, so tasks only carry offsets.
+        
+        Args:
+            progress_callback: Optional callback function(current, total) for progress
+        
+        Returns:
+            Deduplicated structured array sorted by (start, end, id)
+        """
+        tasks = self._create_tasks()
+        all_raw_results = []
+        
+        shm = shared_memory.SharedMemory(create=True, size=max(1, self.genome_length))
+        try:
+            shm.buf[:self.genome_length] = self.genome_array.tobytes()
+            # Use multiprocessing.Pool for parallel execution
+            with mp.Pool(processes=self.num_workers, initializer=_init_worker,
+                         initargs=(shm.name, self.genome_length, self.hs_db_bytes)) as pool:
+                for i, result in enumerate(pool.imap(hs_worker_task, tasks)):
+                    all_raw_results.append(result)
+                    
+                    # Report progress if callback provided
+                    if progress_callback:
+                        progress_callback(i + 1, len(tasks))
+        finally:
+            shm.close()
+            shm.unlink()
+        
+        # Deduplicate results from overlapping regions
+        return self._deduplicate(all_raw_results)
+    
     def run_scan(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> List[Tuple[int, int, int]]:
         """
         Execute parallel scanning across all chunks.
@@ -236,50 +345,19 @@ class ParallelScanner:
         Returns:
             List of unique (start, end, pattern_id) tuples
         """
-        tasks = self._create_tasks()
-        all_raw_results = []
-        
-        # Use multiprocessing.Pool for parallel execution
-        with mp.Pool(processes=self.num_workers) as pool:
-            # Process tasks and collect results
-            for i, result in enumerate(pool.imap(hs_worker_task, tasks)):
-                all_raw_results.append(result)
-                
-                # Report progress if callback provided
-                if progress_callback:
-                    progress_callback(i + 1, len(tasks))
-        
-        # Deduplicate results from overlapping regions
-        unique_motifs = self._deduplicate(all_raw_results)
-        
-        return unique_motifs
+        return self.run_scan_array(progress_callback=progress_callback).tolist()
     
-    def _deduplicate(self, results_list: List[List[Tuple[int, int, int]]]) -> List[Tuple[int, int, int]]:
+    def _deduplicate(self, results_list: List[np.ndarray]) -> np.ndarray:
         """
         Deduplicate motifs found in overlapping regions.
         
-        Uses a set-based approach where duplicates are identified by 
-        identical (start, end, pattern_id) tuples.
-        
         Args:
-            results_list: List of result lists from each worker
+            results_list: RAW_MOTIF_DTYPE arrays from each worker
         
         Returns:
-            Deduplicated list of (start, end, pattern_id) tuples
+            Deduplicated array sorted by (start, end, id)
         """
-        # Flatten the list of lists
-        all_motifs = []
-        for result_chunk in results_list:
-            all_motifs.extend(result_chunk)
-        
-        # Use set for deduplication (handles exact duplicates)
-        # For motifs in overlap regions, they'll have identical coordinates
-        unique_motifs_set = set(all_motifs)
-        
-        # Convert back to sorted list
-        unique_motifs = sorted(list(unique_motifs_set), key=lambda x: (x[0], x[1]))
-        
-        return unique_motifs
+        return deduplicate_raw_motifs(results_list)
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -295,7 +373,7 @@ class ParallelScanner:
             'num_chunks': self.num_chunks,
             'num_workers': self.num_workers,
             'hyperscan_available': HYPERSCAN_AVAILABLE,
-            'using_hyperscan': HYPERSCAN_AVAILABLE and self.hs_db is not None
+            'using_hyperscan': self.hs_db_bytes is not None
         }
 
 
@@ -0,0 +1,746 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                      SHARED SEQUENCE CONTEXT MODULE                           ║
+║          Encode Once, Reuse Everywhere - Per-Sequence Precomputation         ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+MODULE: sequence_context.py
+AUTHOR: Dr. Venkata Rajesh Yella
+VERSION: 2024.2 - Shared Context
+LICENSE: MIT
+
+DESCRIPTION:
+    A SequenceContext is built once per input sequence by NonBScanner and handed
+    to every detector. It holds the normalized (upper-case) sequence and lazily
+    computed NumPy views of it, so that detectors no longer normalize and rescan
+    the same bases independently.
+
+CONTENTS (all lazy, computed on first access):
+    ┌──────────────────────┬──────────────────────────────────────────────────┐
+    │ Attribute / Method   │ Description                                      │
+    ├──────────────────────┼──────────────────────────────────────────────────┤
+    │ sequence             │ Upper-case, whitespace-stripped sequence         │
+    │ codes                │ uint8 encoding A=0, C=1, G=2, T=3, other=4       │
+    │ prefix_counts(base)  │ int64 prefix sums for A, C, G, T or N            │
+    │ count(bases, s, e)   │ O(1) base counts over [s, e)                     │
+    │ gc_content(s, e)     │ O(1) GC percentage over [s, e)                   │
+    │ gc_contents(ss, es)  │ GC percentage of many regions at once            │
+    │ count_kmer(kmer,...) │ Occurrences of a short k-mer in many regions     │
+    │ alternating_runs(..) │ Alternating-dinucleotide runs in many regions    │
+    │ region_features(..)  │ GC%, dinucleotide and alternation features       │
+    │ g_runs / c_runs      │ (starts, ends) of maximal G / C runs             │
+    │ purine_runs          │ (starts, ends) of maximal A/G runs               │
+    │ pyrimidine_runs      │ (starts, ends) of maximal C/T runs               │
+    │ n_gaps               │ (starts, ends) of maximal non-ACGT runs          │
+    │ kmer_codes(k, how)   │ Base-4 code of every k-mer (forward, reversed or │
+    │                      │ reverse-complemented), -1 where not ACGT         │
+    │ reverse_complement   │ Reverse complement string                        │
+    │ inverted_stems(..)   │ All maximal perfect stem-loops (inverted repeats)│
+    │ g4hunter_peaks(..)   │ Peak |G - C| window of many regions (G4Hunter)   │
+    └──────────────────────┴──────────────────────────────────────────────────┘
+
+    KmerScoreTable turns a fixed-length k-mer → value table (e.g. the Z-DNA
+    and A-philic 10-mer tables) into a dense array indexed by k-mer code, so
+    a whole sequence is scored with kmer_codes(k) and one array lookup.
+
+    LCEIndex answers batched longest-common-extension queries; it verifies
+    direct repeats and extends the stems of inverted_stems().
+
+    RangeMaxTable is a sparse table for batched range-maximum queries;
+    g4hunter_peaks() uses it over the sequence-wide G4Hunter window sums.
+
+    Coordinates are 0-based half-open, matching Python slicing.
+
+USAGE:
+    from sequence_context import SequenceContext
+
+    ctx = SequenceContext(sequence)
+    motifs = detector.detect_motifs(sequence, "chr1", context=ctx)
+
+    table = KmerScoreTable({"CGCGCGCGCG": 63.0, ...})
+    positions, entries = table.scan(ctx)
+    regions = table.score_regions(len(ctx), positions, entries)
+"""
+
+from functools import cached_property
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+# Base → code lookup table (A=0, C=1, G=2, T=3, anything else=4)
+BASE_CODES = {'A': 0, 'C': 1, 'G': 2, 'T': 3, 'N': 4}
+_ENCODE_LUT = np.full(256, 4, dtype=np.uint8)
+for _base, _code in (('A', 0), ('C', 1), ('G', 2), ('T', 3)):
+    _ENCODE_LUT[ord(_base)] = _code
+    _ENCODE_LUT[ord(_base.lower())] = _code
+
+_REVCOMP_TRANS = str.maketrans("ACGTacgt", "TGCAtgca")
+
+
+def encode_sequence(sequence: str) -> np.ndarray:
+    """Encode a DNA string as a uint8 array (A=0, C=1, G=2, T=3, other=4)."""
+    raw = np.frombuffer(sequence.encode('ascii', errors='replace'), dtype=np.uint8)
+    return _ENCODE_LUT[raw]
+
+
+def normalize_sequence(sequence: str) -> str:
+    """
+    Upper-case, whitespace-stripped form of a sequence. SequenceContext and
+    every detector scan this exact string, so context offsets are motif
+    offsets.
+    """
+    return sequence.upper().strip()
+
+
+def find_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate maximal runs of True in a boolean array.
+
+    Returns:
+        (starts, ends) int64 arrays, 0-based half-open
+    """
+    if mask.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return edges[0::2].astype(np.int64), edges[1::2].astype(np.int64)
+
+
+class SequenceContext:
+    """
+    Per-sequence precomputation shared by all detectors.
+
+    # Context Fields:
+    # | Field              | Type        | Description                        |
+    # |--------------------|-------------|------------------------------------|
+    # | sequence           | str         | Normalized upper-case sequence     |
+    # | length             | int         | Sequence length in bp              |
+    # | codes              | np.ndarray  | uint8 base codes (0-4)             |
+    # | g_runs / c_runs    | tuple       | (starts, ends) of G / C runs       |
+    # | purine_runs        | tuple       | (starts, ends) of R runs           |
+    # | pyrimidine_runs    | tuple       | (starts, ends) of Y runs           |
+    # | n_gaps             | tuple       | (starts, ends) of non-ACGT runs    |
+    # | reverse_complement | str         | Lazily built reverse complement    |
+
+    Prefix sums are created per base on first use, so a detector that only
+    needs G counts never pays for A/C/T arrays.
+    """
+
+    def __init__(self, sequence: str, normalized: bool = False):
+        """
+        Args:
+            sequence: DNA sequence
+            normalized: Set when the caller has already applied
+                normalize_sequence(), to skip a redundant copy
+        """
+        self.sequence = sequence if normalized else normalize_sequence(sequence)
+        self.length = len(self.sequence)
+        self._prefix_cache: Dict[str, np.ndarray] = {}
+        self._kmer_cache: Dict[Tuple[int, str], np.ndarray] = {}
+        self._kmer_positions_cache: Dict[str, np.ndarray] = {}
+        self._g4hunter_tables: Dict[int, 'RangeMaxTable'] = {}
+
+    @classmethod
+    def ensure(cls, sequence: str, context: 'SequenceContext' = None) -> 'SequenceContext':
+        """Return `context` when given, otherwise build one for `sequence`."""
+        if context is not None:
+            return context
+        return cls(sequence)
+
+    def __len__(self) -> int:
+        return self.length
+
+    # -------------------------
+    # Encodings
+    # -------------------------
+    @cached_property
+    def codes(self) -> np.ndarray:
+        """uint8 base codes: A=0, C=1, G=2, T=3, anything else=4."""
+        return encode_sequence(self.sequence)
+
+    @cached_property
+    def reverse_complement(self) -> str:
+        """Reverse complement of the normalized sequence."""
+        return self.sequence.translate(_REVCOMP_TRANS)[::-1]
+
+    def kmer_codes(self, k: int, how: str = 'forward') -> np.ndarray:
+        """
+        Base-4 integer code of the k-mer starting at each position (length
+        len(sequence) - k + 1), or -1 where the k-mer contains a non-ACGT base.
+
+        Args:
+            k: k-mer length (at most 31)
+            how: 'forward' codes the k-mer itself, 'reverse' its reversal and
+                'revcomp' its reverse complement, so equal codes across two
+                arrays mean equal, mirrored or inverted k-mers
+        """
+        key = (k, how)
+        cached = self._kmer_cache.get(key)
+        if cached is not None:
+            return cached
+        if how not in ('forward', 'reverse', 'revcomp'):
+            raise ValueError(f"Unknown k-mer orientation '{how}'")
+
+        m = self.length - k + 1
+        if m <= 0:
+            cached = np.zeros(0, dtype=np.int64)
+        elif how == 'revcomp':
+            cached = self.kmer_codes(k, 'reverse')
+            cached = np.where(cached >= 0, (4 ** k - 1) - cached, -1)
+        else:
+            # Shift in two bits per base; 32-bit lanes suffice up to k = 15
+            lane = np.int32 if k <= 15 else np.int64
+            codes = (self.codes & 3).astype(lane)
+            cached = np.zeros(m, dtype=lane)
+            for i in range(k):
+                cached <<= 2
+                cached |= codes[i:i + m] if how == 'forward' else codes[k - 1 - i:k - 1 - i + m]
+            cached = cached.astype(np.int64, copy=False)
+            non_acgt = self.codes == 4
+            if non_acgt.any():
+                invalid = np.zeros(self.length + 1, dtype=np.int64)
+                np.cumsum(non_acgt, out=invalid[1:])
+                cached[(invalid[k:] - invalid[:m]) > 0] = -1
+        self._kmer_cache[key] = cached
+        return cached
+
+    # -------------------------
+    # Prefix sums
+    # -------------------------
+    def prefix_counts(self, base: str) -> np.ndarray:
+        """
+        Prefix-sum array P for one base ('A', 'C', 'G', 'T' or 'N'), with
+        P[i] = occurrences in sequence[:i]. Length is len(sequence) + 1.
+        """
+        cached = self._prefix_cache.get(base)
+        if cached is None:
+            hits = (self.codes == BASE_CODES[base])
+            cached = np.zeros(self.length + 1, dtype=np.int64)
+            np.cumsum(hits, out=cached[1:])
+            self._prefix_cache[base] = cached
+        return cached
+
+    def count(self, bases: str, start: int = 0, end: int = None) -> int:
+        """Count occurrences of any of `bases` in sequence[start:end] in O(1)."""
+        start, end = self._clip(start, end)
+        total = 0
+        for base in bases:
+            prefix = self.prefix_counts(base)
+            total += int(prefix[end] - prefix[start])
+        return total
+
+    def gc_content(self, start: int = 0, end: int = None) -> float:
+        """GC percentage of sequence[start:end] (0 for empty ranges)."""
+        start, end = self._clip(start, end)
+        length = end - start
+        if length <= 0:
+            return 0
+        return self.count('GC', start, end) / length * 100
+
+    def at_content(self, start: int = 0, end: int = None) -> float:
+        """AT percentage of sequence[start:end] (0 for empty ranges)."""
+        start, end = self._clip(start, end)
+        length = end - start
+        if length <= 0:
+            return 0
+        return self.count('AT', start, end) / length * 100
+
+    # -------------------------
+    # Vectorized region features
+    # -------------------------
+    def kmer_positions(self, kmer: str) -> np.ndarray:
+        """
+        Sorted start positions of every (overlapping) occurrence of one exact
+        k-mer. Counting occurrences in a region is then two binary searches,
+        without a full-length prefix array per k-mer.
+        """
+        cached = self._kmer_positions_cache.get(kmer)
+        if cached is None:
+            code = 0
+            for base in kmer:
+                code = (code << 2) | BASE_CODES[base]
+            cached = np.flatnonzero(self.kmer_codes(len(kmer)) == code)
+            self._kmer_positions_cache[kmer] = cached
+        return cached
+
+    def count_kmer(self, kmer: str, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Occurrences of `kmer` lying wholly inside each [start, end) region.
+
+        For a k-mer with no self-overlap (e.g. 'CG', 'AT') this equals
+        sequence[start:end].count(kmer).
+        """
+        starts, ends = self._clip_many(starts, ends)
+        positions = self.kmer_positions(kmer)
+        last = np.maximum(ends - len(kmer) + 1, starts)
+        return np.searchsorted(positions, last) - np.searchsorted(positions, starts)
+
+    def gc_contents(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """GC percentage of each [start, end) region (0 for empty regions)."""
+        starts, ends = self._clip_many(starts, ends)
+        gc = (self.prefix_counts('G')[ends] - self.prefix_counts('G')[starts]
+              + self.prefix_counts('C')[ends] - self.prefix_counts('C')[starts])
+        lengths = ends - starts
+        return np.divide(gc, lengths, out=np.zeros(lengths.size, dtype=np.float64),
+                         where=lengths > 0) * 100
+
+    def alternating_runs(self, unit: str, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Number of (unit){2,} runs in each [start, end) region, as counted by
+        len(re.findall(f'(?:{unit}){{2,}}', sequence[start:end])).
+
+        `unit` must be a dinucleotide of two different bases (CG, GC, AT,
+        TA, ...). Every run then starts at a unit*2 occurrence not preceded
+        by another unit, so runs = occurrences of unit*2 - occurrences of
+        unit*3, both read from the kmer_positions() tables.
+        """
+        if len(unit) != 2 or unit[0] == unit[1]:
+            raise ValueError(f"alternating_runs needs a dinucleotide of two different bases, got '{unit}'")
+        return self.count_kmer(unit * 2, starts, ends) - self.count_kmer(unit * 3, starts, ends)
+
+    def region_features(self, starts: np.ndarray, ends: np.ndarray) -> Dict[str, list]:
+        """
+        Composition features of many [start, end) regions in one pass, as
+        Python lists aligned with `starts` (ready for motif dictionaries).
+
+        # Region Features:
+        # | Key              | Type  | Description                          |
+        # |------------------|-------|--------------------------------------|
+        # | gc_content       | float | GC percentage                        |
+        # | cg_dinucleotides | int   | CG + GC dinucleotide count           |
+        # | at_dinucleotides | int   | AT + TA dinucleotide count           |
+        # | alternating_cg   | int   | (CG){2,} + (GC){2,} runs             |
+        # | alternating_at   | int   | (AT){2,} + (TA){2,} runs             |
+        """
+        return {
+            'gc_content': self.gc_contents(starts, ends).tolist(),
+            'cg_dinucleotides': (self.count_kmer('CG', starts, ends)
+                                 + self.count_kmer('GC', starts, ends)).tolist(),
+            'at_dinucleotides': (self.count_kmer('AT', starts, ends)
+                                 + self.count_kmer('TA', starts, ends)).tolist(),
+            'alternating_cg': (self.alternating_runs('CG', starts, ends)
+                               + self.alternating_runs('GC', starts, ends)).tolist(),
+            'alternating_at': (self.alternating_runs('AT', starts, ends)
+                               + self.alternating_runs('TA', starts, ends)).tolist(),
+        }
+
+    # -------------------------
+    # Inverted repeats
+    # -------------------------
+    @cached_property
+    def stem_lce(self) -> 'LCEIndex':
+        """
+        LCE index over codes of seq + '$' + revcomp(seq), with non-ACGT bases
+        coded differently on each side so they never pair.
+        """
+        codes = self.codes
+        revcomp = np.where(codes < 4, 3 - codes, 5).astype(np.uint8)[::-1]
+        return LCEIndex(np.concatenate((codes, np.array([6], dtype=np.uint8), revcomp)))
+
+    def inverted_stems(self, min_arm: int, max_loop: int,
+                       max_mismatches: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Every maximal inverted repeat with arm >= min_arm, loop <= max_loop
+        and at most max_mismatches unpaired positions in the arm, as
+        (left_starts, arms, loops, mismatches) sorted by left start and
+        loop. The right arm starts at left_start + arm + loop.
+
+        A stem is fixed by its loop [p, p + L): the arm pairs seq[p-1-s]
+        with seq[p+L+s], i.e. runs along one diagonal of seq against its
+        reverse complement. For each loop length, every loop start is
+        tested at once on its innermost pairs:
+          - perfect stems compare forward and reverse-complement k-mer codes
+            (k = min(min_arm, MAX_DENSE_K));
+          - with mismatches, a sliding sum counts the unpaired positions
+            among the innermost min_arm pairs, and the innermost pair itself
+            must pair.
+        Loops whose innermost bases also pair are skipped, as that stem
+        continues with a loop two shorter. Survivors are extended by
+        _extend_stems(). Work is O(n * max_loop) vector operations (times
+        min_arm with mismatches), with no sampling.
+        """
+        n = self.length
+        k = min(min_arm, MAX_DENSE_K) if max_mismatches == 0 else min_arm
+        empty = np.zeros(0, dtype=np.int64)
+        if k <= 0 or n < 2 * k:
+            return empty, empty, empty, empty
+        codes = self.codes.astype(np.int16)
+        if max_mismatches == 0:
+            forward = self.kmer_codes(k)
+            revcomp = self.kmer_codes(k, 'revcomp')
+
+        found = []
+        for loop in range(max_loop + 1):
+            m = n - 2 * k - loop + 1
+            if m <= 0:
+                break
+            # seq[x:x+k] against seq[x+k+loop:x+2k+loop], loop start p = x + k
+            if max_mismatches == 0:
+                seeded = (forward[:m] == revcomp[k + loop:k + loop + m]) & (forward[:m] >= 0)
+            else:
+                paired = np.zeros(m, dtype=np.int16)
+                for s in range(k):
+                    paired += (codes[k - 1 - s:k - 1 - s + m] + codes[k + loop + s:k + loop + s + m]) == 3
+                seeded = (paired >= k - max_mismatches) & \
+                    ((codes[k - 1:k - 1 + m] + codes[k + loop:k + loop + m]) == 3)
+            if loop >= 2:
+                seeded &= (codes[k:k + m] + codes[k + loop - 1:k + loop - 1 + m]) != 3
+            loop_starts = np.flatnonzero(seeded) + k
+            if not loop_starts.size:
+                continue
+            arms, mismatches = self._extend_stems(loop_starts, loop, max_mismatches)
+            keep = arms >= min_arm
+            found.append((loop_starts[keep] - arms[keep], arms[keep],
+                          np.full(int(keep.sum()), loop, dtype=np.int64), mismatches[keep]))
+        if not found:
+            return empty, empty, empty, empty
+        left_starts, arms, loops, mismatches = (np.concatenate(column) for column in zip(*found))
+        order = np.lexsort((loops, left_starts))
+        return left_starts[order], arms[order], loops[order], mismatches[order]
+
+    def _extend_stems(self, loop_starts: np.ndarray, loop: int,
+                      max_mismatches: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Outward arm length and mismatch count of stems with loops
+        [loop_starts, loop_starts + loop), by kangaroo jumps: one stem_lce
+        query per run of paired bases, stepping over at most max_mismatches
+        unpaired positions. The arm ends at its outermost paired base.
+        """
+        n = self.length
+        right = loop_starts + loop
+        # revcomp(seq)[n - p] pairs with seq[p - 1]; it sits at 2n + 1 - p
+        mirror = 2 * n + 1 - loop_starts
+        offset = np.zeros(loop_starts.size, dtype=np.int64)
+        used = np.zeros(loop_starts.size, dtype=np.int64)
+        arms = np.zeros(loop_starts.size, dtype=np.int64)
+        mismatches = np.zeros(loop_starts.size, dtype=np.int64)
+        alive = np.arange(loop_starts.size)
+        for _ in range(max_mismatches + 1):
+            run = self.stem_lce.query(right[alive] + offset[alive], mirror[alive] + offset[alive], n)
+            offset[alive] += run
+            grew = alive[run > 0]
+            arms[grew] = offset[grew]
+            mismatches[grew] = used[grew]
+            # The next position is unpaired, or one arm has hit a sequence end
+            inside = (right[alive] + offset[alive] < n) & (loop_starts[alive] - offset[alive] > 0)
+            alive = alive[inside & (used[alive] < max_mismatches)]
+            used[alive] += 1
+            offset[alive] += 1
+        return arms, mismatches
+
+    # -------------------------
+    # G4Hunter windows
+    # -------------------------
+    def g4hunter_peaks(self, starts: np.ndarray, ends: np.ndarray,
+                       window_size: int = 25) -> np.ndarray:
+        """
+        g4hunter_peak() of each [start, end) region: the largest |G - C|
+        over the windows of min(window_size, length) bases inside it.
+
+        Window sums come from the G and C prefix sums. For regions longer
+        than one window, the peak is a range-max query on the window sums
+        of the whole sequence, whose table is built once per window size.
+        """
+        starts, ends = self._clip_many(starts, ends)
+        balance = self.prefix_counts('G') - self.prefix_counts('C')
+        peaks = np.abs(balance[ends] - balance[starts])
+        longer = np.flatnonzero(ends - starts > window_size)
+        if longer.size:
+            table = self._g4hunter_tables.get(window_size)
+            if table is None:
+                sums = np.abs(balance[window_size:] - balance[:-window_size])
+                if window_size <= np.iinfo(np.int16).max:
+                    sums = sums.astype(np.int16)
+                table = self._g4hunter_tables[window_size] = RangeMaxTable(sums)
+            peaks[longer] = table.query(starts[longer], ends[longer] - window_size + 1)
+        return peaks
+
+    # -------------------------
+    # Run-length tables
+    # -------------------------
+    @cached_property
+    def g_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Maximal G runs as (starts, ends)."""
+        return find_runs(self.codes == 2)
+
+    @cached_property
+    def c_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Maximal C runs as (starts, ends)."""
+        return find_runs(self.codes == 1)
+
+    @cached_property
+    def purine_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Maximal purine (A/G) runs as (starts, ends)."""
+        codes = self.codes
+        return find_runs((codes == 0) | (codes == 2))
+
+    @cached_property
+    def pyrimidine_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Maximal pyrimidine (C/T) runs as (starts, ends)."""
+        codes = self.codes
+        return find_runs((codes == 1) | (codes == 3))
+
+    @cached_property
+    def n_gaps(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Maximal runs of non-ACGT characters (N and IUPAC codes)."""
+        return find_runs(self.codes == 4)
+
+    def _clip(self, start: int, end: int) -> Tuple[int, int]:
+        if end is None or end > self.length:
+            end = self.length
+        return max(0, start), end
+
+    def _clip_many(self, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        starts = np.clip(np.asarray(starts, dtype=np.int64), 0, self.length)
+        ends = np.clip(np.asarray(ends, dtype=np.int64), starts, self.length)
+        return starts, ends
+
+
+# Largest k for which KmerScoreTable keeps a dense 4**k lookup (64 MB at k=12)
+MAX_DENSE_K = 12
+
+
+class KmerScoreTable:
+    """
+    Dense lookup for a fixed-length k-mer → value table.
+
+    Each k-mer is identified by its base-4 code (2 bits per base, 20 bits
+    for a 10-mer), so the table becomes a flat int32 array of 4**k entry
+    indices (-1 where the k-mer is not in the table). Scanning a sequence is
+    one rolling-code pass plus one fancy-index lookup; no Hyperscan or
+    per-position slicing is needed.
+
+    # Table Fields:
+    # | Field   | Type       | Description                                  |
+    # |---------|------------|----------------------------------------------|
+    # | k       | int        | k-mer length                                 |
+    # | kmers   | List[str]  | Table k-mers in table order                  |
+    # | values  | np.ndarray | float64 value of each table entry            |
+    # | codes   | np.ndarray | int64 base-4 code of each table entry        |
+    # | lookup  | np.ndarray | int32[4**k] entry index, -1 if absent (lazy) |
+
+    Values stay float64 per entry rather than in the dense array, so scores
+    are bit-identical to the source table.
+    """
+
+    def __init__(self, table: Dict[str, float]):
+        kmers = [kmer.upper() for kmer in table]
+        lengths = {len(kmer) for kmer in kmers}
+        if len(lengths) != 1:
+            raise ValueError("KmerScoreTable needs k-mers of a single length")
+        self.k = lengths.pop()
+        if self.k > MAX_DENSE_K:
+            raise ValueError(f"k={self.k} exceeds MAX_DENSE_K={MAX_DENSE_K}")
+        self.kmers: List[str] = kmers
+        self.values = np.array([float(value) for value in table.values()], dtype=np.float64)
+        self.codes = SequenceContext(''.join(kmers), normalized=True).kmer_codes(self.k)[::self.k].copy()
+        if (self.codes < 0).any():
+            raise ValueError("KmerScoreTable k-mers must contain only A, C, G and T")
+
+    @cached_property
+    def lookup(self) -> np.ndarray:
+        """Dense entry index per k-mer code (-1 where absent)."""
+        lookup = np.full(4 ** self.k, -1, dtype=np.int32)
+        lookup[self.codes] = np.arange(len(self.codes), dtype=np.int32)
+        return lookup
+
+    def entries_for(self, kmer_codes: np.ndarray) -> np.ndarray:
+        """Entry index for each code in `kmer_codes` (-1 for absent or invalid)."""
+        entries = self.lookup[np.maximum(kmer_codes, 0)]
+        entries[kmer_codes < 0] = -1
+        return entries
+
+    def scan(self, context: SequenceContext) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All table hits in a sequence.
+
+        Returns:
+            (positions, entries): 0-based start of every matching k-mer in
+            ascending order, and its index into kmers / values
+        """
+        entries = self.entries_for(context.kmer_codes(self.k))
+        positions = np.flatnonzero(entries >= 0)
+        return positions, entries[positions]
+
+    def as_matches(self, positions: np.ndarray, entries: np.ndarray) -> List[Tuple[int, str, float]]:
+        """Hits as (start, kmer, value) tuples, in the order given."""
+        kmers, values = self.kmers, self.values.tolist()
+        return [(start, kmers[entry], values[entry])
+                for start, entry in zip(positions.tolist(), entries.tolist())]
+
+    def merge_hits(self, positions: np.ndarray,
+                   merge_gap: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Merge sorted hit positions into regions of overlapping/adjacent k-mers.
+
+        A new region starts wherever consecutive hits are more than
+        k + merge_gap apart (np.diff on the sorted starts).
+
+        Returns:
+            (starts, ends, first): region bounds, 0-based half-open, and the
+            index of each region's first hit in `positions`
+        """
+        if positions.size == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+        breaks = np.flatnonzero(np.diff(positions) > self.k + merge_gap) + 1
+        first = np.concatenate(([0], breaks)).astype(np.int64)
+        last = np.concatenate((breaks, [positions.size])) - 1
+        return positions[first].astype(np.int64), positions[last].astype(np.int64) + self.k, first
+
+    def contributions(self, length: int, positions: np.ndarray, entries: np.ndarray) -> np.ndarray:
+        """
+        Per-base contribution track: each hit's value spread evenly over its
+        k bases (value / k each), built as a difference array plus cumsum.
+        """
+        share = self.values[entries] / self.k
+        delta = np.bincount(positions, weights=share, minlength=length + 1)
+        delta -= np.bincount(positions + self.k, weights=share, minlength=length + 1)
+        return np.cumsum(delta[:length])
+
+    def score_regions(self, length: int, positions: np.ndarray, entries: np.ndarray,
+                      merge_gap: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Merge hits into regions and score them without per-base Python loops.
+
+        # Region Arrays:
+        # | Key     | Type    | Description                                  |
+        # |---------|---------|----------------------------------------------|
+        # | starts  | int64   | Region start (0-based)                       |
+        # | ends    | int64   | Region end (exclusive)                       |
+        # | first   | int64   | Index of the region's first hit              |
+        # | counts  | int64   | Hits in the region                           |
+        # | sums    | float64 | Sum of per-base contributions (prefix sums)  |
+        # | means   | float64 | Mean value of the region's hits              |
+        """
+        starts, ends, first = self.merge_hits(positions, merge_gap)
+        counts = np.diff(np.concatenate((first, [positions.size])))
+        if starts.size == 0:
+            empty = np.zeros(0, dtype=np.float64)
+            return {'starts': starts, 'ends': ends, 'first': first,
+                    'counts': counts, 'sums': empty, 'means': empty}
+        prefix = np.zeros(length + 1, dtype=np.float64)
+        np.cumsum(self.contributions(length, positions, entries), out=prefix[1:])
+        means = np.add.reduceat(self.values[entries], first) / counts
+        return {'starts': starts, 'ends': ends, 'first': first, 'counts': counts,
+                'sums': prefix[ends] - prefix[starts], 'means': means}
+
+
+class LCEIndex:
+    """
+    Batched longest-common-extension queries on one sequence.
+
+    LCE(i, j) is the length of the longest common prefix of seq[i:] and
+    seq[j:], so seq[i:i+L] == seq[j:j+L] exactly when L <= LCE(i, j). The
+    sequence is encoded once as bytes (or passed in as a code array, e.g. a
+    sequence joined to its reverse complement); query() then extends all
+    pairs together, up to LCE_BLOCK bases per NumPy step, and retires each
+    pair at its first mismatch or cap. Results are exact (no hashing),
+    memory is O(n) and the work per pair is proportional to its answer,
+    not to the number of candidate lengths tried.
+    """
+
+    # Bases compared per pair in the first step; doubles up to LCE_BLOCK,
+    # so the many short answers stay cheap and long ones take few steps
+    LCE_MIN_BLOCK = 4
+    LCE_BLOCK = 32
+
+    def __init__(self, seq: Union[str, np.ndarray]):
+        if isinstance(seq, np.ndarray):
+            self.raw = seq
+        elif seq.isascii():
+            self.raw = np.frombuffer(seq.encode('ascii'), dtype=np.uint8)
+        else:
+            self.raw = np.fromiter(map(ord, seq), dtype=np.uint32, count=len(seq))
+        self.n = len(seq)
+
+    def query(self, left: np.ndarray, right: np.ndarray, cap) -> np.ndarray:
+        """
+        LCE of each (left[p], right[p]) pair, capped at `cap` (scalar or
+        per-pair array) and at the sequence end.
+        """
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+        limit = np.minimum(np.broadcast_to(cap, left.shape),
+                           self.n - np.maximum(left, right))
+        lce = np.zeros(left.size, dtype=np.int64)
+        active = np.flatnonzero(limit > 0)
+        block = self.LCE_MIN_BLOCK
+        offset = 0
+        last = self.n - 1
+        while active.size:
+            span = np.arange(offset, offset + block, dtype=np.int64)
+            inside = span < limit[active, None]
+            l_pos = np.minimum(left[active, None] + span, last)
+            r_pos = np.minimum(right[active, None] + span, last)
+            same = (self.raw[l_pos] == self.raw[r_pos]) & inside
+            full = same.all(axis=1)
+            stopped = active[~full]
+            lce[stopped] = offset + np.argmin(same[~full], axis=1)
+            active = active[full]
+            offset += block
+            block = min(2 * block, self.LCE_BLOCK)
+        return lce
+
+
+# -------------------------
+# G4Hunter windows
+# -------------------------
+def g4hunter_values(sequence: str) -> np.ndarray:
+    """
+    Per-base G4Hunter values as int8: +1 for 'G', -1 for 'C', 0 otherwise
+    (compared as given, like the string-based scorers).
+    """
+    raw = np.frombuffer(sequence.encode('ascii', errors='replace'), dtype=np.uint8)
+    return (raw == ord('G')).astype(np.int8) - (raw == ord('C')).astype(np.int8)
+
+
+def g4hunter_peak(sequence: str, window_size: int = 25) -> int:
+    """
+    Largest |sum of g4hunter_values| over the windows of
+    min(window_size, len(sequence)) bases; 0 for an empty sequence.
+    """
+    width = min(window_size, len(sequence))
+    if width <= 0:
+        return 0
+    prefix = np.zeros(len(sequence) + 1, dtype=np.int64)
+    np.cumsum(g4hunter_values(sequence), out=prefix[1:])
+    return int(np.abs(prefix[width:] - prefix[:-width]).max())
+
+
+class RangeMaxTable:
+    """
+    Sparse table for range-maximum queries over a fixed array.
+
+    Level k holds the maximum of every run of 2**k values, so the maximum
+    of any range is the larger of two overlapping entries of one level.
+    Levels are built on demand up to the longest range queried, so memory
+    is O(n log L) for ranges of at most L values.
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.levels = [np.asarray(values)]
+
+    def _grow(self, length: int):
+        while (1 << len(self.levels)) <= length:
+            span = 1 << (len(self.levels) - 1)
+            below = self.levels[-1]
+            self.levels.append(np.maximum(below[:-span], below[span:]))
+
+    def query(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Maximum of values[start:end] for each non-empty range."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        out = np.zeros(starts.size, dtype=self.levels[0].dtype)
+        if starts.size == 0:
+            return out
+        lengths = ends - starts
+        self._grow(int(lengths.max()))
+        # floor(log2(length)), exact for integers
+        level = np.frexp(lengths.astype(np.float64))[1] - 1
+        for k in np.unique(level).tolist():
+            chosen = np.flatnonzero(level == k)
+            table = self.levels[k]
+            out[chosen] = np.maximum(table[starts[chosen]], table[ends[chosen] - (1 << k)])
+        return out
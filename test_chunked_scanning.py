@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Test suite for boundary-correct chunked scanning (genome_chunking.py).
+
+This test validates:
+1. Chunk planning and coordinate shifting of motif fields
+2. Chunked NonBScanner output equals the unchunked output
+3. Ordinal Pattern_IDs are dense across chunk boundaries
+4. Streaming iter_analyze_file output and BED/TSV/JSONL sinks
+5. Scheduled analyze_multiple_sequences (split, batched, LPT order)
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+
+try:
+    from genome_chunking import plan_chunks, shift_motif, max_motif_footprint, scan_chunked
+    from detectors import DETECTOR_CLASSES
+    from nonbscanner import NonBScanner, iter_analyze_file, analyze_multiple_sequences
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+
+def _test_sequence(length: int = 9000, seed: int = 11) -> str:
+    """Random background with motif-rich blocks scattered through it"""
+    rng = random.Random(seed)
+    blocks = [
+        'GGGTTAGGGTTAGGGTTAGGG',            # G4
+        'CCCTAACCCTAACCCTAACCC',            # i-motif
+        'CGCGCGCGCGCGCGCG',                 # Z-DNA
+        'AAAAAATTTAAAAAATTTAAAAAATTTAAAAAA', # curved
+        'GAAGAAGAAGAAGAAGAA',               # sticky triplex
+        'CAGCAGCAGCAGCAGCAGCAG',            # STR
+        'GGGGAGGGGAGGGGAGGGGTGGGGAGGGG',    # R-loop RIZ
+    ]
+    parts, total = [], 0
+    while total < length:
+        if rng.random() < 0.3:
+            part = rng.choice(blocks)
+        else:
+            part = ''.join(rng.choice('ACGT') for _ in range(rng.randint(20, 120)))
+        parts.append(part)
+        total += len(part)
+    return ''.join(parts)[:length]
+
+
+def _scanner() -> NonBScanner:
+    """Scanner without the (slow) cruciform detector to keep the test quick"""
+    scanner = NonBScanner()
+    scanner.detectors.pop('cruciform', None)
+    return scanner
+
+
+def test_chunk_helpers():
+    """Test chunk planning and motif coordinate shifting"""
+    print("\n" + "="*70)
+    print("TEST 1: Chunk Planning and Coordinate Shifting")
+    print("="*70)
+
+    chunks = plan_chunks(10, 4)
+    print(f"plan_chunks(10, 4) -> {chunks}")
+    assert chunks == [(0, 4), (4, 8), (8, 10)], "Cores must tile the sequence"
+
+    motif = {'ID': 'chr1_RLOOP_5', 'Start': 5, 'End': 40,
+             'RIZ_Start': 5, 'RIZ_End': 20, 'REZ_Start': None, 'REZ_End': None}
+    shift_motif(motif, 1000)
+    print(f"Shifted R-loop motif: {motif}")
+    assert motif['ID'] == 'chr1_RLOOP_1005'
+    assert (motif['Start'], motif['End']) == (1005, 1040)
+    assert (motif['RIZ_Start'], motif['RIZ_End']) == (1005, 1020)
+    assert motif['REZ_Start'] is None
+
+    curved = {'ID': 'chr1_CRV_APR_3', 'Start': 3, 'End': 30, 'Center_Positions': [12, 23.5]}
+    shift_motif(curved, 100)
+    assert curved['Center_Positions'] == [112, 123.5]
+    print("  ✅ IDs and component positions shifted")
+
+    footprint = max_motif_footprint(DETECTOR_CLASSES.values())
+    print(f"Largest detector footprint: {footprint:,} bp")
+    assert footprint >= 2 * 300 + 10, "Footprint must cover direct repeats"
+
+    print("\n✅ TEST 1 PASSED")
+    return True
+
+
+def test_chunked_equals_unchunked():
+    """Chunked output must be identical to the single-pass output"""
+    print("\n" + "="*70)
+    print("TEST 2: Chunked vs Unchunked Output")
+    print("="*70)
+
+    sequence = _test_sequence()
+    scanner = _scanner()
+    full = scanner.analyze_sequence(sequence, "chunk_test")
+    print(f"Unchunked: {len(full)} motifs on {len(sequence):,} bp")
+    assert full, "Test sequence should contain motifs"
+
+    for chunk_size in (3000, 4999):
+        chunked = scanner.analyze_sequence(sequence, "chunk_test", chunk_size=chunk_size)
+        print(f"chunk_size={chunk_size}: {len(chunked)} motifs")
+        assert chunked == full, f"Chunked output differs at chunk_size={chunk_size}"
+    print("  ✅ Outputs identical")
+
+    print("\n✅ TEST 2 PASSED")
+    return True
+
+
+def test_dense_pattern_ids():
+    """Ordinal Pattern_IDs are numbered 1..N per prefix after stitching"""
+    print("\n" + "="*70)
+    print("TEST 3: Dense Ordinal Pattern_IDs")
+    print("="*70)
+
+    sequence = _test_sequence(seed=5)
+    scanner = _scanner()
+    per_detector = scan_chunked(scanner.detectors, sequence, "ids", chunk_size=3000)
+
+    for key, detector in scanner.detectors.items():
+        for prefix in detector.ORDINAL_PATTERN_PREFIXES:
+            numbers = [int(m['Pattern_ID'][len(prefix):]) for m in per_detector[key]
+                       if m['Pattern_ID'].startswith(prefix)]
+            print(f"  {prefix:<12} {len(numbers)} motifs")
+            assert sorted(numbers) == list(range(1, len(numbers) + 1)), \
+                f"{prefix} numbering has gaps: {sorted(numbers)}"
+    print("  ✅ Numbering dense")
+
+    print("\n✅ TEST 3 PASSED")
+    return True
+
+
+def test_streaming_sinks():
+    """Streaming scan yields the batch output and writes it to every sink"""
+    print("\n" + "="*70)
+    print("TEST 4: Streaming Scan and Incremental Sinks")
+    print("="*70)
+
+    sequence = _test_sequence(seed=3)
+    scanner = _scanner()
+    full = scanner.analyze_sequence(sequence, "stream")
+    streamed = [m for batch in scanner.iter_analyze_sequence(sequence, "stream", chunk_size=3000)
+                for m in batch]
+    print(f"Whole sequence: {len(full)} motifs, streamed: {len(streamed)} motifs")
+    assert streamed == full, "Streaming output differs from whole-sequence output"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fasta = os.path.join(tmp, "stream.fa")
+        with open(fasta, 'w') as handle:
+            handle.write(">stream\n" + "\n".join(sequence[i:i + 60] for i in range(0, len(sequence), 60)) + "\n")
+        sinks = [os.path.join(tmp, f"out.{ext}") for ext in ('bed', 'tsv', 'jsonl')]
+        batches = list(iter_analyze_file(fasta, sinks=sinks, chunk_size=len(sequence) + 1))
+
+        total = sum(len(motifs) for _, motifs in batches)
+        print(f"iter_analyze_file: {len(batches)} batches, {total} motifs")
+        assert total > 0, "File scan should find motifs"
+
+        for path in sinks:
+            with open(path) as handle:
+                lines = handle.read().splitlines()
+            header = 0 if path.endswith('.jsonl') else 1
+            print(f"  {os.path.basename(path):<10} {len(lines) - header} rows")
+            assert len(lines) - header == total, f"{path} row count mismatch"
+        with open(sinks[2]) as handle:
+            first = json.loads(handle.readline())
+        assert first['Start'] == batches[0][1][0]['Start']
+    print("  ✅ Sinks written incrementally")
+
+    print("\n✅ TEST 4 PASSED")
+    return True
+
+
+def test_scheduled_batch():
+    """Split and batched multi-sequence scan equals per-sequence analysis"""
+    print("\n" + "="*70)
+    print("TEST 5: Scheduled Multi-Sequence Analysis")
+    print("="*70)
+
+    classes = [key for key in DETECTOR_CLASSES if key != 'cruciform']
+    sequences = {'large': _test_sequence(9000, seed=7)}
+    for i in range(6):
+        sequences[f'contig_{i}'] = _test_sequence(400 + 50 * i, seed=20 + i)
+
+    results, timings = analyze_multiple_sequences(
+        sequences, use_multiprocessing=True, classes=classes,
+        max_workers=2, chunk_size=3000, return_timings=True)
+    for task in timings:
+        print(f"  {task['kind']:<6} {','.join(task['names'])[:30]:<30} "
+              f"est {task['estimated_seconds']:.3f}s  took {task['seconds']:.3f}s")
+
+    assert list(results) == list(sequences), "Results must follow input order"
+    scanner = NonBScanner()
+    for name, sequence in sequences.items():
+        assert results[name] == scanner.analyze_sequence(sequence, name, classes=classes), \
+            f"Scheduled output differs for {name}"
+    kinds = [task['kind'] for task in timings]
+    assert kinds.count('chunk') == 3 and kinds.count('batch') == 1, kinds
+    estimates = [task['estimated_seconds'] for task in timings]
+    assert estimates == sorted(estimates, reverse=True), "Tasks must be costliest first"
+    print("  ✅ Scheduled output identical")
+
+    print("\n✅ TEST 5 PASSED")
+    return True
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        ("Chunk Helpers", test_chunk_helpers),
+        ("Chunked Equals Unchunked", test_chunked_equals_unchunked),
+        ("Dense Pattern IDs", test_dense_pattern_ids),
+        ("Streaming Sinks", test_streaming_sinks),
+        ("Scheduled Batch", test_scheduled_batch),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            results.append((name, test_func()))
+        except Exception as e:
+            print(f"\n❌ TEST FAILED WITH EXCEPTION: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((name, False))
+
+    print("\n" + "="*70)
+    print("TEST SUMMARY")
+    print("="*70)
+    for name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'}: {name}")
+    return all(result for _, result in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test suite for intended changes to detector output.
+
+This test validates:
+1. R-loops are reported at the true RIZ start (Hyperscan SOM_LEFTMOST)
+2. Triplex claims mirror repeats left to right, longest first at a tie
+3. Curved, Z-DNA and A-philic Pattern_IDs are numbered densely
+4. Overlap removal keeps input order, so clusters do not depend on far-away motifs
+"""
+
+import sys
+
+try:
+    from detectors import RLoopDetector, TriplexDetector, ZDNADetector, APhilicDetector, CurvedDNADetector
+    from nonbscanner import NonBScanner
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+
+def _numbers(motifs, prefix):
+    return [int(m['Pattern_ID'][len(prefix):]) for m in motifs
+            if m['Pattern_ID'].startswith(prefix)]
+
+
+def test_rloop_riz_start():
+    """A RIZ after a G-free prefix is reported where it starts"""
+    print("\n" + "="*70)
+    print("TEST 1: R-loop RIZ Start")
+    print("="*70)
+
+    prefix = 'AT' * 150
+    sequence = prefix + 'GGGGAGGGGAGGGGAGGGGTGGGGAGGGG' + 'ATTACAGATTCAAGCT' * 20
+    motifs = RLoopDetector().detect_motifs(sequence, "rloop")
+    print(f"R-loops: {[(m['Start'], m['End']) for m in motifs]}")
+    assert motifs, "The planted RIZ must be reported"
+    # Without SOM_LEFTMOST every Hyperscan match started at position 0
+    assert all(m['Start'] == len(prefix) + 1 for m in motifs), "RIZ must start at the first G"
+    print("  ✅ RIZ start reported")
+
+    print("\n✅ TEST 1 PASSED")
+    return True
+
+
+def test_triplex_left_to_right():
+    """The longest mirror repeat at the leftmost start is claimed first"""
+    print("\n" + "="*70)
+    print("TEST 2: Triplex Claim Order")
+    print("="*70)
+
+    arm = 'GAAGGAGAGAAGGA'
+    sequence = arm + 'TTCTA' + arm[::-1] + 'CAT' + arm + arm[::-1] + 'ATCGTTAGCCATGACTTGCA' * 5
+    motifs = TriplexDetector().detect_motifs(sequence, "triplex")
+    spans = [(m['Start'], m['End']) for m in motifs]
+    print(f"Triplex calls: {spans}")
+    # In k-mer index order the shorter (1, 33) repeat was claimed first
+    assert (1, 64) in spans, "The longest repeat at the first start must be reported"
+    print("  ✅ Leftmost, longest repeat claimed")
+
+    print("\n✅ TEST 2 PASSED")
+    return True
+
+
+def test_dense_pattern_ids():
+    """Filtered regions leave no gaps in ordinal Pattern_IDs"""
+    print("\n" + "="*70)
+    print("TEST 3: Dense Ordinal Pattern_IDs")
+    print("="*70)
+
+    # A lone 'ATCGCGCGCG' scores 50.0 and is filtered (threshold > 50)
+    sequence = 'A' * 20 + 'ATCGCGCGCG' + 'A' * 30 + 'CGCGCGCGCGCGCG' + 'A' * 20
+    ids = [m['Pattern_ID'] for m in ZDNADetector().detect_motifs(sequence, "zdna")]
+    print(f"Z-DNA Pattern_IDs: {ids}")
+    assert ids == ['ZDNA_1'], "The first reported region must be ZDNA_1"
+
+    sequence = ('AAAAAAA' + 'CGCG') * 12 + 'GGGCCCGGGCCC' * 3 + ('TTTTTT' + 'GCCGC') * 6
+    cases = [(APhilicDetector(), ('APHIL_',)), (CurvedDNADetector(), ('CRV_APR_', 'CRV_TRACT_'))]
+    for detector, prefixes in cases:
+        motifs = detector.detect_motifs(sequence, "dense")
+        for prefix in prefixes:
+            numbers = _numbers(motifs, prefix)
+            print(f"  {prefix:<12} {numbers}")
+            assert numbers == list(range(1, len(numbers) + 1)), f"{prefix} numbering has gaps"
+    print("  ✅ Numbering dense")
+
+    print("\n✅ TEST 3 PASSED")
+    return True
+
+
+def _motif(cls, subclass, start, length, score):
+    return {'Class': cls, 'Subclass': subclass, 'Start': start, 'End': start + length,
+            'Length': length, 'Score': score, 'Sequence_Name': 'seq'}
+
+
+def test_overlap_removal_order():
+    """Clusters near a position are the same whatever comes before it"""
+    print("\n" + "="*70)
+    print("TEST 4: Overlap Removal Order")
+    print("="*70)
+
+    scanner = NonBScanner()
+    # Two A motifs tie at Start 5000; which one a cluster window starting at
+    # the second of them counts used to depend on class first-seen order
+    local = [_motif('A', 'a1', 5000, 20, 0.9), _motif('A', 'a2', 5000, 20, 0.1),
+             _motif('B', 'b', 5010, 20, 0.5), _motif('B', 'b', 5100, 20, 0.5)]
+    distant = [_motif('A', 'a2', 100, 20, 0.5)]
+
+    kept = scanner._remove_overlaps(distant + local)
+    assert kept == distant + local, "Non-overlapping motifs must keep their input order"
+
+    def clusters(motifs):
+        found = scanner._detect_clusters(scanner._remove_overlaps(motifs), 'A' * 6000)
+        return [(c['Start'], c['End'], c['Motif_Count'], c['Score']) for c in found]
+
+    print(f"Clusters (local only):   {clusters(local)}")
+    print(f"Clusters (with distant): {clusters(distant + local)}")
+    assert clusters(local) == clusters(distant + local), "A distant motif changed the clusters"
+    print("  ✅ Cluster output independent of distant motifs")
+
+    print("\n✅ TEST 4 PASSED")
+    return True
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        ("R-loop RIZ Start", test_rloop_riz_start),
+        ("Triplex Claim Order", test_triplex_left_to_right),
+        ("Dense Pattern IDs", test_dense_pattern_ids),
+        ("Overlap Removal Order", test_overlap_removal_order),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            results.append((name, test_func()))
+        except Exception as e:
+            print(f"\n❌ TEST FAILED WITH EXCEPTION: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((name, False))
+
+    print("\n" + "="*70)
+    print("TEST SUMMARY")
+    print("="*70)
+    for name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'}: {name}")
+    return all(result for _, result in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
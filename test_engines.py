@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Test suite for the vectorized search engines (sequence_context.py, scanner.py).
+
+Each engine is compared with a plain per-position or regex implementation
+on small random sequences. This test validates:
+1. KmerScoreTable hits against dict lookups
+2. KmerScoreTable contributions and region sums
+3. _str_period_runs period-match runs for every STR unit size
+4. LCEIndex batched longest-common-extension queries
+5. SequenceContext.inverted_stems, with and without mismatches
+6. G4 G-run chain prefilter against a whole-sequence regex scan
+7. RangeMaxTable range maxima
+8. Inverted / mirror repeats with arms longer than 100 bp
+9. R-loop RIZ regex fallback against the Hyperscan maximal spans
+"""
+
+import random
+import re
+import sys
+
+import numpy as np
+
+try:
+    from sequence_context import SequenceContext, KmerScoreTable, LCEIndex, RangeMaxTable
+    from scanner import _str_period_runs, find_inverted_repeats, find_mirror_repeats, K_INVERTED, K_MIRROR
+    import detectors
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+
+PAIRS = {'A': 'T', 'T': 'A', 'C': 'G', 'G': 'C'}
+
+
+def _random_sequence(rng: random.Random, length: int, alphabet: str = 'ACGT') -> str:
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def _revcomp(seq: str) -> str:
+    return ''.join(PAIRS[base] for base in reversed(seq))
+
+
+def test_kmer_score_table():
+    """Dense k-mer lookup finds the same hits as a dict lookup at every position"""
+    print("\n" + "="*70)
+    print("TEST 1: KmerScoreTable Hits")
+    print("="*70)
+
+    rng = random.Random(1)
+    for trial in range(20):
+        k = rng.randint(2, 6)
+        sequence = _random_sequence(rng, rng.randint(0, 300), 'ACGT' if trial % 3 else 'ACGTN')
+        words = {sequence[p:p + k] for p in range(0, max(len(sequence) - k + 1, 0), 7)}
+        words |= {_random_sequence(rng, k) for _ in range(5)}
+        table = {word: rng.uniform(-5, 5) for word in sorted(words) if 'N' not in word}
+        engine = KmerScoreTable(table)
+
+        positions, entries = engine.scan(SequenceContext(sequence))
+        expected = [p for p in range(len(sequence) - k + 1) if sequence[p:p + k] in table]
+        assert positions.tolist() == expected, "Hit positions differ"
+        assert [engine.kmers[e] for e in entries.tolist()] == [sequence[p:p + k] for p in expected]
+    print("  ✅ Hits match")
+
+    print("\n✅ TEST 1 PASSED")
+    return True
+
+
+def test_kmer_score_regions():
+    """Contribution tracks and region sums equal per-base accumulation"""
+    print("\n" + "="*70)
+    print("TEST 2: KmerScoreTable Regions")
+    print("="*70)
+
+    rng = random.Random(2)
+    for trial in range(20):
+        k = rng.randint(2, 6)
+        sequence = _random_sequence(rng, rng.randint(0, 300))
+        words = {sequence[p:p + k] for p in range(0, max(len(sequence) - k + 1, 0), 5)}
+        table = {word: rng.uniform(-5, 5) for word in sorted(words)} or {'A' * k: 1.0}
+        engine = KmerScoreTable(table)
+        positions, entries = engine.scan(SequenceContext(sequence))
+
+        track = [0.0] * len(sequence)
+        for p in positions.tolist():
+            for base in range(p, p + k):
+                track[base] += table[sequence[p:p + k]] / k
+        assert np.allclose(engine.contributions(len(sequence), positions, entries), track)
+
+        regions = engine.score_regions(len(sequence), positions, entries)
+        for start, end, total in zip(regions['starts'].tolist(), regions['ends'].tolist(),
+                                     regions['sums'].tolist()):
+            assert np.isclose(total, sum(track[start:end])), "Region sum differs"
+    print("  ✅ Contributions and region sums match")
+
+    print("\n✅ TEST 2 PASSED")
+    return True
+
+
+def test_str_period_runs():
+    """Period-match runs equal a per-position scan of seq[p] == seq[p + k]"""
+    print("\n" + "="*70)
+    print("TEST 3: _str_period_runs")
+    print("="*70)
+
+    rng = random.Random(5)
+    for trial in range(30):
+        parts = [_random_sequence(rng, rng.randint(1, 6)) * rng.randint(1, 8) for _ in range(8)]
+        sequence = ''.join(parts)
+        min_total = rng.randint(2, 14)
+        for k, starts, ends in _str_period_runs(sequence, 1, 9, min_total):
+            expected, run_start = [], None
+            for p in range(len(sequence) - k + 1):
+                match = p < len(sequence) - k and sequence[p] == sequence[p + k]
+                if match and run_start is None:
+                    run_start = p
+                elif not match and run_start is not None:
+                    if p - run_start >= max(k, min_total - k):
+                        expected.append((run_start, p))
+                    run_start = None
+            assert list(zip(starts.tolist(), ends.tolist())) == expected, \
+                f"Runs differ for unit {k}"
+    print("  ✅ Runs match for unit sizes 1..9")
+
+    print("\n✅ TEST 3 PASSED")
+    return True
+
+
+def test_lce_index():
+    """Batched LCE equals a base-by-base extension"""
+    print("\n" + "="*70)
+    print("TEST 4: LCEIndex")
+    print("="*70)
+
+    rng = random.Random(2)
+    for trial in range(20):
+        unit = _random_sequence(rng, rng.randint(1, 5))
+        sequence = ''.join(unit * rng.randint(1, 20) if rng.random() < 0.5
+                           else _random_sequence(rng, rng.randint(1, 30), 'AC')
+                           for _ in range(10))
+        n = len(sequence)
+        left = np.array([rng.randrange(n) for _ in range(200)])
+        right = np.array([rng.randrange(n) for _ in range(200)])
+        cap = rng.randint(1, 120)
+        got = LCEIndex(sequence).query(left, right, cap)
+        for i, j, lce in zip(left.tolist(), right.tolist(), got.tolist()):
+            expected = 0
+            while expected < cap and max(i, j) + expected < n and sequence[i + expected] == sequence[j + expected]:
+                expected += 1
+            assert lce == expected, f"LCE({i}, {j}) = {lce}, expected {expected}"
+    print("  ✅ All queries match")
+
+    print("\n✅ TEST 4 PASSED")
+    return True
+
+
+def _brute_stems(sequence: str, min_arm: int, max_loop: int, max_mismatches: int):
+    """Maximal stems by walking outward from every loop, one pair at a time"""
+    def pair(a, b):
+        return PAIRS.get(a) == b
+
+    n = len(sequence)
+    stems = []
+    for p in range(1, n):
+        for loop in range(0, max_loop + 1):
+            if p + loop >= n:
+                break
+            # A loop whose innermost bases pair belongs to a shorter loop
+            if loop >= 2 and pair(sequence[p], sequence[p + loop - 1]):
+                continue
+            if not pair(sequence[p - 1], sequence[p + loop]):
+                continue
+            step = used = arm = mismatches = 0
+            while p - 1 - step >= 0 and p + loop + step < n:
+                if pair(sequence[p - 1 - step], sequence[p + loop + step]):
+                    step += 1
+                    arm, mismatches = step, used
+                elif used < max_mismatches:
+                    used += 1
+                    step += 1
+                else:
+                    break
+            if arm < min_arm:
+                continue
+            paired = sum(pair(sequence[p - 1 - t], sequence[p + loop + t]) for t in range(min_arm))
+            if paired < min_arm - max_mismatches:
+                continue
+            stems.append((p - arm, arm, loop, mismatches))
+    return sorted(stems, key=lambda stem: (stem[0], stem[2]))
+
+
+def test_inverted_stems():
+    """Stem engine equals an outward walk from every loop"""
+    print("\n" + "="*70)
+    print("TEST 5: SequenceContext.inverted_stems")
+    print("="*70)
+
+    rng = random.Random(4)
+    for trial in range(60):
+        sequence = _random_sequence(rng, rng.randint(1, 80), 'ACGTN' if trial % 4 == 0 else 'ACGT')
+        context = SequenceContext(sequence)
+        for max_mismatches in (0, 1, 2):
+            min_arm, max_loop = rng.randint(1, 8), rng.randint(0, 12)
+            got = sorted(zip(*[column.tolist() for column in
+                               context.inverted_stems(min_arm, max_loop, max_mismatches)]),
+                         key=lambda stem: (stem[0], stem[2]))
+            assert got == _brute_stems(sequence, min_arm, max_loop, max_mismatches), \
+                f"Stems differ for {sequence} ({min_arm}, {max_loop}, {max_mismatches})"
+    print("  ✅ Perfect and mismatched stems match")
+
+    print("\n✅ TEST 5 PASSED")
+    return True
+
+
+def test_g4_chain_prefilter():
+    """Scanning only G-run chains finds every whole-sequence regex match"""
+    print("\n" + "="*70)
+    print("TEST 6: G4 Candidate Chain Prefilter")
+    print("="*70)
+
+    rng = random.Random(6)
+    detector = detectors.GQuadruplexDetector()
+    blocks = ['GGG', 'GG', 'GGGG', 'T', 'TTA', 'A' * 12, 'GGGTTAGGGTTAGGGTTAGGG', 'C']
+    for trial in range(30):
+        sequence = ''.join(rng.choice(blocks) if rng.random() < 0.7 else _random_sequence(rng, 4)
+                           for _ in range(rng.randint(10, 120)))
+        expected = []
+        for class_name, patterns in detector.get_patterns().items():
+            for pat in patterns:
+                pattern_id = pat[1] if len(pat) > 1 else f"{class_name}_pat"
+                for m in re.finditer(pat[0], sequence):
+                    if m.end() - m.start() >= detectors.MIN_REGION_LEN:
+                        expected.append((class_name, pattern_id, m.start(), m.end()))
+        got = [(c['class_name'], c['pattern_id'], c['start'], c['end'])
+               for c in detector._find_all_candidates(sequence)]
+        assert got == expected, "Chain prefilter changed the candidates"
+    print("  ✅ Candidates match the whole-sequence scan")
+
+    print("\n✅ TEST 6 PASSED")
+    return True
+
+
+def test_range_max_table():
+    """Sparse-table range maxima equal slice maxima"""
+    print("\n" + "="*70)
+    print("TEST 7: RangeMaxTable")
+    print("="*70)
+
+    rng = np.random.default_rng(3)
+    for trial in range(20):
+        values = rng.integers(-50, 50, size=int(rng.integers(1, 400)))
+        table = RangeMaxTable(values)
+        starts = rng.integers(0, values.size, size=100)
+        ends = np.minimum(starts + rng.integers(1, values.size + 1, size=100), values.size)
+        expected = [values[s:e].max() for s, e in zip(starts, ends)]
+        assert table.query(starts, ends).tolist() == expected, "Range maxima differ"
+    print("  ✅ All ranges match")
+
+    print("\n✅ TEST 7 PASSED")
+    return True
+
+
+def _brute_arms(sequence: str, k: int, partner, min_arm: int, max_loop: int):
+    """Every seed pair's longest arm, pairing seeds at any distance"""
+    positions = {}
+    for p in range(len(sequence) - k + 1):
+        positions.setdefault(sequence[p:p + k], []).append(p)
+    n = len(sequence)
+    best = {}
+    for kmer, lefts in positions.items():
+        for i in lefts:
+            for j in positions.get(partner(kmer), []):
+                delta = j - i
+                for arm in range(min(delta, n - j), max(min_arm, delta - max_loop) - 1, -1):
+                    if sequence[i:i + arm] == partner(sequence[j:j + arm]):
+                        key = (i, delta - arm)
+                        best[key] = max(best.get(key, 0), arm)
+                        break
+    return sorted((i, i + loop + arm, arm) for (i, loop), arm in best.items())
+
+
+def test_long_arm_repeats():
+    """Inverted and mirror repeats report arms of any length"""
+    print("\n" + "="*70)
+    print("TEST 8: Long Inverted / Mirror Arms")
+    print("="*70)
+
+    rng = random.Random(7)
+    longest = 0
+    for trial in range(6):
+        arm = _random_sequence(rng, rng.randint(150, 300))
+        loop = _random_sequence(rng, rng.randint(0, 30))
+        mirrored = _revcomp(arm) if trial % 2 == 0 else arm[::-1]
+        sequence = _random_sequence(rng, 150) + arm + loop + mirrored + _random_sequence(rng, 150)
+        cases = [(find_inverted_repeats, K_INVERTED, _revcomp),
+                 (find_mirror_repeats, K_MIRROR, lambda s: s[::-1])]
+        for finder, k, partner in cases:
+            got = sorted((r['Left_Start'] - 1, r['Right_Start'] - 1, r['Arm_Length'])
+                         for r in finder(sequence))
+            assert got == _brute_arms(sequence, k, partner, 6 if k == K_INVERTED else 10, 100), \
+                f"{finder.__name__} differs from the unbounded search"
+            longest = max([longest] + [hit[2] for hit in got])
+    print(f"  Longest arm reported: {longest} bp")
+    assert longest > 100, "Arms over 100 bp must be reported"
+    print("  ✅ Output matches the unbounded search")
+
+    print("\n✅ TEST 8 PASSED")
+    return True
+
+
+def test_riz_regex_fallback():
+    """Regex RIZ search returns the Hyperscan path's maximal spans"""
+    print("\n" + "="*70)
+    print("TEST 9: R-loop RIZ Regex Fallback")
+    print("="*70)
+
+    detector = detectors.RLoopDetector()
+    if detector.hs_db is None:
+        print("  ⚠ Hyperscan not available, skipping")
+        return True
+
+    rng = random.Random(9)
+    blocks = ['GGG', 'GGGG', 'GGGGGGGGG', 'G', 'GG', 'A', 'TTA', 'CATTACAGAT', 'N', 'ACGTACGTACGT']
+    fallback = detectors.RLoopDetector()
+    fallback.hs_db = None
+    total = 0
+    for trial in range(200):
+        sequence = ''.join(rng.choice(blocks) for _ in range(rng.randint(1, 80)))
+        found = detector._riz_search_hyperscan_all(sequence)
+        for model in detector.get_patterns():
+            expected = found.get(model, [])
+            assert detector._riz_search_regex(sequence, model) == expected, \
+                f"{model} spans differ for {sequence}"
+            total += len(expected)
+        assert fallback.detect_motifs(sequence, "riz") == detector.detect_motifs(sequence, "riz"), \
+            "R-loop calls differ without Hyperscan"
+    print(f"  ✅ {total} RIZs and all R-loop calls identical")
+
+    print("\n✅ TEST 9 PASSED")
+    return True
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        ("KmerScoreTable Hits", test_kmer_score_table),
+        ("KmerScoreTable Regions", test_kmer_score_regions),
+        ("STR Period Runs", test_str_period_runs),
+        ("LCEIndex", test_lce_index),
+        ("Inverted Stems", test_inverted_stems),
+        ("G4 Chain Prefilter", test_g4_chain_prefilter),
+        ("RangeMaxTable", test_range_max_table),
+        ("Long Arm Repeats", test_long_arm_repeats),
+        ("RIZ Regex Fallback", test_riz_regex_fallback),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            results.append((name, test_func()))
+        except Exception as e:
+            print(f"\n❌ TEST FAILED WITH EXCEPTION: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((name, False))
+
+    print("\n" + "="*70)
+    print("TEST SUMMARY")
+    print("="*70)
+    for name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'}: {name}")
+    return all(result for _, result in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
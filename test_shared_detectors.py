@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test suite for process-wide shared detectors (detectors.get_shared_detector).
+
+One detector instance serves every thread, so detection must not depend on
+which other threads are scanning at the same time. This test validates:
+1. Shared detectors give sequential output when called from many threads
+2. NonBScanner.analyze_sequence gives sequential output when run concurrently
+"""
+
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from detectors import DETECTOR_CLASSES, get_shared_detector
+    from nonbscanner import NonBScanner
+    print("✅ All imports successful")
+except ImportError as e:
+    print(f"❌ Import failed: {e}")
+    sys.exit(1)
+
+
+def _test_sequences(count: int = 8, length: int = 6000):
+    """Random sequences with planted G-rich RIZs, G4s and repeats"""
+    rng = random.Random(11)
+    blocks = ['GGGGAGGGGAGGGGTGGGG', 'GGGTTAGGGTTAGGGTTAGGG', 'CGCGCGCGCGCG',
+              'AAAATTTT' * 3, 'CAG' * 12, 'GAAGGAGAGAAGGA']
+    sequences = []
+    for _ in range(count):
+        parts = []
+        while sum(map(len, parts)) < length:
+            parts.append(''.join(rng.choice('ACGT') for _ in range(rng.randint(50, 300))))
+            parts.append(rng.choice(blocks) * rng.randint(1, 3))
+        sequences.append(''.join(parts)[:length])
+    return sequences
+
+
+def test_shared_detectors_threaded():
+    """Every shared detector gives the same calls from 16 threads as sequentially"""
+    print("\n" + "="*70)
+    print("TEST 1: Shared Detectors Across Threads")
+    print("="*70)
+
+    sequences = _test_sequences()
+    for key in DETECTOR_CLASSES:
+        detector = get_shared_detector(key)
+        jobs = [(sequences[i % len(sequences)], f"seq{i}") for i in range(16)]
+        sequential = [detector.detect_motifs(seq, name) for seq, name in jobs]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            threaded = list(executor.map(lambda job: detector.detect_motifs(*job), jobs))
+        assert threaded == sequential, f"{key}: threaded output differs from sequential"
+        print(f"  ✅ {key:<14} {sum(map(len, sequential))} motifs, identical")
+
+    print("\n✅ TEST 1 PASSED")
+    return True
+
+
+def test_analyze_sequence_threaded():
+    """Concurrent analyze_sequence runs give sequential output"""
+    print("\n" + "="*70)
+    print("TEST 2: Concurrent analyze_sequence")
+    print("="*70)
+
+    sequences = _test_sequences()
+    scanner = NonBScanner()
+    sequential = [scanner.analyze_sequence(seq, f"seq{i}") for i, seq in enumerate(sequences)]
+    with ThreadPoolExecutor(max_workers=len(sequences)) as executor:
+        threaded = list(executor.map(lambda item: scanner.analyze_sequence(item[1], f"seq{item[0]}"),
+                                     enumerate(sequences)))
+    for i, (got, expected) in enumerate(zip(threaded, sequential)):
+        assert got == expected, f"seq{i}: concurrent output differs from sequential"
+    rloops = sum(m['Class'] == 'R-Loop' for motifs in sequential for m in motifs)
+    print(f"  R-loops per run: {rloops}")
+    assert rloops, "The test sequences must contain R-loops"
+    print("  ✅ All runs identical")
+
+    print("\n✅ TEST 2 PASSED")
+    return True
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        ("Shared Detectors Across Threads", test_shared_detectors_threaded),
+        ("Concurrent analyze_sequence", test_analyze_sequence_threaded),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            results.append((name, test_func()))
+        except Exception as e:
+            print(f"\n❌ TEST FAILED WITH EXCEPTION: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((name, False))
+
+    print("\n" + "="*70)
+    print("TEST SUMMARY")
+    print("="*70)
+    for name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'}: {name}")
+    return all(result for _, result in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -18,6 +18,8 @@ DESCRIPTION:
     - Records candidate regions
     
     Layer 2: Motif-specific scoring + backtracking
+    - Seed windows merged per detector into disjoint intervals
+    - One detector run per merged interval (no rescanning of shared bases)
     - DP/greedy for repeat motifs
     - State machines for G4/i-motif/R-loop
     - Best-scoring configuration selection
@@ -35,11 +37,15 @@ PERFORMANCE:
 
 from typing import List, Dict, Any, Tuple, Optional
 from collections import defaultdict
+from bisect import bisect_right
 import re
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import multiprocessing as mp
 
 from motif_registry import get_registry, MotifClass, HYPERSCAN_AVAILABLE
+from detectors import DETECTOR_CLASSES, resolve_detector_keys
+from genome_chunking import max_motif_footprint, shift_motif
+from sequence_context import SequenceContext
 
 if HYPERSCAN_AVAILABLE:
     import hyperscan
@@ -71,25 +77,41 @@ class Layer1Scanner:
     """
     Layer 1: Ultra-fast seed search using Hyperscan or RE2.
     
-    No backtracking, streaming, O(n) complexity.
+    No backtracking, streaming, O(n) complexity. Repeat families use the
+    registry's seed_fn finders instead of a regex; they share one
+    SequenceContext per scan, so k-mer codes are computed once.
     """
     
-    def __init__(self, use_hyperscan: bool = True):
+    def __init__(self, use_hyperscan: bool = True, detector_keys: Optional[List[str]] = None):
         """
         Initialize Layer 1 scanner.
         
         Args:
             use_hyperscan: Use Hyperscan if available, otherwise use regex
+            detector_keys: Only search seeds of these detectors (default: all)
         """
         self.registry = get_registry()
         self.use_hyperscan = use_hyperscan and HYPERSCAN_AVAILABLE
-        
-        if self.use_hyperscan:
-            self.hs_db = self.registry.get_hyperscan_db()
+        self.hs_db = None
+        if detector_keys is None:
+            self.motifs = self.registry.get_all_motifs()
         else:
+            self.motifs = self.registry.get_motifs_for_detectors(detector_keys)
+        self.seed_fn_motifs = [motif for motif in self.motifs if motif.seed_fn is not None]
+        regex_motifs = [motif for motif in self.motifs if motif.seed_fn is None]
+        seed_ids = None if detector_keys is None else [motif.seed_id for motif in regex_motifs]
+        
+        if self.use_hyperscan and regex_motifs:
+            try:
+                self.hs_db = self.registry.get_hyperscan_db(seed_ids)
+            except Exception as e:
+                print(f"Warning: Hyperscan seed database failed to compile ({e}); using regex")
+                self.use_hyperscan = False
+        
+        if not self.use_hyperscan:
             # Compile regex patterns for fallback
             self.compiled_patterns = {}
-            for motif in self.registry.get_all_motifs():
+            for motif in regex_motifs:
                 try:
                     self.compiled_patterns[motif.seed_id] = re.compile(
                         motif.seed_regex,
@@ -109,10 +131,26 @@ class Layer1Scanner:
         Returns:
             List of seed hits
         """
+        if not self.motifs:
+            return []
         if self.use_hyperscan:
-            return self._scan_hyperscan(sequence, sequence_name)
+            hits = self._scan_hyperscan(sequence, sequence_name) if self.hs_db is not None else []
         else:
-            return self._scan_regex(sequence, sequence_name)
+            hits = self._scan_regex(sequence, sequence_name)
+        hits.extend(self._scan_seed_fns(sequence, sequence_name))
+        return hits
+    
+    def _scan_seed_fns(self, sequence: str, sequence_name: str) -> List[SeedHit]:
+        """Candidate intervals from the repeat seed finders"""
+        if not self.seed_fn_motifs:
+            return []
+        context = SequenceContext(sequence, normalized=True)
+        hits = []
+        for motif in self.seed_fn_motifs:
+            starts, ends = motif.seed_fn(context)
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                hits.append(SeedHit(motif.seed_id, sequence_name, start, end, sequence[start:end]))
+        return hits
     
     def _scan_hyperscan(self, sequence: str, sequence_name: str) -> List[SeedHit]:
         """Scan using Hyperscan for maximum speed"""
@@ -148,11 +186,101 @@ class Layer2Processor:
     Layer 2: Motif-specific scoring + backtracking.
     
     Uses DP, greedy extension, or state machines depending on motif type.
+    
+    Seed windows are merged per detector before scoring, so each base is
+    scanned at most once per detector however dense the seeds are:
+    
+    # | Step  | Action                                               |
+    # |-------|------------------------------------------------------|
+    # | Group | Seed hits grouped by the detector behind their seed  |
+    # | Pad   | Each hit widened by its seed's window_size           |
+    # | Merge | Overlapping/adjacent windows joined (sorted sweep)   |
+    # | Scan  | scan_fn run once per merged interval                 |
+    
+    Merged intervals are disjoint, so no motif is reported twice.
     """
     
     def __init__(self):
         """Initialize Layer 2 processor"""
         self.registry = get_registry()
+        self.motifs_by_id = {motif.seed_id: motif for motif in self.registry.motifs}
+    
+    def merge_seed_windows(self, seed_hits: List[SeedHit],
+                           sequence_length: int) -> Dict[str, List[Tuple[int, int, List[SeedHit]]]]:
+        """
+        Merge the padded windows of seed hits into disjoint intervals.
+        
+        Args:
+            seed_hits: Seed matches from Layer 1
+            sequence_length: Length of the scanned sequence
+            
+        Returns:
+            Dict of detector key → sorted (start, end, hits) intervals,
+            0-based half-open, each with the seed hits it covers
+        """
+        windows = defaultdict(list)
+        for hit in seed_hits:
+            motif = self.motifs_by_id.get(hit.motif_id)
+            if motif is None:
+                continue
+            windows[motif.detector_key].append((max(0, hit.start - motif.window_size),
+                                                min(sequence_length, hit.end + motif.window_size),
+                                                hit))
+        
+        merged = {}
+        for key, detector_windows in windows.items():
+            detector_windows.sort(key=lambda w: (w[0], w[1]))
+            intervals = []
+            for start, end, hit in detector_windows:
+                if intervals and start <= intervals[-1][1]:
+                    last = intervals[-1]
+                    last[1] = max(last[1], end)
+                    last[2].append(hit)
+                else:
+                    intervals.append([start, end, [hit]])
+            merged[key] = [(start, end, sorted(hits, key=lambda h: h.start))
+                           for start, end, hits in intervals]
+        return merged
+    
+    def process_intervals(self, detector_key: str,
+                          intervals: List[Tuple[int, int, List[SeedHit]]],
+                          sequence: str) -> List[Dict[str, Any]]:
+        """
+        Run one detector once per merged interval.
+        
+        Args:
+            detector_key: Detector whose scan_fn is run
+            intervals: Merged (start, end, hits) intervals for that detector
+            sequence: Full sequence context
+            
+        Returns:
+            Motifs in sequence coordinates, tagged with the Layer 1 seed
+            they overlap (or the interval's first seed)
+        """
+        seeds = self.registry.get_motifs_for_detectors([detector_key])
+        if not seeds:
+            return []
+        scan_fn = seeds[0].scan_fn
+        
+        final_motifs = []
+        for start, end, hits in intervals:
+            try:
+                window_motifs = scan_fn(sequence[start:end], hits[0].seq_id)
+            except Exception as e:
+                print(f"Warning: Error in {detector_key} scan_fn: {e}")
+                continue
+            
+            hit_starts = [hit.start for hit in hits]
+            for m in window_motifs:
+                m_copy = shift_motif(m.copy(), start)
+                # Last seed starting before the motif ends, if it overlaps
+                i = bisect_right(hit_starts, m_copy['End'] - 1) - 1
+                seed = hits[i] if i >= 0 and hits[i].end > m_copy['Start'] - 1 else hits[0]
+                m_copy['Layer1_Seed_Start'] = seed.start + 1  # 1-based
+                m_copy['Layer1_Seed_End'] = seed.end
+                final_motifs.append(m_copy)
+        
+        return final_motifs
     
     def process_seed_hit(self, seed_hit: SeedHit, sequence: str) -> List[Dict[str, Any]]:
         """
@@ -166,7 +294,7 @@ class Layer2Processor:
             List of scored motifs with structural details
         """
         # Get motif class for this seed
-        motif = self.registry.get_motif_by_id(seed_hit.motif_id)
+        motif = self.motifs_by_id.get(seed_hit.motif_id)
         if motif is None:
             return []
         
@@ -208,7 +336,7 @@ class TwoLayerScanner:
     MIN_SEED_HITS_FOR_PARALLEL = 20   # Minimum total seed hits to justify parallel processing
     
     def __init__(self, use_hyperscan: bool = True, max_workers: Optional[int] = None,
-                 chunk_size: int = 100000):
+                 chunk_size: int = 100000, classes: Optional[List[str]] = None):
         """
         Initialize two-layer scanner.
         
@@ -216,11 +344,15 @@ class TwoLayerScanner:
             use_hyperscan: Use Hyperscan for Layer 1 if available
             max_workers: Maximum parallel workers (default: CPU count)
             chunk_size: Chunk size for large sequence processing (default: 100kb)
+            classes: Only seed and score these motif classes (default: all)
         """
-        self.layer1 = Layer1Scanner(use_hyperscan=use_hyperscan)
+        self.detector_keys = resolve_detector_keys(classes)
+        self.layer1 = Layer1Scanner(use_hyperscan=use_hyperscan,
+                                    detector_keys=None if classes is None else self.detector_keys)
         self.layer2 = Layer2Processor()
         self.max_workers = max_workers or mp.cpu_count()
         self.chunk_size = chunk_size
+        self.chunk_overlap = self._chunk_overlap()
     
     def analyze_sequence(self, sequence: str, sequence_name: str = "sequence",
                         use_parallel: bool = True, chunk_based: bool = None) -> List[Dict[str, Any]]:
@@ -262,7 +394,8 @@ class TwoLayerScanner:
         else:
             motifs = self._process_sequential(seed_hits, sequence)
         
-        # Remove duplicates and overlaps
+        # Merged intervals are disjoint, so there are no duplicates; this
+        # only applies the within-subclass overlap policy
         motifs = self._deduplicate_motifs(motifs)
         
         # Sort by position
@@ -278,17 +411,22 @@ class TwoLayerScanner:
         This enables processing of genome-scale sequences efficiently.
         """
         chunk_size = self.chunk_size
-        overlap = 1000  # Overlap to catch motifs spanning chunk boundaries
+        # Overlap sized so the longest motif plus its Layer 2 window fits
+        overlap = min(self.chunk_overlap, chunk_size // 2)
         
         all_motifs = []
         chunks = []
+        step = chunk_size - overlap
         
-        # Create chunks with overlap
-        for i in range(0, len(sequence), chunk_size - overlap):
+        # Create chunks with overlap; each chunk owns the motifs starting in
+        # its first `step` bases, so overlapping chunks never both report one
+        for i in range(0, len(sequence), step):
             chunk_start = i
             chunk_end = min(i + chunk_size, len(sequence))
             chunk_seq = sequence[chunk_start:chunk_end]
             chunks.append((chunk_start, chunk_end, chunk_seq))
+            if chunk_end == len(sequence):
+                break
         
         # Process chunks in parallel
         if use_parallel and len(chunks) > 1:
@@ -300,7 +438,8 @@ class TwoLayerScanner:
                         self._process_chunk,
                         chunk_seq,
                         f"{sequence_name}_chunk_{chunk_start}",
-                        chunk_start
+                        chunk_start,
+                        chunk_start + step if chunk_end < len(sequence) else chunk_end
                     )
                     futures[future] = (chunk_start, chunk_end)
                 
@@ -318,11 +457,12 @@ class TwoLayerScanner:
                 chunk_motifs = self._process_chunk(
                     chunk_seq,
                     f"{sequence_name}_chunk_{chunk_start}",
-                    chunk_start
+                    chunk_start,
+                    chunk_start + step if chunk_end < len(sequence) else chunk_end
                 )
                 all_motifs.extend(chunk_motifs)
         
-        # Remove duplicates from overlapping regions
+        # Chunk ownership already removed duplicates; apply the overlap policy
         all_motifs = self._deduplicate_motifs(all_motifs)
         
         # Sort by position
@@ -330,9 +470,18 @@ class TwoLayerScanner:
         
         return all_motifs
     
+    def _chunk_overlap(self) -> int:
+        """Chunk overlap: largest selected footprint plus largest Layer 2 window"""
+        windows = [motif.window_size for motif in self.layer1.motifs]
+        footprint = max_motif_footprint(DETECTOR_CLASSES[key] for key in self.detector_keys)
+        return footprint + max(windows, default=0)
+    
     def _process_chunk(self, chunk_seq: str, chunk_name: str, 
-                      chunk_offset: int) -> List[Dict[str, Any]]:
-        """Process a single chunk and adjust coordinates"""
+                      chunk_offset: int, own_end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Process a single chunk and adjust coordinates, keeping motifs that
+        start before `own_end` (sequence coordinates; default: whole chunk)
+        """
         # Layer 1: Seed search in chunk
         seed_hits = self.layer1.scan_sequence(chunk_seq, chunk_name)
         
@@ -344,42 +493,43 @@ class TwoLayerScanner:
         
         # Adjust coordinates to full sequence
         for motif in motifs:
-            motif['Start'] += chunk_offset
-            motif['End'] += chunk_offset
+            shift_motif(motif, chunk_offset)
             if 'Layer1_Seed_Start' in motif:
                 motif['Layer1_Seed_Start'] += chunk_offset
             if 'Layer1_Seed_End' in motif:
                 motif['Layer1_Seed_End'] += chunk_offset
         
-        return motifs
+        if own_end is None:
+            return motifs
+        return [motif for motif in motifs if motif['Start'] - 1 < own_end]
     
     def _process_sequential(self, seed_hits: List[SeedHit], sequence: str) -> List[Dict[str, Any]]:
-        """Process seed hits sequentially"""
+        """Process merged seed intervals one detector after another"""
         all_motifs = []
         
-        for seed_hit in seed_hits:
-            motifs = self.layer2.process_seed_hit(seed_hit, sequence)
+        intervals = self.layer2.merge_seed_windows(seed_hits, len(sequence))
+        for detector_key, detector_intervals in intervals.items():
+            motifs = self.layer2.process_intervals(detector_key, detector_intervals, sequence)
             all_motifs.extend(motifs)
         
         return all_motifs
     
     def _process_parallel(self, seed_hits: List[SeedHit], sequence: str) -> List[Dict[str, Any]]:
-        """Process seed hits in parallel by motif type for maximum efficiency"""
+        """Process merged seed intervals in parallel, one job per detector"""
         all_motifs = []
         
-        # Group seed hits by motif type (more efficient parallelization)
-        hits_by_motif = defaultdict(list)
-        for hit in seed_hits:
-            hits_by_motif[hit.motif_id].append(hit)
+        intervals = self.layer2.merge_seed_windows(seed_hits, len(sequence))
+        if not intervals:
+            return all_motifs
         
-        # Process each motif type in parallel (key optimization: parallelize by motif, not by hit)
-        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(hits_by_motif))) as executor:
+        # One job per detector: its intervals are disjoint and scanned once each
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(intervals))) as executor:
             futures = {}
             
-            for motif_id, hits in hits_by_motif.items():
-                # Submit one job per motif type (processes all hits of that type together)
-                future = executor.submit(self._process_motif_type_hits, hits, sequence)
-                futures[future] = motif_id
+            for detector_key, detector_intervals in intervals.items():
+                future = executor.submit(self.layer2.process_intervals,
+                                         detector_key, detector_intervals, sequence)
+                futures[future] = detector_key
             
             # Collect results
             for future in as_completed(futures):
@@ -387,19 +537,11 @@ class TwoLayerScanner:
                     motifs = future.result()
                     all_motifs.extend(motifs)
                 except Exception as e:
-                    motif_id = futures[future]
-                    print(f"Warning: Error processing motif type {motif_id}: {e}")
+                    detector_key = futures[future]
+                    print(f"Warning: Error processing {detector_key} intervals: {e}")
         
         return all_motifs
     
-    def _process_motif_type_hits(self, hits: List[SeedHit], sequence: str) -> List[Dict[str, Any]]:
-        """Process all hits for a single motif type"""
-        all_motifs = []
-        for hit in hits:
-            motifs = self.layer2.process_seed_hit(hit, sequence)
-            all_motifs.extend(motifs)
-        return all_motifs
-    
     def _deduplicate_motifs(self, motifs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Remove duplicate and overlapping motifs.
@@ -463,6 +605,7 @@ class TwoLayerScanner:
             'scanner_type': 'two_layer',
             'layer1_engine': 'hyperscan' if self.layer1.use_hyperscan else 'regex',
             'registered_motifs': len(self.layer1.registry.motifs),
+            'selected_classes': self.detector_keys,
             'max_workers': self.max_workers,
             'hyperscan_available': HYPERSCAN_AVAILABLE
         }
@@ -471,7 +614,8 @@ class TwoLayerScanner:
 # Convenience functions for easy integration
 
 def analyze_sequence_fast(sequence: str, sequence_name: str = "sequence",
-                         use_parallel: bool = True) -> List[Dict[str, Any]]:
+                         use_parallel: bool = True,
+                         classes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Fast analysis using two-layer architecture.
     
@@ -479,11 +623,12 @@ def analyze_sequence_fast(sequence: str, sequence_name: str = "sequence",
         sequence: DNA sequence
         sequence_name: Sequence identifier
         use_parallel: Enable parallel processing
+        classes: Only detect these motif classes (default: all)
         
     Returns:
         List of detected motifs
     """
-    scanner = TwoLayerScanner()
+    scanner = TwoLayerScanner(classes=classes)
     return scanner.analyze_sequence(sequence, sequence_name, use_parallel=use_parallel)
 
 
@@ -366,6 +366,8 @@ import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 from collections import defaultdict
 
+from sequence_context import g4hunter_peak
+
 # Try to import Hyperscan for high-performance pattern matching
 try:
     import hyperscan
@@ -586,23 +588,11 @@ class MotifScoring:
         if len(sequence) < window_size:
             window_size = len(sequence)
         
-        scores = []
-        for i in range(len(sequence) - window_size + 1):
-            window = sequence[i:i + window_size]
-            score = 0
-            
-            for base in window:
-                if base == 'G':
-                    score += 1
-                elif base == 'C':
-                    score -= 1
-            
-            scores.append(score)
-        
-        if not scores:
+        if window_size <= 0:
             return 0.0
         
-        max_score = max(abs(s) for s in scores)
+        # Peak |G - C| over all windows (prefix sums, shared with the G4 detector)
+        max_score = g4hunter_peak(sequence, window_size)
         return max_score / window_size
     
     @staticmethod
@@ -1186,15 +1176,17 @@ Version: 2024.1
 
 import re
 import os
+import gzip
 import json
 import csv
 import random
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterator
 from collections import Counter, defaultdict
 from io import StringIO
 import warnings
+from abc import ABC, abstractmethod
 warnings.filterwarnings("ignore")
 
 # =============================================================================
@@ -1283,6 +1275,43 @@ def read_fasta_file(filename: str) -> Dict[str, str]:
         print(f"Error reading FASTA file {filename}: {e}")
         return {}
 
+def iter_fasta(filename: str) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily yield (name, sequence) records from a FASTA file (.gz supported).
+    
+    Reads line by line, so only the current record is held in memory.
+    Naming and normalization follow parse_fasta: sequence lines are
+    upper-cased, unnamed headers become sequence_<n>, and records without
+    sequence lines are skipped.
+    
+    Memory is bounded per record, not per file: each record is returned
+    whole, and its line list plus the joined string peak at about 3 bytes
+    per base with 60 bp lines (~750 MB for a 250 Mb chromosome).
+    """
+    opener = gzip.open if filename.endswith('.gz') else open
+    n_records = 0
+    current_name = None
+    current_seq = []
+    
+    with opener(filename, 'rt') as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            
+            if line.startswith('>'):
+                if current_name and current_seq:
+                    n_records += 1
+                    yield current_name, ''.join(current_seq)
+                
+                current_name = line[1:].strip() or f"sequence_{n_records + 1}"
+                current_seq = []
+            else:
+                current_seq.append(line.upper())
+    
+    if current_name and current_seq:
+        yield current_name, ''.join(current_seq)
+
 # =============================================================================
 # SEQUENCE MANIPULATION & VALIDATION
 # =============================================================================
@@ -1762,6 +1791,34 @@ def create_summary_table(sequences: Dict[str, str], results: Dict[str, List[Dict
 # DATA EXPORT FUNCTIONS
 # =============================================================================
 
+BED_TRACK_HEADER = "track name=NBDScanner_motifs description=\"Non-B DNA motifs\" itemRgb=On"
+
+# Color mapping for different classes
+BED_CLASS_COLORS = {
+    'Curved_DNA': '255,182,193',      # Light pink
+    'Slipped_DNA': '255,218,185',     # Peach
+    'Cruciform': '173,216,230',       # Light blue
+    'R-Loop': '144,238,144',          # Light green
+    'Triplex': '221,160,221',         # Plum
+    'G-Quadruplex': '255,215,0',      # Gold
+    'i-Motif': '255,165,0',           # Orange
+    'Z-DNA': '138,43,226',            # Blue violet
+    'A-philic_DNA': '230,230,250',    # Lavender
+    'Hybrid': '192,192,192',          # Silver
+    'Non-B_DNA_Clusters': '128,128,128'  # Gray
+}
+
+def format_bed_line(motif: Dict[str, Any], chrom: str) -> str:
+    """Format one motif as a 9-column BED line (no trailing newline)"""
+    start = max(0, motif.get('Start', 1) - 1)  # Convert to 0-based
+    end = motif.get('End', start + 1)
+    name = f"{motif.get('Class', 'Unknown')}_{motif.get('Subclass', 'Unknown')}"
+    score = int(min(1000, max(0, motif.get('Score', 0) * 1000)))  # Scale to 0-1000
+    strand = motif.get('Strand', '+')
+    color = BED_CLASS_COLORS.get(motif.get('Class'), '128,128,128')
+    
+    return f"{chrom}\t{start}\t{end}\t{name}\t{score}\t{strand}\t{start}\t{end}\t{color}"
+
 def export_to_bed(motifs: List[Dict[str, Any]], sequence_name: str = "sequence", 
                   filename: Optional[str] = None) -> str:
     """
@@ -1775,35 +1832,10 @@ def export_to_bed(motifs: List[Dict[str, Any]], sequence_name: str = "sequence",
     Returns:
         BED format string
     """
-    bed_lines = []
-    bed_lines.append("track name=NBDScanner_motifs description=\"Non-B DNA motifs\" itemRgb=On")
-    
-    # Color mapping for different classes
-    class_colors = {
-        'Curved_DNA': '255,182,193',      # Light pink
-        'Slipped_DNA': '255,218,185',     # Peach
-        'Cruciform': '173,216,230',       # Light blue
-        'R-Loop': '144,238,144',          # Light green
-        'Triplex': '221,160,221',         # Plum
-        'G-Quadruplex': '255,215,0',      # Gold
-        'i-Motif': '255,165,0',           # Orange
-        'Z-DNA': '138,43,226',            # Blue violet
-        'A-philic_DNA': '230,230,250',    # Lavender
-        'Hybrid': '192,192,192',          # Silver
-        'Non-B_DNA_Clusters': '128,128,128'  # Gray
-    }
+    bed_lines = [BED_TRACK_HEADER]
     
     for motif in motifs:
-        chrom = sequence_name
-        start = max(0, motif.get('Start', 1) - 1)  # Convert to 0-based
-        end = motif.get('End', start + 1)
-        name = f"{motif.get('Class', 'Unknown')}_{motif.get('Subclass', 'Unknown')}"
-        score = int(min(1000, max(0, motif.get('Score', 0) * 1000)))  # Scale to 0-1000
-        strand = motif.get('Strand', '+')
-        color = class_colors.get(motif.get('Class'), '128,128,128')
-        
-        bed_line = f"{chrom}\t{start}\t{end}\t{name}\t{score}\t{strand}\t{start}\t{end}\t{color}"
-        bed_lines.append(bed_line)
+        bed_lines.append(format_bed_line(motif, sequence_name))
     
     bed_content = '\n'.join(bed_lines)
     
@@ -1816,6 +1848,70 @@ def export_to_bed(motifs: List[Dict[str, Any]], sequence_name: str = "sequence",
     
     return bed_content
 
+# Comprehensive column order matching user requirements (CSV/TSV export)
+EXPORT_COLUMNS = [
+    'ID',
+    'Sequence_Name',  # Sequence Name (or Accession)
+    'Source',  # Source (e.g., genome, experiment, study)
+    'Class',  # Motif Class
+    'Subclass',  # Motif Subclass
+    'Pattern_ID',  # Pattern/Annotation ID
+    'Start',  # Start Position
+    'End',  # End Position
+    'Length',  # Length (bp)
+    'Sequence',  # Sequence
+    'Method',  # Detection Method
+    'Score',  # Motif Score
+    'Repeat_Type',  # Repeat/Tract Type
+    'Left_Arm',  # Left Arm Sequence
+    'Right_Arm',  # Right Arm Sequence
+    'Loop_Seq',  # Loop Sequence
+    'Arm_Length',  # Arm Length
+    'Loop_Length',  # Loop Length
+    'Stem_Length',  # Stem Length(s)
+    'Unit_Length',  # Unit/Repeat Length
+    'Number_Of_Copies',  # Number of Copies/Repeats
+    'Spacer_Length',  # Spacer Length
+    'Spacer_Sequence',  # Spacer Sequence
+    'GC_Content',  # GC Content (%)
+    'Structural_Features',  # Structural Features (e.g., Tract Type, Curvature Score)
+    'Strand'  # Strand information
+]
+
+def export_row(motif: Dict[str, Any], columns: List[str]) -> Dict[str, Any]:
+    """Map one motif onto export columns, filling alternates and NA"""
+    row = {}
+    for col in columns:
+        value = motif.get(col, 'NA')
+        
+        # Map alternative field names to comprehensive columns
+        if value == 'NA' or value == '' or value is None:
+            # Try alternative mappings
+            if col == 'Number_Of_Copies' and 'Repeat_Units' in motif:
+                value = motif['Repeat_Units']
+            elif col == 'Repeat_Type' and 'Tract_Type' in motif:
+                value = motif['Tract_Type']
+            elif col == 'GC_Content' and 'GC_Total' in motif:
+                value = motif['GC_Total']
+            elif col == 'Structural_Features':
+                # Combine relevant structural features
+                features = []
+                if 'Tract_Type' in motif and motif['Tract_Type'] not in ['', 'NA', None]:
+                    features.append(f"Tract:{motif['Tract_Type']}")
+                if 'Curvature_Score' in motif and motif['Curvature_Score'] not in ['', 'NA', None]:
+                    features.append(f"Curvature:{motif['Curvature_Score']}")
+                if 'Z_Score' in motif and motif['Z_Score'] not in ['', 'NA', None]:
+                    features.append(f"Z-Score:{motif['Z_Score']}")
+                value = '; '.join(features) if features else 'NA'
+            
+            # If still empty, set to NA
+            if value == '' or value is None:
+                value = 'NA'
+        
+        row[col] = value
+    
+    return row
+
 def export_to_csv(motifs: List[Dict[str, Any]], filename: Optional[str] = None) -> str:
     """
     Export motifs to CSV format with comprehensive fields
@@ -1830,43 +1926,13 @@ def export_to_csv(motifs: List[Dict[str, Any]], filename: Optional[str] = None)
     if not motifs:
         return "No motifs to export"
     
-    # Comprehensive column order matching user requirements
-    comprehensive_columns = [
-        'ID',
-        'Sequence_Name',  # Sequence Name (or Accession)
-        'Source',  # Source (e.g., genome, experiment, study)
-        'Class',  # Motif Class
-        'Subclass',  # Motif Subclass
-        'Pattern_ID',  # Pattern/Annotation ID
-        'Start',  # Start Position
-        'End',  # End Position
-        'Length',  # Length (bp)
-        'Sequence',  # Sequence
-        'Method',  # Detection Method
-        'Score',  # Motif Score
-        'Repeat_Type',  # Repeat/Tract Type
-        'Left_Arm',  # Left Arm Sequence
-        'Right_Arm',  # Right Arm Sequence
-        'Loop_Seq',  # Loop Sequence
-        'Arm_Length',  # Arm Length
-        'Loop_Length',  # Loop Length
-        'Stem_Length',  # Stem Length(s)
-        'Unit_Length',  # Unit/Repeat Length
-        'Number_Of_Copies',  # Number of Copies/Repeats
-        'Spacer_Length',  # Spacer Length
-        'Spacer_Sequence',  # Spacer Sequence
-        'GC_Content',  # GC Content (%)
-        'Structural_Features',  # Structural Features (e.g., Tract Type, Curvature Score)
-        'Strand'  # Strand information
-    ]
-    
     # Get all unique keys from motifs to include additional fields
     all_keys = set()
     for motif in motifs:
         all_keys.update(motif.keys())
     
     # Start with comprehensive columns, then add any additional fields found
-    columns = comprehensive_columns.copy()
+    columns = EXPORT_COLUMNS.copy()
     for key in sorted(all_keys):
         if key not in columns:
             columns.append(key)
@@ -1876,38 +1942,7 @@ def export_to_csv(motifs: List[Dict[str, Any]], filename: Optional[str] = None)
     writer.writeheader()
     
     for motif in motifs:
-        # Create row with comprehensive field mappings
-        row = {}
-        for col in columns:
-            value = motif.get(col, 'NA')
-            
-            # Map alternative field names to comprehensive columns
-            if value == 'NA' or value == '' or value is None:
-                # Try alternative mappings
-                if col == 'Number_Of_Copies' and 'Repeat_Units' in motif:
-                    value = motif['Repeat_Units']
-                elif col == 'Repeat_Type' and 'Tract_Type' in motif:
-                    value = motif['Tract_Type']
-                elif col == 'GC_Content' and 'GC_Total' in motif:
-                    value = motif['GC_Total']
-                elif col == 'Structural_Features':
-                    # Combine relevant structural features
-                    features = []
-                    if 'Tract_Type' in motif and motif['Tract_Type'] not in ['', 'NA', None]:
-                        features.append(f"Tract:{motif['Tract_Type']}")
-                    if 'Curvature_Score' in motif and motif['Curvature_Score'] not in ['', 'NA', None]:
-                        features.append(f"Curvature:{motif['Curvature_Score']}")
-                    if 'Z_Score' in motif and motif['Z_Score'] not in ['', 'NA', None]:
-                        features.append(f"Z-Score:{motif['Z_Score']}")
-                    value = '; '.join(features) if features else 'NA'
-                
-                # If still empty, set to NA
-                if value == '' or value is None:
-                    value = 'NA'
-            
-            row[col] = value
-        
-        writer.writerow(row)
+        writer.writerow(export_row(motif, columns))
     
     csv_content = output.getvalue()
     output.close()
@@ -1956,6 +1991,98 @@ def export_to_json(motifs: List[Dict[str, Any]], filename: Optional[str] = None,
     return json_content
 
 
+# =============================================================================
+# INCREMENTAL MOTIF SINKS (streaming export)
+# =============================================================================
+
+class MotifSink(ABC):
+    """
+    Incremental motif writer: rows are written as batches arrive, so memory
+    does not grow with the number of motifs exported.
+    
+    # Available Sinks:
+    # | Class     | Extension  | Format                                   |
+    # |-----------|------------|------------------------------------------|
+    # | BedSink   | .bed       | 9-column BED, same rows as export_to_bed |
+    # | TsvSink   | .tsv/.txt  | EXPORT_COLUMNS, tab-separated            |
+    # | JsonlSink | .jsonl     | One JSON object per motif                |
+    """
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.count = 0
+        self._handle = open(filename, 'w', newline='')
+        self._write_header()
+    
+    def _write_header(self):
+        pass
+    
+    @abstractmethod
+    def _write_motif(self, motif: Dict[str, Any]):
+        """Write one motif row"""
+    
+    def write(self, motifs: List[Dict[str, Any]]):
+        """Append a batch of motifs"""
+        for motif in motifs:
+            self._write_motif(motif)
+        self.count += len(motifs)
+    
+    def close(self):
+        if not self._handle.closed:
+            self._handle.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BedSink(MotifSink):
+    """BED sink; the chromosome column is each motif's Sequence_Name"""
+    
+    def _write_header(self):
+        self._handle.write(BED_TRACK_HEADER + '\n')
+    
+    def _write_motif(self, motif: Dict[str, Any]):
+        chrom = motif.get('Sequence_Name', 'sequence')
+        self._handle.write(format_bed_line(motif, chrom) + '\n')
+
+
+class TsvSink(MotifSink):
+    """Tab-separated sink with the fixed EXPORT_COLUMNS layout"""
+    
+    def _write_header(self):
+        self._writer = csv.DictWriter(self._handle, fieldnames=EXPORT_COLUMNS,
+                                      delimiter='\t', extrasaction='ignore')
+        self._writer.writeheader()
+    
+    def _write_motif(self, motif: Dict[str, Any]):
+        self._writer.writerow(export_row(motif, EXPORT_COLUMNS))
+
+
+class JsonlSink(MotifSink):
+    """JSON Lines sink keeping every motif field"""
+    
+    def _write_motif(self, motif: Dict[str, Any]):
+        self._handle.write(json.dumps(motif, ensure_ascii=False, default=str) + '\n')
+
+
+MOTIF_SINKS = {
+    '.bed': BedSink,
+    '.tsv': TsvSink,
+    '.txt': TsvSink,
+    '.jsonl': JsonlSink,
+}
+
+def open_motif_sink(filename: str) -> MotifSink:
+    """Open the sink matching the file extension (.bed, .tsv/.txt, .jsonl)"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in MOTIF_SINKS:
+        raise ValueError(f"Unsupported sink format '{ext}' (use one of {sorted(MOTIF_SINKS)})")
+    return MOTIF_SINKS[ext](filename)
+
+
 def export_to_excel(motifs: List[Dict[str, Any]], filename: str = "nonbscanner_results.xlsx") -> str:
     """
     Export motifs to Excel format with multiple sheets: